@@ -0,0 +1,3 @@
+from stellar_core.startup import package_started
+
+package_started(__name__)
@@ -1,9 +1,9 @@
 import os
 from google.adk.agents.llm_agent import Agent
-from stellar_accountant.tools.financials import get_financial_health, get_bench_liability
-from dotenv import load_dotenv
+from stellar_core.config import load_env
+from stellar_core.registry import agent_ready, lazy_tools
 
-load_dotenv()
+load_env()
 
 # The Accountant - Refactored "Ruthless CFO"
 agent = Agent(
@@ -21,16 +21,23 @@ agent = Agent(
     YOUR TOOLKIT:
     - `get_financial_health`: Use this for "Margin Audits", "Profit Checks", and "Revenue Updates".
     - `get_bench_liability`: Use this immediately if asked about "Costs", "Burn", or "Bench Risk".
+    - `run_margin_scenarios`: Use for "What if" questions (burden changes, shorter weeks, rate rises). Pass every option in one call.
+    - `get_trend`: Use for "How has margin / burn moved?" questions (last N days, by day / week / month). Reads recorded history, so it is cheap.
     
     OPERATIONAL PROTOCOLS:
-    - If `get_bench_liability` > $0, start your response with "⚠️ CASH BURN ALERT".
+    - If `get_bench_liability` shows `total_weekly_burn` > $0 in its summary, start your response with "⚠️ CASH BURN ALERT".
+    - `get_bench_liability` lists the biggest burners one page at a time; pass `page.next_cursor` back as `cursor` only if the user wants more names.
     - Always report margins as a percentage AND a dollar figure.
     
     INTERACTION STYLE:
     - Sharp, numerical, and intolerant of low margins.
     - Example: "Gross Margin is 12%. This is critical. We are bleeding cash on the Westgate project."
     """,
-    tools=[get_financial_health, get_bench_liability],
+    tools=[
+        *lazy_tools("stellar_accountant.tools.financials", "get_financial_health_async", "get_bench_liability_async", "run_margin_scenarios_async"),
+        *lazy_tools("stellar_accountant.tools.trends", "get_trend_async"),
+    ],
 )
 
 root_agent = agent
+agent_ready(__package__, agent.tools)
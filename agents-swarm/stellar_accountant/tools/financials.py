@@ -1,103 +1,172 @@
 import os
-from supabase import create_client, Client
-from typing import List, Dict, Any
+from stellar_core.aio import run_sync
+from stellar_core.db import get_async_supabase, aexecute
+from stellar_core.candidate import get_candidate_records
+from stellar_core.envelope import paginate, resume
+from stellar_core.finance_engine import (
+    MAX_SCENARIOS, PlacementBook, bench_liability, cached_book, deal_order, liability_order, scenario_grid,
+)
+from stellar_core.finance_rules import finance_rules, rpc_params
+from stellar_core.ledger import get_finance_ledger
+from stellar_core.resilience import describe, missing_function
+from typing import List, Dict, Any, Optional
 
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key: return None
-    return create_client(url, key)
+def _aggregation() -> str:
+    # FINANCE_AGGREGATION: ledger (incremental, default) / rpc (Postgres, migration 0005) / local (batch)
+    mode = os.environ.get("FINANCE_AGGREGATION", "ledger").lower()
+    return mode if mode in ("ledger", "rpc", "local") else "ledger"
 
-def _parse_currency(value: Any) -> float:
-    if not value: return 0.0
-    if isinstance(value, (int, float)): return float(value)
-    clean_str = str(value).replace('$', '').replace(',', '').strip()
-    return float(''.join(c for c in clean_str if c.isdigit() or c == '.'))
+async def _rpc(sb, fn: str, params: Dict, label: str) -> Optional[Dict]:
+    """
+    Runs a Postgres aggregation function; None means 'fall back to Python'
+    (function not defined: migration 0005 not applied). Other errors raise.
+    """
+    try:
+        data = (await aexecute(sb.rpc(fn, params), label)).data
+    except Exception as e:
+        if missing_function(e):
+            return None
+        raise
+    return data if isinstance(data, dict) else None
 
-def get_financial_health() -> Dict:
+async def get_financial_health_async() -> Dict:
     """
     Delegate: The Accountant.
-    Calculates Margin and 'Busy Fool' Deals using 1.30x Burden.
+    Calculates Margin and 'Busy Fool' Deals (worst first) using 1.30x Burden.
+    Served from the running finance ledger (kept current from roster changes).
     """
-    sb = get_supabase()
+    sb = await get_async_supabase()
     if not sb: return {"error": "DB Connection Failed"}
 
+    rules = finance_rules()
+    mode = _aggregation()
     try:
-        # Placed candidates = Revenue Generating
-        response = sb.table("candidates").select("*").in_("status", ["on_job", "placed"]).execute()
-        placements = response.data
+        if mode == "rpc":
+            result = await _rpc(sb, "agent_financial_health", rpc_params(rules), "get_financial_health")
+            if result is not None:
+                # json_agg has no order; list them worst first like the other paths
+                # (a copy: the response may be shared with other callers)
+                return dict(result, busy_fool_deals=sorted(result.get("busy_fool_deals") or [], key=deal_order))
+
+        if mode == "ledger":
+            ledger = get_finance_ledger()
+            await ledger.sync("get_financial_health")
+            result = ledger.financial_health()
+        else:
+            book = await _placement_book("get_financial_health")
+            # 1.30 BURDEN LOGIC + BUSY FOOL FILTER (< $400/week or < 15%), vectorized
+            result = book.evaluate(rules)
     except Exception as e:
-        return {"error": str(e)}
-
-    total_revenue = 0
-    total_payroll = 0
-    busy_fools = []
-    
-    for p in placements:
-        pay_rate = _parse_currency(p.get("pay_rate"))
-        charge_rate = _parse_currency(p.get("charge_out_rate") or p.get("charge_rate"))
-        
-        # 1.30 BURDEN LOGIC
-        burdened_cost = pay_rate * 1.30
-        weekly_revenue = charge_rate * 40
-        weekly_cost = burdened_cost * 40
-        net_gp = weekly_revenue - weekly_cost
-        
-        total_revenue += weekly_revenue
-        total_payroll += weekly_cost
-
-        # BUSY FOOL FILTER: < $400/week or < 15%
-        margin_pct = (net_gp / weekly_revenue * 100) if weekly_revenue > 0 else 0
-        if net_gp < 400 or margin_pct < 15:
-            busy_fools.append({
-                "name": f"{p.get('first_name')} {p.get('last_name')}",
-                "net_gp": round(net_gp, 2),
-                "margin_pct": round(margin_pct, 1),
-                "client": p.get("current_project") or "Unknown"
-            })
-
-    gross_margin = total_revenue - total_payroll
-    total_margin_percent = (gross_margin / total_revenue * 100) if total_revenue > 0 else 0
+        return {"error": describe(e)}
 
     return {
-        "status": "Healthy" if total_margin_percent > 18 else "Critical",
-        "weekly_revenue": total_revenue,
-        "weekly_gross_profit": gross_margin,
-        "margin_percent": round(total_margin_percent, 2),
-        "busy_fool_deals": busy_fools
+        "status": "Healthy" if result["margin_percent"] > rules["healthy_margin_pct"] else "Critical",
+        "weekly_revenue": result["weekly_revenue"],
+        "weekly_gross_profit": result["weekly_gross_profit"],
+        "margin_percent": round(result["margin_percent"], 2),
+        "busy_fool_deals": result["busy_fool_deals"]
     }
 
-def get_bench_liability() -> Dict:
+def get_financial_health() -> Dict:
+    """Sync wrapper around get_financial_health_async()."""
+    return run_sync(get_financial_health_async())
+
+async def _placement_book(label: str) -> PlacementBook:
+    # Placed candidates = Revenue Generating
+    version, records = await get_candidate_records(label)
+    placements = [c for c in records if c.status in ("on_job", "placed")]
+    return cached_book("placements", version, placements)
+
+async def run_margin_scenarios_async(
+    burden_multipliers: Optional[List[float]] = None,
+    weekly_hours: Optional[List[float]] = None,
+    charge_rate_change_pct: Optional[List[float]] = None,
+    pay_rate_change_pct: Optional[List[float]] = None,
+) -> Dict:
     """
-    Calculates the CASH BURN of unassigned candidates with guaranteed hours.
+    Delegate: The Accountant (What-If Desk).
+    Re-prices the whole placement book under every combination of the given
+    burden multipliers, weekly hours and % changes to charge/pay rates.
+    Omitted lists stay at today's rules (1.30x, 40 hrs, no rate change).
     """
-    sb = get_supabase()
+    sb = await get_async_supabase()
     if not sb: return {"error": "DB Connection Failed"}
 
+    scenarios = scenario_grid(burden_multipliers, weekly_hours, charge_rate_change_pct, pay_rate_change_pct)
+    if len(scenarios) > MAX_SCENARIOS:
+        return {"error": f"{len(scenarios)} scenarios requested; the limit is {MAX_SCENARIOS}."}
+
     try:
-        # Available candidates with > 0 guaranteed hours
-        res = sb.table("candidates").select("*").eq("status", "available").gt("guaranteed_hours", 0).execute()
-        liabilities = res.data
+        book = await _placement_book("run_margin_scenarios")
     except Exception as e:
-        return {"error": str(e)}
-
-    total_burn = 0
-    burn_list = []
-
-    for c in liabilities:
-        hours = c.get("guaranteed_hours") or 0
-        pay = _parse_currency(c.get("pay_rate"))
-        weekly_burn = hours * pay # Direct cost, no burden on bench usually, or add ACC? Let's keep raw pay.
-        
-        total_burn += weekly_burn
-        burn_list.append({
-            "name": f"{c.get('first_name')} {c.get('last_name')}",
-            "weekly_burn": weekly_burn,
-            "guaranteed_hours": hours
-        })
+        return {"error": describe(e)}
 
+    rules = finance_rules()
+    results = book.sweep([{}] + scenarios, rules)
+    baseline, results = results[0], results[1:]
     return {
-        "status": "Clean" if total_burn == 0 else "Burning Cash",
-        "total_weekly_burn": total_burn,
-        "liability_list": burn_list
+        "placements": len(book),
+        "baseline": baseline,
+        "scenarios": results,
+        "best_gross_profit": max(results, key=lambda r: r["weekly_gross_profit"]) if results else baseline
     }
+
+def run_margin_scenarios(
+    burden_multipliers: Optional[List[float]] = None,
+    weekly_hours: Optional[List[float]] = None,
+    charge_rate_change_pct: Optional[List[float]] = None,
+    pay_rate_change_pct: Optional[List[float]] = None,
+) -> Dict:
+    """Sync wrapper around run_margin_scenarios_async()."""
+    return run_sync(run_margin_scenarios_async(burden_multipliers, weekly_hours, charge_rate_change_pct, pay_rate_change_pct))
+
+async def get_bench_liability_async(cursor: str = "") -> Dict:
+    """
+    Calculates the CASH BURN of unassigned candidates with guaranteed hours.
+    Served from the running finance ledger (kept current from roster changes).
+    `summary` totals the whole bench; `items` lists the biggest burners first,
+    one page at a time (pass page.next_cursor as `cursor` for more).
+    """
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
+
+    try:
+        params, offset, seen = resume("get_bench_liability", cursor, {})
+    except Exception as e:
+        return {"error": describe(e)}
+
+    result = None
+    version = None
+    mode = _aggregation()
+    try:
+        if mode == "rpc":
+            result = await _rpc(sb, "agent_bench_liability", {}, "get_bench_liability")
+        if result is None:
+            if mode == "ledger":
+                ledger = get_finance_ledger()
+                await ledger.sync("get_bench_liability")
+                result = ledger.bench_liability()
+                version = ledger.version
+            else:
+                # Available candidates with > 0 guaranteed hours; raw pay, no burden
+                version, records = await get_candidate_records("get_bench_liability")
+                result = bench_liability(records)
+    except Exception as e:
+        return {"error": describe(e)}
+
+    burn_list = result.get("liability_list") or []
+    if mode == "rpc":
+        burn_list = sorted(burn_list, key=liability_order)
+    hours = result.get("total_guaranteed_hours")
+    summary = {
+        "status": result.get("status"),
+        "total_weekly_burn": result.get("total_weekly_burn"),
+        "liable_count": len(burn_list),
+        "total_guaranteed_hours": hours if hours is not None else sum(b.get("guaranteed_hours") or 0 for b in burn_list),
+    }
+    return paginate("get_bench_liability", burn_list, summary, params, offset, version, seen)
+
+def get_bench_liability(cursor: str = "") -> Dict:
+    """Sync wrapper around get_bench_liability_async()."""
+    return run_sync(get_bench_liability_async(cursor))
+
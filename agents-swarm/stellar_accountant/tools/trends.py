@@ -0,0 +1,77 @@
+import math
+import time
+from stellar_core.aio import run_sync
+from stellar_core.history import BUCKET_NAMES, bucket_start, get_history_store
+from typing import List, Dict, Optional
+
+DEFAULT_METRICS = ("margin_percent", "weekly_gross_profit", "bench_weekly_burn", "bench_available", "visa_expired")
+MAX_POINTS = 400
+
+def _value(x: float) -> Optional[float]:
+    if math.isnan(x):
+        return None
+    return int(x) if float(x).is_integer() else round(float(x), 2)
+
+async def get_trend_async(
+    metrics: Optional[List[str]] = None,
+    days: int = 84,
+    bucket: str = "week",
+    agg: str = "last",
+) -> Dict:
+    """
+    Delegate: The Accountant (Trend Desk).
+    How margin, bench burn, bench size and visa risk have moved over the last
+    `days` days, from the recorded history (no database query).
+    `bucket`: hour / day / week / month. `agg`: last / mean / min / max per bucket.
+    `metrics` defaults to margin_percent, weekly_gross_profit, bench_weekly_burn,
+    bench_available and visa_expired; others: weekly_revenue, busy_fool_count,
+    bench_liable_count, bench_guaranteed_hours, bench_mobile, bench_seniors,
+    visa_0_14, visa_15_30, visa_31_90.
+    """
+    metrics = list(metrics or DEFAULT_METRICS)
+    if bucket not in BUCKET_NAMES:
+        return {"error": f"Unknown bucket '{bucket}'; use one of {', '.join(BUCKET_NAMES)}."}
+    if days <= 0:
+        return {"error": "days must be positive."}
+
+    end = time.time()
+    start = end - days * 86400
+    try:
+        keys, values, samples = get_history_store().query(metrics, start, end, bucket, agg)
+    except Exception as e:
+        return {"error": str(e)}
+    if len(keys) > MAX_POINTS:
+        return {"error": f"{len(keys)} {bucket} buckets in {days} days; the limit is {MAX_POINTS}. Use a coarser bucket or fewer days."}
+
+    points = []
+    for i, key in enumerate(keys):
+        point = {"start": bucket_start(key, bucket), "samples": int(samples[i])}
+        point.update({m: _value(values[m][i]) for m in metrics})
+        points.append(point)
+
+    change = {}
+    for m in metrics:
+        present = [p[m] for p in points if p[m] is not None]
+        if present:
+            change[m] = {"first": present[0], "last": present[-1], "delta": _value(present[-1] - present[0])}
+
+    result = {
+        "days": days,
+        "bucket": bucket,
+        "agg": agg,
+        "samples": int(samples.sum()),
+        "points": points,
+        "change": change,
+    }
+    if not points:
+        result["note"] = "No history recorded in this window yet (python -m stellar_gm.tools.history record)."
+    return result
+
+def get_trend(
+    metrics: Optional[List[str]] = None,
+    days: int = 84,
+    bucket: str = "week",
+    agg: str = "last",
+) -> Dict:
+    """Sync wrapper around get_trend_async()."""
+    return run_sync(get_trend_async(metrics, days, bucket, agg))
@@ -0,0 +1,5 @@
+import sys
+
+from stellar_bench.runner import main
+
+sys.exit(main())
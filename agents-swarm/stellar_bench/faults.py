@@ -0,0 +1,125 @@
+"""
+Fault-injecting wrapper for a local query-builder client.
+
+FaultyClient(LocalSupabase(...)) behaves like the client it wraps, except that
+execute() can fail the way Supabase does when it is degraded:
+
+    error_rate    share of executes that raise a transient error, cycling
+                  through a connect error, a read timeout and an HTTP 503
+    down()/up()   a full outage: every execute fails until up()
+    delay_ms      extra latency on every execute (on top of the wrapped client's)
+
+Failures are drawn from a seeded RNG, so a run is reproducible. `calls` and
+`injected` count executes and injected failures. Install it like any stand-in:
+
+    db.use_client(FaultyClient(LocalSupabase(tables, latency_ms=20), error_rate=0.3))
+
+The bench takes it with --fault-rate (stellar_bench.runner).
+"""
+import asyncio
+import inspect
+import random
+import threading
+import time
+from typing import Any, Dict
+
+import httpx
+from postgrest.exceptions import APIError
+
+
+def _faults():
+    request = httpx.Request("GET", "http://stellar-faults.local/rest/v1")
+    return (
+        lambda: httpx.ConnectError("injected fault: connection refused", request=request),
+        lambda: httpx.ReadTimeout("injected fault: read timed out", request=request),
+        lambda: APIError({"message": "injected fault: service unavailable", "code": 503,
+                          "hint": None, "details": None}),
+    )
+
+
+class FaultyQuery:
+    """Proxy over one builder chain; only execute() differs."""
+
+    def __init__(self, client: "FaultyClient", inner: Any):
+        self._client = client
+        self._inner = inner
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        if not callable(attr) or name == "request_key":
+            return attr
+
+        def chained(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return FaultyQuery(self._client, result) if result is self._inner else result
+        return chained
+
+    @property
+    def not_(self):
+        self._inner.not_
+        return self
+
+    def execute(self):
+        fault = self._client.draw()
+        asynchronous = getattr(self._client.inner, "asynchronous", True)
+        if not asynchronous:
+            self._client.wait()
+            if fault is not None:
+                raise fault
+            return self._inner.execute()
+
+        async def run():
+            if self._client.delay_ms:
+                await asyncio.sleep(self._client.delay_ms / 1000)
+            if fault is not None:
+                raise fault
+            result = self._inner.execute()
+            return await result if inspect.isawaitable(result) else result
+        return run()
+
+
+class FaultyClient:
+    """Client object for stellar_core.db.use_client(); see module docstring."""
+
+    def __init__(self, inner: Any, error_rate: float = 0.0, delay_ms: float = 0.0, seed: int = 0):
+        self.inner = inner
+        self.error_rate = error_rate
+        self.delay_ms = delay_ms
+        self.outage = False
+        self.calls = 0
+        self.injected = 0
+        self._rng = random.Random(seed)
+        self._faults = _faults()
+        self._lock = threading.Lock()
+
+    def down(self) -> None:
+        self.outage = True
+
+    def up(self) -> None:
+        self.outage = False
+
+    def draw(self):
+        """The exception this execute() should raise, or None."""
+        with self._lock:
+            self.calls += 1
+            if not self.outage and self._rng.random() >= self.error_rate:
+                return None
+            fault = self._faults[self.injected % len(self._faults)]()
+            self.injected += 1
+            return fault
+
+    def wait(self) -> None:
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "injected": self.injected, "outage": self.outage}
+
+    def table(self, name: str) -> FaultyQuery:
+        return FaultyQuery(self, self.inner.table(name))
+
+    def rpc(self, fn: str, params: Dict = None) -> FaultyQuery:
+        return FaultyQuery(self, self.inner.rpc(fn, params))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
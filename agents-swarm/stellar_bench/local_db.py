@@ -0,0 +1,358 @@
+"""
+In-process stand-in for the Supabase/PostgREST query builder.
+
+LocalSupabase holds tables as lists of dicts and implements the builder calls
+the tools make (select, eq/neq/gt/gte/lt/lte, in_, is_, like/ilike, not_,
+order, limit, range, execute) with PostgREST semantics where they matter:
+NULL never matches a comparison (also under not_), `col->>key` reads a JSON
+key as text, rows come back as fresh dicts holding only the selected columns.
+
+Range and equality filters are served from sorted per-column indexes (built on
+first use, like the Postgres indexes in supabase/migrations), and `order("id")`
+scans stop at the limit, so keyset-paginated loads stay linear at 1M rows.
+
+Install it with stellar_core.db.use_client(LocalSupabase(tables)). With
+asynchronous=True (what the async tools expect) execute() is a coroutine;
+latency_ms adds a simulated round-trip to every execute(); max_rows caps every
+response the way PostgREST's db-max-rows does (Supabase: 1000). rpc() raises, as a
+database without migration 0005 would, so finance tools take their Python path.
+Writes are not implemented: no tool writes.
+"""
+import asyncio
+import bisect
+import copy
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class LocalQueryError(Exception):
+    """Raised for anything the stand-in does not support (unknown table, rpc, ...)."""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code  # PostgREST error code where one applies
+
+
+class LocalResponse:
+    """Shape of postgrest's APIResponse that the tools read."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _read(row: Dict, column: str) -> Any:
+    """Column value; `col->>key` reads a JSON key as text (None when missing)."""
+    if "->>" not in column:
+        return row.get(column)
+    col, key = column.split("->>", 1)
+    value = (row.get(col) or {}).get(key)
+    if value is None or isinstance(value, str):
+        return value
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def _coerce(value: Any, sample: Any) -> Any:
+    """Filter value cast to the column's Python type (PostgREST sends text)."""
+    if value is None or sample is None or isinstance(value, type(sample)):
+        return value
+    if isinstance(sample, bool):
+        return str(value).lower() == "true"
+    if isinstance(sample, (int, float)):
+        return float(value)
+    return str(value)
+
+
+def _like(pattern: str, ignore_case: bool) -> "re.Pattern":
+    body = "".join(".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern)
+    return re.compile(f"^{body}$", re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+
+class LocalTable:
+    """Rows kept in id order, plus lazily built sorted indexes per column."""
+
+    def __init__(self, name: str, rows: Iterable[Dict]):
+        self.name = name
+        self.rows: List[Dict] = sorted(rows, key=lambda r: r["id"])
+        self._indexes: Dict[str, Tuple[List[Any], List[int]]] = {}
+        self._samples: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def sample(self, column: str) -> Any:
+        """First non-null value of `column` (its type drives filter coercion)."""
+        if column not in self._samples:
+            self._samples[column] = next((v for v in (_read(r, column) for r in self.rows) if v is not None), None)
+        return self._samples[column]
+
+    def index(self, column: str) -> Tuple[List[Any], List[int]]:
+        """(sorted non-null values, row positions) for `column`."""
+        with self._lock:
+            built = self._indexes.get(column)
+            if built is None:
+                pairs = sorted(((v, i) for i, v in ((i, _read(r, column)) for i, r in enumerate(self.rows)) if v is not None),
+                               key=lambda p: p[0])
+                built = self._indexes[column] = ([p[0] for p in pairs], [p[1] for p in pairs])
+            return built
+
+
+# Filter ops that can be served from a column index.
+_INDEXED_OPS = ("eq", "gt", "gte", "lt", "lte")
+
+
+class LocalQuery:
+    """One builder chain: table(...).select(...).<filters>.execute()."""
+
+    def __init__(self, db: "LocalSupabase", table: str):
+        self._db = db
+        self._table = table
+        self._columns: Optional[List[str]] = None
+        self._filters: List[Tuple[str, str, Any, bool]] = []  # (op, column, value, negated)
+        self._negate = False
+        self._order: List[Tuple[str, bool, Optional[bool]]] = []
+        self._offset = 0
+        self._limit: Optional[int] = None
+        self._count: Optional[str] = None
+
+    # --- builder ---
+
+    def select(self, *columns: str, count: Optional[str] = None, **_):
+        cols = [c.strip() for c in ",".join(columns or ("*",)).split(",") if c.strip()]
+        self._columns = None if cols == ["*"] else cols
+        self._count = count
+        return self
+
+    def _filter(self, op: str, column: str, value: Any):
+        self._filters.append((op, column, value, self._negate))
+        self._negate = False
+        return self
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def eq(self, column: str, value: Any):
+        return self._filter("eq", column, value)
+
+    def neq(self, column: str, value: Any):
+        return self._filter("neq", column, value)
+
+    def gt(self, column: str, value: Any):
+        return self._filter("gt", column, value)
+
+    def gte(self, column: str, value: Any):
+        return self._filter("gte", column, value)
+
+    def lt(self, column: str, value: Any):
+        return self._filter("lt", column, value)
+
+    def lte(self, column: str, value: Any):
+        return self._filter("lte", column, value)
+
+    def in_(self, column: str, values: Iterable[Any]):
+        return self._filter("in", column, list(values))
+
+    def is_(self, column: str, value: Any):
+        return self._filter("is", column, value)
+
+    def like(self, column: str, pattern: str):
+        return self._filter("like", column, _like(pattern, False))
+
+    def ilike(self, column: str, pattern: str):
+        return self._filter("ilike", column, _like(pattern, True))
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **_):
+        self._order.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, **_):
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def request_key(self) -> str:
+        """What the equivalent PostgREST request would be, for stellar_core.resilience."""
+        return repr((self._table, self._columns, self._filters, self._order, self._offset, self._limit, self._count))
+
+    # --- evaluation ---
+
+    def _predicate(self, table: LocalTable) -> Callable[[Dict], bool]:
+        tests = []
+        for op, column, value, negated in self._filters:
+            sample = table.sample(column)
+            if op == "in":
+                value = [_coerce(v, sample) for v in value]
+            elif op not in ("is", "like", "ilike"):
+                value = _coerce(value, sample)
+            tests.append((op, column, value, negated))
+
+        def test(op: str, current: Any, value: Any) -> Optional[bool]:
+            if op == "is":
+                wanted = None if value in (None, "null") else _coerce(value, True)
+                return current is wanted if wanted is None else current == wanted
+            if current is None:
+                return None  # SQL NULL: unknown, filtered out with or without NOT
+            if op == "eq":
+                return current == value
+            if op == "neq":
+                return current != value
+            if op == "gt":
+                return current > value
+            if op == "gte":
+                return current >= value
+            if op == "lt":
+                return current < value
+            if op == "lte":
+                return current <= value
+            if op == "in":
+                return current in value
+            return value.match(str(current)) is not None
+
+        def predicate(row: Dict) -> bool:
+            for op, column, value, negated in tests:
+                result = test(op, _read(row, column), value)
+                if result is None or result == negated:
+                    return False
+            return True
+
+        return predicate
+
+    def _candidates(self, table: LocalTable) -> Iterable[int]:
+        """Row positions (ascending) to test: the narrowest indexed filter wins, else the whole table."""
+        best = None
+        for op, column, value, negated in self._filters:
+            if negated or op not in _INDEXED_OPS or value is None:
+                continue
+            values, positions = table.index(column)
+            value = _coerce(value, table.sample(column))
+            lo, hi = 0, len(values)
+            if op in ("eq", "gte"):
+                lo = bisect.bisect_left(values, value)
+            elif op == "gt":
+                lo = bisect.bisect_right(values, value)
+            if op in ("eq", "lte"):
+                hi = bisect.bisect_right(values, value)
+            elif op == "lt":
+                hi = bisect.bisect_left(values, value)
+            if best is None or hi - lo < best[0]:
+                best = (hi - lo, column, positions, lo, hi)
+        if best is None:
+            return range(len(table.rows))
+        _, column, positions, lo, hi = best
+        if column == "id":
+            # Rows are stored in id order, so an id range is a slice of positions.
+            return range(positions[lo], positions[hi - 1] + 1) if hi > lo else ()
+        return sorted(positions[lo:hi])
+
+    def _sorted(self, rows: List[Dict]) -> List[Dict]:
+        for column, desc, nullsfirst in reversed(self._order):
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [r for r in rows if _read(r, column) is not None]
+            missing = [r for r in rows if _read(r, column) is None]
+            present.sort(key=lambda r: _read(r, column), reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _shape(self, row: Dict) -> Dict:
+        if self._columns is None:
+            return copy.deepcopy(row)
+        out = {}
+        for c in self._columns:
+            value = _read(row, c)
+            out[c.split("->>")[-1]] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        return out
+
+    def _run(self) -> LocalResponse:
+        table = self._db.get_table(self._table)
+        matches = self._predicate(table)
+        positions = self._candidates(table)
+        rows = table.rows
+        limit = self._limit
+        if self._db.max_rows is not None:
+            limit = self._db.max_rows if limit is None else min(limit, self._db.max_rows)
+        stop = None if limit is None else self._offset + limit
+
+        if not self._order or self._order == [("id", False, None)]:
+            # Id order is storage order: stop as soon as the page is full.
+            picked: List[Dict] = []
+            for i in positions:
+                row = rows[i]
+                if matches(row):
+                    picked.append(row)
+                    if stop is not None and len(picked) >= stop and not self._count:
+                        break
+            total = len(picked)
+        else:
+            picked = self._sorted([rows[i] for i in positions if matches(rows[i])])
+            total = len(picked)
+        page = picked[self._offset:stop]
+        self._db.round_trips += 1
+        return LocalResponse([self._shape(r) for r in page], total if self._count else None)
+
+    def execute(self):
+        if not self._db.asynchronous:
+            self._db.wait()
+            return self._run()
+        return self._execute_async()
+
+    async def _execute_async(self) -> LocalResponse:
+        if self._db.latency_ms:
+            await asyncio.sleep(self._db.latency_ms / 1000)
+        return self._run()
+
+
+class _LocalRpc:
+    def __init__(self, db: "LocalSupabase", fn: str, params: Dict = None):
+        self._db = db
+        self._fn = fn
+        self._params = params
+
+    def request_key(self) -> str:
+        return repr(("rpc", self._fn, sorted((self._params or {}).items())))
+
+    def execute(self):
+        self._db.round_trips += 1
+        error = LocalQueryError(f"Could not find the function public.{self._fn} in the local stand-in", "PGRST202")
+        if not self._db.asynchronous:
+            raise error
+
+        async def fail():
+            raise error
+        return fail()
+
+
+class LocalSupabase:
+    """Client object for stellar_core.db.use_client(); see module docstring."""
+
+    def __init__(self, tables: Dict[str, Iterable[Dict]], latency_ms: float = 0.0, asynchronous: bool = True,
+                 max_rows: Optional[int] = None):
+        self.tables = {name: LocalTable(name, rows) for name, rows in tables.items()}
+        self.latency_ms = latency_ms
+        self.max_rows = max_rows
+        self.asynchronous = asynchronous
+        self.round_trips = 0
+
+    def get_table(self, name: str) -> LocalTable:
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise LocalQueryError(f'relation "public.{name}" does not exist') from None
+
+    def wait(self) -> None:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def rpc(self, fn: str, params: Dict = None) -> _LocalRpc:
+        return _LocalRpc(self, fn, params)
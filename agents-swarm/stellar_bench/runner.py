@@ -0,0 +1,293 @@
+"""
+Tool benchmark runner. From agents-swarm/:
+
+    python -m stellar_bench --sizes 1k,10k,100k --output bench.json
+    python -m stellar_bench --sizes 100k --baseline bench.json   # exit 1 on regression
+    python -m stellar_bench --sizes 1m --tools get_bench_strength,search_talent
+    python -m stellar_bench --sizes 100k --backend sqlite   # offline snapshot path
+    python -m stellar_bench --sizes 10k --fault-rate 0.2    # 20% of queries fail
+
+For every dataset size: generate the synthetic tables (stellar_bench.synth),
+route all tools to a LocalSupabase (or, with --backend sqlite, to an offline
+snapshot file of the same rows, see stellar_core.offline), optionally behind
+stellar_bench.faults injecting transient failures (--fault-rate), then per tool
+
+    reset process caches -> one cold call -> `iterations` warm calls
+    -> one more warm call under tracemalloc
+
+Tools are wrapped with as_tool(), exactly as the agents register them, so the
+numbers include telemetry and result serialization, and round-trips/rows per
+call come from stellar_core.telemetry.
+
+Reported per (size, tool): cold ms, warm p50/p95/p99/max ms, round-trips and
+rows per warm call, peak Python allocation of a warm call (KiB); per size,
+dataset build time and process peak RSS. Results can be saved as JSON and
+compared against a saved baseline (a p95 regression beyond the tolerance fails
+the run).
+"""
+import asyncio
+import gc
+import importlib
+import json
+import math
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from stellar_bench.faults import FaultyClient
+from stellar_bench.local_db import LocalSupabase
+from stellar_bench.synth import dataset
+
+# name -> (module, coroutine function, kwargs)
+TOOLS: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    "get_financial_health": ("stellar_accountant.tools.financials", "get_financial_health_async", {}),
+    "get_bench_liability": ("stellar_accountant.tools.financials", "get_bench_liability_async", {}),
+    "run_margin_scenarios": ("stellar_accountant.tools.financials", "run_margin_scenarios_async",
+                             {"burden_multipliers": [1.25, 1.3, 1.35], "weekly_hours": [35, 40, 45]}),
+    "search_talent": ("stellar_candidate_mgr.tools.candidates", "search_talent_async", {"query": "hammerhand"}),
+    "search_talent_near": ("stellar_candidate_mgr.tools.candidates", "search_talent_async",
+                           {"query": "hammerhand", "near": "Westgate", "radius_km": 30}),
+    "get_bench_strength": ("stellar_candidate_mgr.tools.candidates", "get_bench_strength_async", {}),
+    "generate_squads": ("stellar_candidate_mgr.tools.candidates", "generate_squads_async",
+                        {"region": "Manukau", "project_type": "STRUCTURE"}),
+    "generate_squads_area": ("stellar_candidate_mgr.tools.candidates", "generate_squads_async",
+                             {"region": "South Auckland", "radius_km": 10}),
+    "check_visa_risks": ("stellar_immigration.tools.immigration", "check_visa_risks_async", {}),
+    "search_clients": ("stellar_sales_lead.tools.sales", "search_clients_async", {"region": "Auckland"}),
+    "search_clients_near": ("stellar_sales_lead.tools.sales", "search_clients_async",
+                            {"region": "Westgate", "radius_km": 30}),
+    "get_golden_hour_list": ("stellar_sales_lead.tools.sales", "get_golden_hour_list_async", {}),
+    "find_demand_for_squad": ("stellar_sales_lead.tools.sales", "find_demand_for_squad_async",
+                              {"squad": {"logistics": {"region": "South Auckland"}}}),
+    "match_squads_to_demand": ("stellar_sales_lead.tools.sales", "match_squads_to_demand_async",
+                               {"squads": [{"squad_id": f"SQ-{r[:3].upper()}-{i}", "financials": {"est_weekly_revenue": 9000 - 150 * i},
+                                            "logistics": {"region": r}}
+                                           for i, r in enumerate(("Auckland", "Waikato", "Wellington", "Canterbury") * 10)],
+                                "project_type": "CIVIL"}),
+    "audit_data_quality": ("stellar_systems_it.tools.systems", "audit_data_quality_async", {}),
+    "validate_squad_trades": ("stellar_systems_it.tools.systems", "validate_squad_trades_async",
+                              {"project_type": "CIVIL", "members": [{"name": "A", "role": "Civil Labourer"},
+                                                                    {"name": "B", "role": "Painter"}]}),
+    "gm.get_status_snapshot": ("stellar_gm.tools.status", "get_status_snapshot_async", {}),
+    "gm.search_talent": ("stellar_gm.tools.candidates", "search_talent_async", {"query_role": "digger"}),
+    "gm.get_financial_health": ("stellar_gm.tools.accountant", "get_financial_health_async", {}),
+}
+
+
+def reset_caches() -> None:
+    """Drops every process-wide cache so the next tool call starts cold."""
+    from stellar_core import (
+        cache, candidate, demand, expiry, finance_engine, golden_hour, ledger, resilience, talent_index,
+    )
+
+    cache._cache = None
+    candidate._store = None
+    talent_index._index = None
+    expiry._calendar = None
+    golden_hour._board = None
+    demand._book = None
+    ledger._ledger = None
+    resilience._resilience = None
+    with finance_engine._book_lock:
+        finance_engine._book_cache.clear()
+    systems = sys.modules.get("stellar_systems_it.tools.systems")
+    if systems is not None:
+        systems._last_audit_at = None
+    gc.collect()
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """Process high-water RSS (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def load_tool(name: str):
+    from stellar_core.aio import as_tool
+
+    module, fn, kwargs = TOOLS[name]
+    return as_tool(getattr(importlib.import_module(module), fn)), kwargs
+
+
+async def bench_tool(name: str, iterations: int) -> Dict[str, Any]:
+    from stellar_core.telemetry import get_tool_metrics, metrics
+
+    tool, kwargs = load_tool(name)
+    reset_caches()
+
+    metrics.reset()
+    start = time.perf_counter()
+    result = await tool(**kwargs)
+    cold_ms = (time.perf_counter() - start) * 1000
+    cold = get_tool_metrics().get(tool.__name__, {})
+
+    metrics.reset()
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await tool(**kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    warm = get_tool_metrics().get(tool.__name__, {})
+
+    tracemalloc.start()
+    try:
+        await tool(**kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    calls = max(1, iterations)
+    error = result.get("error") if isinstance(result, dict) else (result if isinstance(result, str) else None)
+    return {
+        "cold_ms": round(cold_ms, 2),
+        "cold_round_trips": cold.get("round_trips", 0),
+        "cold_rows": cold.get("rows", 0),
+        "p50_ms": round(percentile(samples, 50), 3) if samples else None,
+        "p95_ms": round(percentile(samples, 95), 3) if samples else None,
+        "p99_ms": round(percentile(samples, 99), 3) if samples else None,
+        "max_ms": round(max(samples), 3) if samples else None,
+        "round_trips": round(warm.get("round_trips", 0) / calls, 2),
+        "rows": round(warm.get("rows", 0) / calls, 1),
+        "result_bytes": round(warm.get("result_bytes", 0) / calls),
+        "warm_peak_kib": round(peak / 1024, 1),
+        "error": error,
+    }
+
+
+def build_client(size: int, seed: int, latency_ms: float, backend: str, workdir: str) -> Any:
+    """Query-builder client over the synthetic tables: in memory, or an offline SQLite snapshot."""
+    if backend == "sqlite":
+        from stellar_core.offline import SnapshotClient, write_snapshot
+
+        path = os.path.join(workdir, f"bench-{size}-{seed}.db")
+        write_snapshot(path, dataset(size, seed), source="stellar_bench")
+        return SnapshotClient(path)
+    return LocalSupabase(dataset(size, seed), latency_ms=latency_ms)
+
+
+async def run(sizes: Sequence[int], tools: Sequence[str], iterations: int = 20, seed: int = 42,
+              latency_ms: float = 0.0, log=print, backend: str = "memory", fault_rate: float = 0.0) -> Dict[str, Any]:
+    """Benchmarks `tools` at each size; returns {"config": ..., "sizes": {size: {...}}}."""
+    from stellar_core import db
+
+    report: Dict[str, Any] = {
+        "config": {"iterations": iterations, "seed": seed, "latency_ms": latency_ms, "backend": backend,
+                   "fault_rate": fault_rate,
+                   "python": sys.version.split()[0]},
+        "sizes": {},
+    }
+    workdir = tempfile.TemporaryDirectory(prefix="stellar-bench-")
+    try:
+        for size in sizes:
+            start = time.perf_counter()
+            local = build_client(size, seed, latency_ms, backend, workdir.name)
+            if fault_rate:
+                local = FaultyClient(local, error_rate=fault_rate, seed=seed)
+            build_s = time.perf_counter() - start
+            db.use_client(local)
+            log(f"# {size:,} rows per table (built in {build_s:.1f}s)")
+
+            results = {}
+            for name in tools:
+                results[name] = await bench_tool(name, iterations)
+                log(format_row(name, results[name]))
+            report["sizes"][str(size)] = {"build_s": round(build_s, 2), "peak_rss_mb": peak_rss_mb(), "tools": results}
+            del local
+            reset_caches()
+    finally:
+        db.use_client(None)
+        workdir.cleanup()
+    return report
+
+
+HEADER = f"{'tool':<26}{'cold ms':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'rt':>6}{'rows':>9}{'peak KiB':>10}"
+
+
+def format_row(name: str, r: Dict[str, Any]) -> str:
+    def ms(v):
+        return "-" if v is None else f"{v:.2f}"
+    line = (f"{name:<26}{r['cold_ms']:>10.1f}{ms(r['p50_ms']):>9}{ms(r['p95_ms']):>9}{ms(r['p99_ms']):>9}"
+            f"{ms(r['max_ms']):>9}{r['round_trips']:>6g}{r['rows']:>9g}{r['warm_peak_kib']:>10.1f}")
+    return line + (f"  ! {str(r['error'])[:60]}" if r.get("error") else "")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, floor_ms: float = 1.0) -> List[str]:
+    """
+    Regressions against `baseline`: a warm p95 (or cold time) more than
+    `tolerance` (0.25 = +25%) and `floor_ms` worse, for sizes/tools in both runs.
+    """
+    problems = []
+    for size, current in report["sizes"].items():
+        before = baseline.get("sizes", {}).get(size)
+        if not before:
+            continue
+        for tool, now in current["tools"].items():
+            then = before["tools"].get(tool)
+            if not then:
+                continue
+            for key in ("p95_ms", "cold_ms"):
+                old, new = then.get(key), now.get(key)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + tolerance) and new - old > floor_ms:
+                    problems.append(f"{size} rows {tool} {key}: {old:.2f} -> {new:.2f} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return problems
+
+
+def load_report(path: str) -> Optional[Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    from stellar_bench.synth import SIZES, parse_size
+
+    parser = argparse.ArgumentParser(prog="python -m stellar_bench", description="Benchmark agent tools on synthetic data.")
+    parser.add_argument("--sizes", default="1k,10k,100k", help=f"comma list of row counts ({', '.join(SIZES)} or numbers)")
+    parser.add_argument("--tools", default="all", help="comma list of tool names (default all): " + ", ".join(TOOLS))
+    parser.add_argument("--iterations", type=int, default=20, help="warm calls per tool (default 20)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round-trip latency per query (memory backend)")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory",
+                        help="serve the tables from memory (default) or from an offline SQLite snapshot")
+    parser.add_argument("--fault-rate", type=float, default=0.0,
+                        help="share of queries that fail with a transient error (stellar_bench.faults)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against; regressions exit 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (default 0.25)")
+    args = parser.parse_args(argv)
+
+    tools = list(TOOLS) if args.tools == "all" else [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = [t for t in tools if t not in TOOLS]
+    if unknown:
+        parser.error(f"unknown tools: {', '.join(unknown)}")
+    if args.fault_rate and args.backend != "memory":
+        parser.error("--fault-rate needs the memory backend")
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+
+    print(HEADER)
+    report = asyncio.run(run(sizes, tools, args.iterations, args.seed, args.latency_ms, backend=args.backend,
+                                 fault_rate=args.fault_rate))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        problems = compare(report, load_report(args.baseline), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
@@ -0,0 +1,191 @@
+"""
+Seeded synthetic data for `candidates`, `clients` and `market_tenders`.
+
+Rows carry the columns the tools read (see stellar_core.projections) with
+production-like value mixes: UUID ids, ISO `updated_at` stamps, messy
+charge-out text ("$55.50", "60", missing), visa holders with expiries either
+side of today, Tier 1 clients with stale `last_contact`, tenders naming those
+clients. The same (size, seed, as_of) always gives the same rows.
+"""
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+FIRST_NAMES = ("Aroha", "Ben", "Carlos", "Dong", "Eli", "Fetu", "Grace", "Hemi", "Isla", "Jose",
+               "Kiri", "Liam", "Mario", "Nikau", "Olivia", "Pita", "Rangi", "Sione", "Tama", "Wiremu")
+LAST_NAMES = ("Brown", "Cruz", "Fonoti", "Garcia", "Ngata", "Patel", "Reyes", "Smith", "Tuilagi",
+              "Walker", "Wilson", "Santos", "Te Rangi", "Williams", "Zhang")
+# (role, trade, weight); includes the spellings TRADE_SYNONYMS has to catch.
+ROLES = (
+    ("Labourer", "Labourer", 20), ("Hammerhand", "Carpenter", 12), ("Hammer hand", "Carpenter", 3),
+    ("LBP Carpenter", "Carpenter", 10), ("Carpenter", "Carpenter", 8), ("Foreman", "Foreman", 4),
+    ("Site Manager", "Manager", 2), ("Digger Operator", "Digger", 5), ("Excavator Operator", "Digger", 3),
+    ("Civil Labourer", "Labourer", 6), ("Pipelayer", "Pipelayer", 3), ("Traffic Controller", "Traffic", 3),
+    ("Painter", "Painter", 5), ("Plasterer", "Plasterer", 4), ("Gib Stopper", "Stopper", 2),
+    ("Scaffolder", "Scaffolder", 4), ("Steel Fixer", "Steel Fixer", 3), ("Concrete Finisher", "Concreter", 3),
+)
+STATUSES = (("available", 35), ("on_job", 30), ("placed", 15), ("unavailable", 15), ("Floated", 5))
+SUBURBS = (("Manukau", "Auckland"), ("Papatoetoe", "Auckland"), ("Westgate", "Auckland"),
+           ("Auckland CBD", "Auckland"), ("Albany", "Auckland"), ("Hamilton", "Waikato"),
+           ("Tauranga", "Bay of Plenty"), ("Lower Hutt", "Wellington"), ("Riccarton", "Canterbury"),
+           (None, "Auckland"))
+RESIDENCY = (("NZ Citizen", 45), ("Resident", 20), ("Work Visa", 25), ("Filipino Crew - Work Visa", 7), ("Mobile", 3))
+REGIONS = ("South Auckland", "West Auckland", "North Shore", "Auckland Central", "Waikato",
+           "Bay of Plenty", "Wellington", "Canterbury")
+INDUSTRIES = ("Civil", "Commercial", "Residential", "Infrastructure", "Fit-out")
+CLIENT_WORDS = ("Apex", "Southern", "Harbour", "Kauri", "Summit", "Pacific", "Fletcher", "Ironbank",
+                "Tui", "Coastal", "Northern", "Alpine")
+CLIENT_KINDS = ("Construction", "Civil", "Builders", "Projects", "Contracting", "Developments")
+TENDER_TITLES = ("Warehouse Project", "Motorway Upgrade", "School Rebuild", "Apartment Block",
+                 "Hospital Wing", "Water Main Renewal", "Retail Fit-out", "Bridge Strengthening")
+TIERS = (("1", 10), ("2", 30), ("3", 60))
+CLIENT_STATUSES = (("Active", 50), ("Cold", 35), ("Lead", 15))
+TENDER_STATUSES = (("New", 30), ("Open", 25), ("Tender", 20), ("Won", 15), ("Lost", 10))
+
+
+def parse_size(text: str) -> int:
+    """'10k' / '1m' / '2500' -> row count."""
+    key = text.strip().lower()
+    if key in SIZES:
+        return SIZES[key]
+    return int(key)
+
+
+_weights_cache: Dict[int, tuple] = {}
+
+
+def _weighted(pairs):
+    """(values, cumulative weights) for a ((value..., weight), ...) table."""
+    cached = _weights_cache.get(id(pairs))
+    if cached is None:
+        values = [p[:-1] if len(p) > 2 else p[0] for p in pairs]
+        cum, total = [], 0
+        for p in pairs:
+            total += p[-1]
+            cum.append(total)
+        cached = _weights_cache[id(pairs)] = (values, cum)
+    return cached
+
+
+class _Gen:
+    """Per-table RNG plus helpers; tables get independent streams from one seed."""
+
+    def __init__(self, seed: int, table: str, as_of: date):
+        self.rng = random.Random(f"{seed}:{table}")
+        self.today = as_of
+        self.now = datetime.combine(as_of, time(12), tzinfo=timezone.utc)
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def pick(self, pairs):
+        values, cum = _weighted(pairs)
+        return self.rng.choices(values, cum_weights=cum)[0]
+
+    def stamp(self, max_days_ago: int) -> str:
+        return (self.now - timedelta(seconds=self.rng.randrange(max_days_ago * 86400))).isoformat()
+
+    def day(self, first: int, last: int) -> str:
+        return (self.today + timedelta(days=self.rng.randint(first, last))).isoformat()
+
+    def chance(self, p: float) -> bool:
+        return self.rng.random() < p
+
+
+def _charge_text(g: _Gen, pay_rate: int) -> Optional[str]:
+    if g.chance(0.05):
+        return None
+    rate = round(pay_rate * g.rng.uniform(1.2, 1.9), 2)
+    style = g.rng.randrange(3)
+    if style == 0:
+        return f"${rate:.2f}"
+    if style == 1:
+        return f"{rate:g}"
+    return f"$ {rate:,.2f}"
+
+
+def candidates(n: int, seed: int = 42, as_of: Optional[date] = None) -> Iterator[Dict]:
+    g = _Gen(seed, "candidates", as_of or date.today())
+    for i in range(n):
+        role, trade = g.pick(ROLES)
+        status = g.pick(STATUSES)
+        suburb, state = g.rng.choice(SUBURBS)
+        residency = g.pick(RESIDENCY)
+        pay_rate = g.rng.randint(24, 55)
+        on_visa = "visa" in residency.lower()
+        yield {
+            "id": g.uuid(),
+            "updated_at": g.stamp(180),
+            "first_name": g.rng.choice(FIRST_NAMES),
+            "last_name": f"{g.rng.choice(LAST_NAMES)}-{i}",
+            "role": role,
+            "trade": trade,
+            "status": status,
+            "suburb": suburb,
+            "state": state,
+            "pay_rate": pay_rate,
+            "charge_out_rate": _charge_text(g, pay_rate),
+            "guaranteed_hours": g.rng.choice((0, 0, 0, 20, 30, 40)) if status == "available" else 0,
+            "current_project": g.rng.choice(TENDER_TITLES) if status in ("on_job", "placed") else None,
+            "residency": residency,
+            "visa_expiry": f"{g.day(-60, 400)}T00:00:00+00:00" if on_visa else None,
+            "phone": None if g.chance(0.08) else f"02{g.rng.randint(10_000_000, 99_999_999)}",
+            "email": None if g.chance(0.12) else f"candidate{i}@example.co.nz",
+            "compliance": {"siteSafeExpiry": None if g.chance(0.2) else g.day(-30, 700)},
+        }
+
+
+def client_name(i: int, rng: random.Random) -> str:
+    return f"{rng.choice(CLIENT_WORDS)} {rng.choice(CLIENT_KINDS)} {i}"
+
+
+def clients(n: int, seed: int = 42, as_of: Optional[date] = None) -> Iterator[Dict]:
+    g = _Gen(seed, "clients", as_of or date.today())
+    names = random.Random(f"{seed}:client_names")
+    for i in range(n):
+        yield {
+            "id": g.uuid(),
+            "updated_at": g.stamp(120),
+            "name": client_name(i, names),
+            "industry": g.rng.choice(INDUSTRIES),
+            "tier": g.pick(TIERS),
+            "region": g.rng.choice(REGIONS),
+            "status": g.pick(CLIENT_STATUSES),
+            "phone": None if g.chance(0.1) else f"09{g.rng.randint(1_000_000, 9_999_999)}",
+            "email": None if g.chance(0.15) else f"projects{i}@example.co.nz",
+            "active_jobs": g.rng.choice((0, 0, 1, 2, 3, 5)),
+            "last_contact": None if g.chance(0.1) else g.stamp(60),
+        }
+
+
+def market_tenders(n: int, seed: int = 42, as_of: Optional[date] = None, client_count: Optional[int] = None) -> Iterator[Dict]:
+    """Tenders name clients generated with the same seed (`client_count` of them, default n)."""
+    g = _Gen(seed, "market_tenders", as_of or date.today())
+    names = random.Random(f"{seed}:client_names")
+    pool = [client_name(i, names) for i in range(min(client_count or n, 5_000))]
+    for _ in range(n):
+        yield {
+            "id": g.uuid(),
+            "updated_at": g.stamp(90),
+            "title": g.rng.choice(TENDER_TITLES),
+            "client": g.rng.choice(pool) if pool and g.chance(0.6) else None,
+            "main_contractor": g.rng.choice(pool) if pool and g.chance(0.4) else None,
+            "status": g.pick(TENDER_STATUSES),
+            "value": f"{g.rng.randint(50_000, 80_000_000)}.00",
+            "closing_date": None if g.chance(0.1) else g.day(-30, 120),
+        }
+
+
+def dataset(size: int, seed: int = 42, as_of: Optional[date] = None,
+            clients_size: Optional[int] = None, tenders_size: Optional[int] = None) -> Dict[str, List[Dict]]:
+    """All three tables; `size` rows each unless the client/tender sizes are given."""
+    clients_size = size if clients_size is None else clients_size
+    tenders_size = size if tenders_size is None else tenders_size
+    return {
+        "candidates": list(candidates(size, seed, as_of)),
+        "clients": list(clients(clients_size, seed, as_of)),
+        "market_tenders": list(market_tenders(tenders_size, seed, as_of, clients_size)),
+    }
@@ -1,9 +1,9 @@
 import os
 from google.adk.agents.llm_agent import Agent
-from stellar_candidate_mgr.tools.candidates import search_talent, generate_squads, get_bench_strength
-from dotenv import load_dotenv
+from stellar_core.config import load_env
+from stellar_core.registry import agent_ready, lazy_tools
 
-load_dotenv()
+load_env()
 
 # Candidate Manager - Stellar "Quartermaster" Edition
 agent = Agent(
@@ -20,19 +20,23 @@ agent = Agent(
     
     YOUR TOOLKIT:
     - `get_bench_strength`: Use this FIRST to see who is available right now.
-    - `search_talent`: Use to find specific roles (e.g., "Crane Operator").
+    - `search_talent`: Use to find specific roles (e.g., "Crane Operator"). Typos and trade synonyms are fine ("Excavator" finds Diggers); results are ranked by `match_score`.
+      For "near Westgate" / "within 30 km of Westgate", pass `near` (and `radius_km`); results then carry `distance_km` and a travel `band`.
     - `generate_squads`: Use this when the user asks for "Teams", "Crews", or "Capacity" in a specific region.
+      Leave the region blank for a nationwide build. Areas work ("South Auckland" covers Manukau, Papatoetoe, ...); add `radius_km` to widen the catchment. Pass `project_type` (CIVIL/STRUCTURE/INTERIOR) so only valid trades are used.
     
     OPERATIONAL PROTOCOLS:
-    - **Proactive Updates**: If asked "What have we got?", run `get_bench_strength` and summarize the "Mobile Units" and "Seniors".
+    - **Proactive Updates**: If asked "What have we got?", run `get_bench_strength` and summarize the `mobile_units` and `seniors` in its summary.
     - **Commercial Awareness**: When generating squads, ALWAYS mention the `est_weekly_revenue`. e.g., "I have a West Auckland Squad ready. Value: $6,500/week."
     - **Mobility Checks**: If a squad has no mobile members (is_mobile=False), flag this as a "Transport Risk".
+    - **Big Lists**: `get_bench_strength` and `generate_squads` return a `summary` (totals for everything) plus one page of `items` (best first). Report from the summary; only pass `page.next_cursor` back as `cursor` when the user wants more names.
     
     INTERACTION STYLE:
     - Logistical, terse, and ready to deploy.
     - Example: "Assets ready in South Auckland. 2 Squads built. Total revenue potential: $12k/week."
     """,
-    tools=[search_talent, generate_squads, get_bench_strength],
+    tools=lazy_tools("stellar_candidate_mgr.tools.candidates", "search_talent_async", "generate_squads_async", "get_bench_strength_async"),
 )
 
-root_agent = agent
\ No newline at end of file
+root_agent = agent
+agent_ready(__package__, agent.tools)
@@ -1,140 +1,206 @@
-import os
-from supabase import create_client, Client
-from typing import List, Dict, Any
-
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key:
-        print("CRITICAL: Supabase credentials missing.")
-        return None
-    return create_client(url, key)
-
-def _parse_currency(value: Any) -> float:
-    if not value: return 0.0
-    if isinstance(value, (int, float)): return float(value)
-    clean_str = str(value).replace('$', '').replace(',', '').strip()
-    return float(''.join(c for c in clean_str if c.isdigit() or c == '.'))
-
-def _enrich_candidate(c: Dict) -> Dict:
-    """
-    Applies Stellar Business Logic to raw DB rows.
-    Mirrors 'data-context.js' enrichment.
-    """
-    residency = (c.get("residency") or "").lower()
-    role = (c.get("role") or "").lower()
-    compliance = c.get("compliance") or {}
-    
-    # LOGIC: Mobility (The 'Ute' Factor)
-    # Assumes Work Visa holders or specific crews are mobile/willing to travel
-    is_mobile = "work visa" in residency or "filipino" in residency or "mobile" in residency
-    
-    # LOGIC: Seniority
-    is_senior = "lbp" in role or "foreman" in role or "manager" in role or _parse_currency(c.get("pay_rate")) > 38
-
-    return {
-        "id": c.get("id"),
-        "name": f"{c.get('first_name')} {c.get('last_name')}",
-        "role": c.get("role"),
-        "status": c.get("status"),
-        "region": c.get("suburb") or c.get("state") or "Unknown",
-        "pay_rate": _parse_currency(c.get("pay_rate")),
-        "charge_rate": _parse_currency(c.get("charge_out_rate") or c.get("charge_rate")),
-        "is_mobile": is_mobile,
-        "is_senior": is_senior,
-        "site_safe": compliance.get("siteSafeExpiry") is not None or c.get("site_safe_expiry") is not None
-    }
+import re
+from stellar_core.aio import run_sync
+from stellar_core.db import get_async_supabase
+from stellar_core.candidate import get_candidate_records, get_candidate_store
+from stellar_core.envelope import SUMMARY_TOP, paginate, resume, top_counts
+from stellar_core.finance_rules import finance_rules
+from stellar_core.geo import NearFilter, band, resolve
+from stellar_core.resilience import describe
+from stellar_core.talent_index import search_candidates
+from stellar_core.squads import assemble_squads
+from stellar_core.trade_matrix import TRADE_MATRIX, is_known_project_type, is_valid_trade
+from typing import List, Dict
 
-def search_talent(query: str, status: str = "available") -> List[Dict]:
+async def search_talent_async(query: str, status: str = "available", near: str = "", radius_km: float = 0) -> List[Dict]:
     """
     Delegate: Candidate Manager (Scout).
-    Finds specific talent matching a role and status.
+    Finds specific talent matching a role and status (empty status = any).
+    Tolerates typos, spacing ("Hammer hand") and trade synonyms
+    ("Excavator Operator" finds Diggers). Best matches first.
+    Set `near` (a suburb, area like "South Auckland", or region) to only return
+    people there, or within `radius_km` of it ("within 30 km of Westgate");
+    each result then carries distance_km and a travel band.
     """
-    sb = get_supabase()
+    sb = await get_async_supabase()
     if not sb: return [{"error": "DB Connection Failed"}]
 
     try:
-        # Flexible search on Role or Skills
-        response = sb.table("candidates").select("*") \
-            .eq("status", status) \
-            .ilike("role", f"%{query}%") \
-            .limit(15) \
-            .execute()
-            
-        return [_enrich_candidate(c) for c in response.data]
+        centre = resolve(near) if near else None
+        if near and centre is None:
+            return [{"error": f"Unknown location: {near}"}]
+        nearby = NearFilter(centre, radius_km) if centre else None
+
+        # Ranked search over Role / Trade
+        matches = await search_candidates(query, status, 15, "search_talent", keep=nearby)
+        store = get_candidate_store()
+        if nearby is None:
+            return [dict(store.record(row, "search_talent").as_dict(), match_score=score) for row, score in matches]
+        return [
+            dict(store.record(row, "search_talent").as_dict(), match_score=score, distance_km=nearby.km(row), band=band(nearby.km(row)))
+            for row, score in matches
+        ]
     except Exception as e:
-        return [{"error": f"Search failed: {str(e)}"}]
+        return [{"error": f"Search failed: {describe(e)}"}]
+
+def search_talent(query: str, status: str = "available", near: str = "", radius_km: float = 0) -> List[Dict]:
+    """Sync wrapper around search_talent_async()."""
+    return run_sync(search_talent_async(query, status, near, radius_km))
 
-def get_bench_strength() -> Dict:
+async def get_bench_strength_async(cursor: str = "") -> Dict:
     """
     Returns a snapshot of the 'Available' workforce.
     Crucial for the 'Bench Zero' strategy.
+    `summary` covers the whole bench; `items` lists people by charge-out rate,
+    highest first, one page at a time (pass page.next_cursor as `cursor` for more).
     """
-    sb = get_supabase()
+    sb = await get_async_supabase()
     if not sb: return {}
 
     try:
-        response = sb.table("candidates").select("*").eq("status", "available").execute()
-        bench = [_enrich_candidate(c) for c in response.data]
-        
-        return {
+        params, offset, seen = resume("get_bench_strength", cursor, {})
+        version, records = await get_candidate_records("get_bench_strength")
+        bench = [c for c in records if c.status == "available"]
+        bench.sort(key=lambda c: (-c.charge_rate, str(c.id)))
+
+        summary = {
             "total_count": len(bench),
-            "mobile_units": len([c for c in bench if c['is_mobile']]),
-            "seniors": len([c for c in bench if c['is_senior']]),
-            "roster": bench
+            "mobile_units": sum(1 for c in bench if c.is_mobile),
+            "seniors": sum(1 for c in bench if c.is_senior),
+            "by_region": top_counts(c.region for c in bench),
+            "by_role": top_counts(c.role for c in bench),
         }
+        return paginate("get_bench_strength", [c.as_dict() for c in bench], summary, params, offset, version, seen)
     except Exception as e:
-        return {"error": str(e)}
+        return {"error": describe(e)}
+
+def get_bench_strength(cursor: str = "") -> Dict:
+    """Sync wrapper around get_bench_strength_async()."""
+    return run_sync(get_bench_strength_async(cursor))
+
+def _squad_member(m: Dict) -> Dict:
+    """What a squad listing needs per person (region/status are squad-wide)."""
+    return {
+        "id": m["id"],
+        "name": m["name"],
+        "role": m["role"],
+        "charge_rate": m["charge_rate"],
+        "is_mobile": m["is_mobile"],
+        "is_senior": m["is_senior"],
+        "site_safe": m["site_safe"],
+    }
 
-def generate_squads(region: str) -> List[Dict]:
+def _squad_prefix(pool_region: str) -> str:
+    """SQ-<REGION-SLUG>: unique per pool, so squads from different pools never share an id."""
+    slug = re.sub(r"[^A-Z0-9]+", "-", (pool_region or "").upper()).strip("-")
+    return f"SQ-{slug or 'UNKNOWN'}"
+
+async def generate_squads_async(region: str = "", seniors_per_squad: int = 1, juniors_per_squad: int = 2, project_type: str = "", radius_km: float = 0, cursor: str = "") -> Dict:
     """
-    Refactor P1: Squad Builder (1 Senior : 2 Juniors).
-    Calculates the 'Commercial Value' of the squad automatically.
+    Refactor P1: Squad Builder (default 1 Senior : 2 Juniors).
+    Builds the highest-revenue squads possible, each with at least one mobile member.
+    Leave region empty to build across every region in one call. A region can be a
+    suburb, an area ("South Auckland" includes Manukau, Papatoetoe, ...) or a region;
+    set radius_km to also take people within that distance of it. Set project_type
+    (CIVIL / STRUCTURE / INTERIOR) to only use trades the Trade Matrix allows there.
+    Calculates the 'Commercial Value' of the squad automatically (charge-out
+    rates x the Accountant's weekly hours, FINANCE_WEEKLY_HOURS).
+    `summary` totals every squad; `items` lists squads by weekly revenue, highest
+    first, one page at a time (pass page.next_cursor as `cursor` for more).
     """
-    sb = get_supabase()
-    if not sb: return []
+    if seniors_per_squad < 1:
+        return {"error": "seniors_per_squad must be at least 1 (every squad needs a leader)."}
+    if juniors_per_squad < 0:
+        return {"error": "juniors_per_squad can't be negative."}
+    if project_type and not is_known_project_type(project_type):
+        return {"error": f"Unknown project type '{project_type}'. Use one of: {', '.join(TRADE_MATRIX)}."}
+
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
     
     try:
-        # Fetch available candidates in region
-        res = sb.table("candidates").select("*") \
-            .eq("status", "available") \
-            .ilike("suburb", f"%{region}%") \
-            .execute()
-            
-        candidates = [_enrich_candidate(c) for c in res.data]
-        
-        seniors = [c for c in candidates if c['is_senior']]
-        juniors = [c for c in candidates if not c['is_senior']]
-        
+        params, offset, seen = resume("generate_squads", cursor, {
+            "region": region, "seniors_per_squad": seniors_per_squad,
+            "juniors_per_squad": juniors_per_squad, "project_type": project_type,
+            "radius_km": radius_km,
+        })
+        region, seniors_per_squad, juniors_per_squad, project_type, radius_km = (
+            params["region"], params["seniors_per_squad"], params["juniors_per_squad"],
+            params["project_type"], params["radius_km"])
+
+        # Available candidates in region (all regions if blank); gazetteer
+        # places match by proximity, anything else by suburb text
+        needle = region.lower()
+        pools: Dict[str, List[Dict]] = {}
+        version, records = await get_candidate_records("generate_squads")
+        centre = resolve(region) if region else None
+        nearby = None
+        if centre is not None:
+            nearby = {i for i, _ in get_candidate_store().places(version, records).match(centre, radius_km)}
+        for i, c in enumerate(records):
+            if c.status != "available":
+                continue
+            if nearby is not None:
+                if i not in nearby:
+                    continue
+            elif needle not in (c.suburb or "").lower():
+                continue
+            if project_type and not is_valid_trade(project_type, c.role):
+                continue
+            pools.setdefault(region or c.region, []).append(c.as_dict())
+
+        plural = "s" if juniors_per_squad != 1 else ""
+        composition = f"{seniors_per_squad} Senior + {juniors_per_squad} Junior{plural}"
+        weekly_hours = finance_rules()["weekly_hours"]
         squads = []
-        squad_id = 1
         
-        # Build 1:2 Squads
-        while len(seniors) >= 1 and len(juniors) >= 2:
-            s = seniors.pop(0)
-            j1 = juniors.pop(0)
-            j2 = juniors.pop(0)
-            
-            # Commercial Logic
-            total_charge = s['charge_rate'] + j1['charge_rate'] + j2['charge_rate']
-            weekly_revenue = total_charge * 40
-            
-            squads.append({
-                "squad_id": f"SQ-{region.upper()[:3]}-{squad_id}",
-                "composition": "1 Senior + 2 Juniors",
-                "leader": s,
-                "crew": [j1, j2],
-                "financials": {
-                    "hourly_charge_total": total_charge,
-                    "est_weekly_revenue": weekly_revenue
-                },
-                "logistics": {
-                    "has_vehicle": s['is_mobile'] or j1['is_mobile'] or j2['is_mobile'],
-                    "region": region
-                }
-            })
-            squad_id += 1
-            
-        return squads
+        for pool_region in sorted(pools):
+            built = assemble_squads(pools[pool_region], seniors_per_squad, juniors_per_squad)
+            prefix = _squad_prefix(pool_region)
+            for squad_id, (seniors, juniors) in enumerate(built, start=1):
+                members = seniors + juniors
+                
+                # Commercial Logic
+                total_charge = sum(m['charge_rate'] for m in members)
+                weekly_revenue = total_charge * weekly_hours
+                
+                squads.append({
+                    "squad_id": f"{prefix}-{squad_id}",
+                    "composition": composition,
+                    "leader": _squad_member(seniors[0]),
+                    "crew": [_squad_member(m) for m in seniors[1:] + juniors],
+                    "financials": {
+                        "hourly_charge_total": total_charge,
+                        "est_weekly_revenue": weekly_revenue
+                    },
+                    "logistics": {
+                        "has_vehicle": any(m['is_mobile'] for m in members),
+                        "region": pool_region
+                    }
+                })
+
+        squads.sort(key=lambda sq: -sq["financials"]["est_weekly_revenue"])
+        by_region: Dict[str, Dict] = {}
+        for sq in squads:
+            r = by_region.setdefault(sq["logistics"]["region"], {"squads": 0, "est_weekly_revenue": 0})
+            r["squads"] += 1
+            r["est_weekly_revenue"] += sq["financials"]["est_weekly_revenue"]
+        top_regions = sorted(by_region.items(), key=lambda kv: -kv[1]["est_weekly_revenue"])[:SUMMARY_TOP]
+        pooled = sum(len(p) for p in pools.values())
+
+        summary = {
+            "composition": composition,
+            "squad_count": len(squads),
+            "total_est_weekly_revenue": sum(sq["financials"]["est_weekly_revenue"] for sq in squads),
+            "without_vehicle": sum(1 for sq in squads if not sq["logistics"]["has_vehicle"]),
+            "candidates_used": len(squads) * (seniors_per_squad + juniors_per_squad),
+            "candidates_left": pooled - len(squads) * (seniors_per_squad + juniors_per_squad),
+            "by_region": dict(top_regions),
+        }
+        return paginate("generate_squads", squads, summary, params, offset, version, seen)
     except Exception as e:
-        return [{"error": f"Squad generation failed: {str(e)}"}]
\ No newline at end of file
+        return {"error": f"Squad generation failed: {describe(e)}"}
+
+def generate_squads(region: str = "", seniors_per_squad: int = 1, juniors_per_squad: int = 2, project_type: str = "", radius_km: float = 0, cursor: str = "") -> Dict:
+    """Sync wrapper around generate_squads_async()."""
+    return run_sync(generate_squads_async(region, seniors_per_squad, juniors_per_squad, project_type, radius_km, cursor))
+
@@ -0,0 +1,71 @@
+"""
+Async plumbing for the tools.
+
+Every tool is implemented once as `async def <name>_async(...)` on the async
+Supabase client. Agents register those directly (via as_tool, so the LLM still
+sees the original tool name), and the old sync names stay as thin wrappers that
+call run_sync().
+
+run_sync() runs coroutines on one long-lived background loop rather than a fresh
+asyncio.run() per call: the async client and its connection pool belong to a
+loop, so reusing the loop keeps connections warm for sync callers (scripts,
+legacy code) too.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from stellar_core.memo import memoize, with_tool_context
+from stellar_core.telemetry import instrument
+
+T = TypeVar("T")
+
+_bridge_loop: Optional[asyncio.AbstractEventLoop] = None
+_bridge_lock = threading.Lock()
+
+
+def _bridge() -> asyncio.AbstractEventLoop:
+    global _bridge_loop
+    if _bridge_loop is None:
+        with _bridge_lock:
+            if _bridge_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="stellar-async-bridge", daemon=True).start()
+                _bridge_loop = loop
+    return _bridge_loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Runs `coro` to completion on the shared background loop and returns its result."""
+    loop = _bridge()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the async bridge loop; await the *_async tool instead.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def as_tool(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Exposes `foo_async` to an agent under the name `foo`, keeping its signature
+    and docstring (the tool declaration the model sees is unchanged). Every call
+    is measured by stellar_core.telemetry and memoized per turn/session by
+    stellar_core.memo, via the `tool_context` ADK injects (and leaves out of
+    the declaration).
+    """
+    name = fn.__name__[:-len("_async")] if fn.__name__.endswith("_async") else fn.__name__
+    measured = instrument(memoize(fn, name), name)
+
+    @functools.wraps(fn)
+    async def tool(*args, **kwargs):
+        return await measured(*args, **kwargs)
+
+    tool.__name__ = name
+    tool.__qualname__ = name
+    tool.__signature__ = with_tool_context(inspect.signature(fn))
+    return tool
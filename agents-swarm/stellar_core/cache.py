@@ -0,0 +1,273 @@
+"""
+Shared in-memory table snapshots.
+
+Roster-wide tools (bench, squads, financials, audits, visa scans) all read the
+same `candidates` rows. Instead of each one running its own `select("*")`, they
+read one process-wide snapshot and filter/aggregate in memory.
+
+Freshness:
+    - TTL: after SNAPSHOT_TTL seconds the whole table is reloaded (also the only
+      way deletes are noticed when no change feed is attached).
+    - Polling: every SNAPSHOT_POLL seconds, rows with `updated_at` past the
+      high-water mark are fetched (paged, stellar_core.scan) and merged.
+    - Change feed: apply_change() takes INSERT/UPDATE/DELETE events (Supabase
+      realtime payloads, or a local stand-in in tests) and patches the snapshot.
+    - Outages: if a reload or poll fails because the database is unreachable
+      (stellar_core.resilience), the rows already loaded keep being served
+      (flagged stale in telemetry) and the reload is tried again next call.
+
+Listeners: add_listener(table, fn) gets every change to a table's snapshot as
+fn(version, upserted_rows, deleted_ids, reloaded), so derived views (the
+finance ledger) can follow row deltas instead of rescanning. `reloaded` means
+the whole table was replaced; derived state should be rebuilt.
+
+Columns: snapshots select the union of what registered tools declare (see
+stellar_core.projections), not "*".
+
+Size bound: snapshots are kept LRU within SNAPSHOT_MAX_ROWS total rows. A table
+bigger than the whole budget is still served for that call, just not retained.
+
+Reads are async. Concurrent callers on one event loop share a single reload;
+the row dict itself is guarded by a thread lock (never held across an await) so
+change-feed threads and other loops can patch it safely.
+"""
+import asyncio
+import itertools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from stellar_core import memo, telemetry
+from stellar_core.db import get_async_supabase, env_number
+from stellar_core.projections import project, snapshot_columns
+from stellar_core.resilience import unreachable
+from stellar_core.scan import scan_pages, scan_table
+
+
+# Global so a snapshot that is evicted and rebuilt never reuses an old version.
+_versions = itertools.count(1)
+
+# fn(version, upserted rows, deleted ids, reloaded)
+Listener = Callable[[int, List[Dict], List[Any], bool], None]
+
+
+class TableSnapshot:
+    """Rows of one table keyed by id, plus the bookkeeping needed to refresh them."""
+
+    def __init__(self, table: str, ttl: float, poll_interval: float, listeners: List[Listener] = None):
+        self.table = table
+        self.listeners = listeners if listeners is not None else []
+        self.columns = snapshot_columns(table)
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.rows: Dict[Any, Dict] = {}
+        self.loaded_at = 0.0
+        self.polled_at = 0.0
+        self.high_water: Optional[str] = None
+        self.supports_polling = True
+        self.version = 0
+        self.lock = threading.Lock()
+        self._refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def refresh_lock(self) -> asyncio.Lock:
+        """Per-event-loop lock that collapses concurrent reloads/polls into one."""
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            return self._refresh_locks.setdefault(loop, asyncio.Lock())
+
+    def is_expired(self, now: float) -> bool:
+        return not self.loaded_at or now - self.loaded_at >= self.ttl
+
+    def needs_poll(self, now: float) -> bool:
+        return self.supports_polling and now - self.polled_at >= self.poll_interval
+
+    def _track(self, row: Dict) -> None:
+        stamp = row.get("updated_at")
+        if stamp and (self.high_water is None or stamp > self.high_water):
+            self.high_water = stamp
+
+    async def load(self, label: str) -> None:
+        rows: Dict[Any, Dict] = {}
+        async for row in scan_table(self.table, self.columns, label, stale_ok=False):
+            rows[row.get("id")] = row
+
+        with self.lock:
+            self.rows = rows
+            self.high_water = None
+            for row in rows.values():
+                self._track(row)
+            self.supports_polling = self.high_water is not None
+            self.loaded_at = self.polled_at = time.monotonic()
+            self.version = next(_versions)
+            self._notify([], [], True)
+
+    async def poll(self, label: str) -> None:
+        """
+        Merges rows changed since the high-water mark, paged like a full scan
+        (a single select would be capped and unordered). The mark moves only
+        once every page is in, so a failed poll is simply retried from it.
+        """
+        self.polled_at = time.monotonic()
+        if self.high_water is None:
+            return
+        newest = self.high_water
+        try:
+            async for page in scan_pages(self.table, self.columns, label, since=self.high_water, stale_ok=False):
+                with self.lock:
+                    for row in page:
+                        self.upsert(row, track=False)
+                newest = max([newest, *(row["updated_at"] for row in page if row.get("updated_at"))])
+        except Exception as e:
+            if not unreachable(e):
+                # Column missing: fall back to TTL-only refresh.
+                self.supports_polling = False
+            return
+        with self.lock:
+            if newest > self.high_water:
+                self.high_water = newest
+
+    def upsert(self, row: Dict, track: bool = True) -> None:
+        self.rows[row.get("id")] = row
+        if track:
+            self._track(row)
+        self.version = next(_versions)
+        self._notify([row], [], False)
+
+    def delete(self, row_id: Any) -> None:
+        if self.rows.pop(row_id, None) is not None:
+            self.version = next(_versions)
+            self._notify([], [row_id], False)
+
+    def _notify(self, upserted: List[Dict], deleted: List[Any], reloaded: bool) -> None:
+        """Call with self.lock held, so listeners see changes in version order."""
+        for listener in list(self.listeners):
+            listener(self.version, upserted, deleted, reloaded)
+
+
+class SnapshotCache:
+    """LRU of table snapshots bounded by total cached rows."""
+
+    def __init__(self, ttl: float = None, poll_interval: float = None, max_rows: int = None):
+        self.ttl = ttl if ttl is not None else env_number("SNAPSHOT_TTL", 300)
+        self.poll_interval = poll_interval if poll_interval is not None else env_number("SNAPSHOT_POLL", 15)
+        self.max_rows = int(max_rows if max_rows is not None else env_number("SNAPSHOT_MAX_ROWS", 200000))
+        self._tables: "OrderedDict[str, TableSnapshot]" = OrderedDict()
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._lock = threading.Lock()
+
+    def _snapshot(self, table: str) -> TableSnapshot:
+        with self._lock:
+            snap = self._tables.get(table)
+            if snap is None:
+                snap = self._tables[table] = TableSnapshot(
+                    table, self.ttl, self.poll_interval, self._listeners.setdefault(table, []))
+            self._tables.move_to_end(table)
+            return snap
+
+    def _evict(self) -> None:
+        with self._lock:
+            total = sum(len(s.rows) for s in self._tables.values())
+            while total > self.max_rows and self._tables:
+                _, oldest = self._tables.popitem(last=False)
+                total -= len(oldest.rows)
+
+    async def rows(self, table: str, label: str) -> List[Dict]:
+        """
+        All rows of `table`, refreshed per the TTL/poll rules.
+        Rows are shared between callers: treat them as read-only.
+        """
+        return (await self.versioned_rows(table, label))[1]
+
+    async def versioned_rows(self, table: str, label: str) -> Tuple[int, List[Dict]]:
+        """
+        rows() plus a version number that changes whenever the rows do, so
+        callers can memoize structures derived from them.
+        """
+        sb = await get_async_supabase()
+        if not sb:
+            raise RuntimeError("DB Connection Failed")
+
+        snap = self._snapshot(table)
+        async with snap.refresh_lock():
+            now = time.monotonic()
+            if snap.is_expired(now):
+                try:
+                    await snap.load(label)
+                except Exception as e:
+                    if not snap.loaded_at or not unreachable(e):
+                        raise
+                    telemetry.on_stale()  # keep serving the last full load
+            elif snap.needs_poll(now):
+                await snap.poll(label)
+        with snap.lock:
+            rows = list(snap.rows.values())
+            version = snap.version
+
+        if len(rows) > self.max_rows:
+            # Too big to retain; served once, reloaded on next call.
+            with self._lock:
+                self._tables.pop(table, None)
+        else:
+            self._evict()
+        return version, rows
+
+    def add_listener(self, table: str, listener: Listener) -> None:
+        """Calls `listener` on every change to `table`'s snapshot (see module docstring)."""
+        with self._lock:
+            listeners = self._listeners.setdefault(table, [])
+            if listener not in listeners:
+                listeners.append(listener)
+
+    def apply_change(self, table: str, event: str, record: Dict = None, old_record: Dict = None) -> None:
+        """
+        Change-feed hook. `event` is INSERT / UPDATE / DELETE, as in Supabase
+        realtime postgres_changes payloads. Ignored for tables not yet cached.
+        """
+        with self._lock:
+            snap = self._tables.get(table)
+        if snap is None:
+            return
+        with snap.lock:
+            if event.upper() == "DELETE":
+                snap.delete((old_record or record or {}).get("id"))
+            elif record:
+                snap.upsert(record)
+
+    def invalidate(self, table: str = None) -> None:
+        """Drops the snapshot of `table` (all if None), and memoized tool results with it."""
+        with self._lock:
+            if table is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table, None)
+        memo.invalidate()
+
+
+_cache: Optional[SnapshotCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    """Process-wide cache, built on first use so .env has been loaded by then."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SnapshotCache()
+    return _cache
+
+
+async def get_candidates(label: str) -> List[Dict]:
+    """
+    Every `candidates` row from the shared snapshot (read-only), projected to
+    the columns `label` declares in the registry.
+    """
+    return project("candidates", label, await get_snapshot_cache().rows("candidates", label))
+
+
+async def get_candidates_versioned(label: str) -> Tuple[int, List[Dict]]:
+    """get_candidates() plus the snapshot version (see SnapshotCache.versioned_rows)."""
+    version, rows = await get_snapshot_cache().versioned_rows("candidates", label)
+    return version, project("candidates", label, rows)
@@ -0,0 +1,206 @@
+"""
+Typed candidate records with parse-once enrichment.
+
+Candidate holds the fields tools actually use, with rates parsed and the
+Stellar business flags (mobility, seniority, Site Safe) worked out once when
+the row is ingested. CandidateStore keeps one record per snapshot row and
+reuses it for as long as the row's (id, updated_at) is unchanged, so a roster
+tool touching 100k rows parses nothing on a warm call.
+
+A record can also be built from a narrow row (a direct query selecting one
+tool's columns); attributes whose columns are missing keep their empty value.
+In strict mode (stellar_core.projections) tools get StrictRecord views that
+raise on any attribute whose columns (SOURCES) the tool didn't declare.
+
+Mirrors the enrichment in 'data-context.js'.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from stellar_core.cache import get_snapshot_cache
+from stellar_core.geo import PlaceGroups
+from stellar_core.parsing import parse_currency
+from stellar_core.projections import StrictRow, UndeclaredColumnError, columns_for, project, strict_mode
+
+# Pay rate above which anyone counts as senior, whatever their title.
+SENIOR_PAY_RATE = 38
+
+# Columns each Candidate attribute is worked out from.
+SOURCES: Dict[str, Tuple[str, ...]] = {
+    "id": ("id",),
+    "updated_at": ("updated_at",),
+    "first_name": ("first_name",),
+    "last_name": ("last_name",),
+    "name": ("first_name", "last_name"),
+    "role": ("role",),
+    "status": ("status",),
+    "suburb": ("suburb",),
+    "region": ("suburb", "state"),
+    "pay_rate": ("pay_rate",),
+    "charge_rate": ("charge_out_rate",),
+    "guaranteed_hours": ("guaranteed_hours",),
+    "current_project": ("current_project",),
+    "is_mobile": ("residency",),
+    "is_senior": ("role", "pay_rate"),
+    "site_safe": ("compliance",),
+}
+_AS_DICT = ("id", "name", "role", "status", "region", "pay_rate", "charge_rate", "is_mobile", "is_senior", "site_safe")
+SOURCES["as_dict"] = tuple(dict.fromkeys(c for field in _AS_DICT for c in SOURCES[field]))
+
+
+class Candidate:
+    """One enriched candidate. Treat as read-only; it is shared between tool calls."""
+
+    __slots__ = (
+        "id", "updated_at", "first_name", "last_name", "role", "status", "suburb", "region",
+        "pay_rate", "charge_rate", "guaranteed_hours", "current_project",
+        "is_mobile", "is_senior", "site_safe", "_dict",
+    )
+
+    def __init__(self, row: Dict):
+        if isinstance(row, StrictRow):
+            row = dict(row)  # only the declared columns; the rest read as missing
+        residency = (row.get("residency") or "").lower()
+        role = row.get("role")
+        role_text = (role or "").lower()
+        compliance = row.get("compliance") or {}
+
+        self.id = row.get("id")
+        self.updated_at = row.get("updated_at")
+        self.first_name = row.get("first_name")
+        self.last_name = row.get("last_name")
+        self.role = role
+        self.status = row.get("status")
+        self.suburb = row.get("suburb")
+        self.region = self.suburb or row.get("state") or "Unknown"
+        self.pay_rate = parse_currency(row.get("pay_rate"))
+        self.charge_rate = parse_currency(row.get("charge_out_rate"))
+        self.guaranteed_hours = row.get("guaranteed_hours") or 0
+        self.current_project = row.get("current_project")
+        # LOGIC: Mobility (The 'Ute' Factor)
+        # Assumes Work Visa holders or specific crews are mobile/willing to travel
+        self.is_mobile = "work visa" in residency or "filipino" in residency or "mobile" in residency
+        # LOGIC: Seniority
+        self.is_senior = (
+            "lbp" in role_text or "foreman" in role_text or "manager" in role_text
+            or self.pay_rate > SENIOR_PAY_RATE
+        )
+        self.site_safe = compliance.get("siteSafeExpiry") is not None
+        self._dict = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    def as_dict(self) -> Dict:
+        """The enriched-candidate payload tools return (built once, shared: don't mutate)."""
+        if self._dict is None:
+            self._dict = {
+                "id": self.id,
+                "name": self.name,
+                "role": self.role,
+                "status": self.status,
+                "region": self.region,
+                "pay_rate": self.pay_rate,
+                "charge_rate": self.charge_rate,
+                "is_mobile": self.is_mobile,
+                "is_senior": self.is_senior,
+                "site_safe": self.site_safe,
+            }
+        return self._dict
+
+
+class StrictRecord:
+    """Strict-mode view of a Candidate for one tool: reading an undeclared attribute raises."""
+
+    __slots__ = ("_record", "_declared", "_where")
+
+    def __init__(self, label: str, declared: Tuple[str, ...], record: Candidate):
+        self._record = record
+        self._declared = declared
+        self._where = f"candidates.{label}"
+
+    def __getattr__(self, name: str):
+        for column in SOURCES.get(name, ()):
+            if column not in self._declared:
+                raise UndeclaredColumnError(f"{self._where} read undeclared column '{column}' (Candidate.{name})")
+        return getattr(self._record, name)
+
+
+def restrict(label: str, records: List[Candidate]) -> List[Candidate]:
+    """`records` as tool `label` may read them: untouched, or StrictRecord views in strict mode."""
+    declared = columns_for("candidates", label)
+    if not strict_mode():
+        return records
+    return [StrictRecord(label, declared, r) for r in records]
+
+
+def from_rows(rows: List[Dict], label: str) -> List[Candidate]:
+    """Unmemoized records for rows that don't come from the snapshot (e.g. a direct query by `label`)."""
+    return restrict(label, [Candidate(r) for r in project("candidates", label, rows)])
+
+
+class CandidateStore:
+    """Candidate records for the current snapshot version, memoized by (id, updated_at)."""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._records: Dict[Any, Candidate] = {}
+        self._list: List[Candidate] = []
+        self._places: Optional[Tuple[int, PlaceGroups]] = None
+        self.lock = threading.Lock()
+
+    def _cached(self, row: Dict) -> Optional[Candidate]:
+        old = self._records.get(row.get("id"))
+        if old is not None and old.updated_at is not None and old.updated_at == row.get("updated_at"):
+            return old
+        return None
+
+    def sync(self, version: int, rows: List[Dict]) -> List[Candidate]:
+        """Records for snapshot `version`, in row order; unchanged rows keep their record."""
+        with self.lock:
+            if version == self.version:
+                return self._list
+            records: Dict[Any, Candidate] = {}
+            out = []
+            for row in rows:
+                record = self._cached(row) or Candidate(project("candidates", "candidate_record", [row])[0])
+                records[record.id] = record
+                out.append(record)
+            self._records, self._list, self.version = records, out, version
+            return out
+
+    def places(self, version: int, records: List[Candidate]) -> PlaceGroups:
+        """`records` (snapshot `version`) grouped by gazetteer place of their region; built once per version."""
+        with self.lock:
+            if self._places is not None and self._places[0] == version:
+                return self._places[1]
+        groups = PlaceGroups(c.region for c in records)
+        with self.lock:
+            self._places = (version, groups)
+        return groups
+
+    def record(self, row: Dict, label: str = "candidate_record") -> Candidate:
+        """Record for one snapshot row (memoized when it is current), as tool `label` may read it."""
+        with self.lock:
+            cached = self._cached(row)
+        return restrict(label, [cached or Candidate(project("candidates", "candidate_record", [row])[0])])[0]
+
+
+_store: Optional[CandidateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_candidate_store() -> CandidateStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CandidateStore()
+    return _store
+
+
+async def get_candidate_records(label: str) -> Tuple[int, List[Candidate]]:
+    """(snapshot version, every candidate as a record), parsing only rows that changed."""
+    version, rows = await get_snapshot_cache().versioned_rows("candidates", label)
+    return version, restrict(label, get_candidate_store().sync(version, rows))
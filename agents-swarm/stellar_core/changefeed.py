@@ -0,0 +1,63 @@
+"""
+Row change feed.
+
+publish() hands one INSERT / UPDATE / DELETE to every in-process view that
+patches itself from deltas: the table snapshots (stellar_core.cache, and
+through their listeners the finance ledger) and the Golden Hour board.
+
+Sources:
+    - attach_realtime(): subscribes an async Supabase client to realtime
+      postgres_changes for FEED_TABLES and publishes each payload.
+    - anything else (tests, scripts, the bench) calls publish() directly as a
+      local stand-in for realtime.
+"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+FEED_TABLES = ("candidates", "clients")
+
+
+def publish(table: str, event: str, record: Dict = None, old_record: Dict = None) -> None:
+    """Applies one row change everywhere it matters. Views not loaded yet ignore it."""
+    from stellar_core import golden_hour
+    from stellar_core.cache import get_snapshot_cache
+
+    get_snapshot_cache().apply_change(table, event, record, old_record)
+    if table == "clients" and golden_hour._board is not None:
+        golden_hour._board.apply_change(event, record, old_record)
+
+
+def parse_payload(payload: Dict) -> Optional[Tuple[str, str, Optional[Dict], Optional[Dict]]]:
+    """
+    (table, event, record, old_record) from a realtime payload: the realtime-py
+    shape ({"data": {"table", "type", "record", "old_record"}}) or the
+    supabase-js one ({"table", "eventType", "new", "old"}). None if neither.
+    """
+    data: Any = payload.get("data", payload) if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return None
+    table = data.get("table")
+    event = data.get("type") or data.get("eventType")
+    record = data.get("record") if "record" in data else data.get("new")
+    old_record = data.get("old_record") if "old_record" in data else data.get("old")
+    if not table or not event:
+        return None
+    return table, str(event).upper(), record or None, old_record or None
+
+
+def _on_payload(payload: Dict) -> None:
+    parsed = parse_payload(payload)
+    if parsed is None:
+        return
+    try:
+        publish(*parsed)
+    except Exception as e:
+        print(f"WARNING: change feed could not apply {parsed[1]} on {parsed[0]}: {e}")
+
+
+async def attach_realtime(sb, tables: Sequence[str] = FEED_TABLES, schema: str = "public") -> Any:
+    """Subscribes `sb` (async Supabase client) to row changes on `tables`. Returns the channel."""
+    channel = sb.channel("stellar-change-feed")
+    for table in tables:
+        channel = channel.on_postgres_changes("*", schema=schema, table=table, callback=_on_payload)
+    await channel.subscribe()
+    return channel
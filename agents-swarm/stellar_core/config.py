@@ -0,0 +1,28 @@
+"""
+Process-wide environment loading.
+
+Every agent.py used to call load_dotenv() on import, so `adk web` re-read and
+re-parsed .env once per agent package. load_env() does it once per process;
+later calls are free. Like before, .env is searched for from agents-swarm/
+upwards and never overrides variables already set (start_adk.sh exports).
+"""
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env() -> bool:
+    """Loads .env into os.environ on the first call. Returns True if a file was read."""
+    global _loaded
+    if _loaded:
+        return False
+    with _lock:
+        if _loaded:
+            return False
+        from dotenv import find_dotenv, load_dotenv
+
+        path = find_dotenv(usecwd=False)
+        found = load_dotenv(path) if path else False
+        _loaded = True
+        return found
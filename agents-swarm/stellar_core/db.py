@@ -0,0 +1,232 @@
+"""
+Shared Supabase data-access layer for every agent in the swarm.
+
+Each event loop gets one AsyncClient on a keep-alive httpx connection pool
+(httpx async pools can't cross loops), so a tool call reuses an open TLS
+connection instead of paying for a new client, a new handshake and a new auth
+bootstrap every time.
+
+use_client() swaps in any object with the supabase query-builder API (local
+stand-ins, fakes); get_async_supabase() then returns it.
+STELLAR_BACKEND=offline does the same with the local snapshot client
+(stellar_core.offline), so every tool runs without network.
+
+aexecute() runs each query through stellar_core.resilience:
+identical reads in flight share one call, transient failures are retried with
+backoff, and a circuit breaker serves last-known-good data while the database
+is down (SUPABASE_RETRIES, SUPABASE_BREAKER_* and friends, documented there).
+
+Config (read once, when the first tool needs the database):
+    SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY   credentials
+    SUPABASE_POOL_SIZE        max open connections (default 10)
+    SUPABASE_KEEPALIVE        idle connections kept warm (default = pool size)
+    SUPABASE_TIMEOUT          request timeout in seconds (default 10)
+    SUPABASE_CONNECT_TIMEOUT  connect timeout in seconds (default 5)
+"""
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from supabase import AsyncClient, acreate_client
+from supabase.lib.client_options import AsyncClientOptions
+
+from stellar_core import telemetry
+
+_lock = threading.Lock()
+_override: Any = None
+_offline: Any = None  # SnapshotClient, or False when the backend is Supabase
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = weakref.WeakKeyDictionary()
+_async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def pool_settings() -> Dict[str, float]:
+    """Current pool/timeouts config, resolved from the environment."""
+    size = int(env_number("SUPABASE_POOL_SIZE", 10))
+    return {
+        "pool_size": size,
+        "keepalive": int(env_number("SUPABASE_KEEPALIVE", size)),
+        "timeout": env_number("SUPABASE_TIMEOUT", 10),
+        "connect_timeout": env_number("SUPABASE_CONNECT_TIMEOUT", 5),
+    }
+
+
+def _credentials():
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        print("CRITICAL: Supabase credentials missing.")
+        return None
+    return url, key
+
+
+def _http_config():
+    cfg = pool_settings()
+    timeout = httpx.Timeout(cfg["timeout"], connect=cfg["connect_timeout"])
+    limits = httpx.Limits(max_connections=cfg["pool_size"], max_keepalive_connections=cfg["keepalive"])
+    return timeout, limits
+
+
+def use_client(client: Any) -> None:
+    """Routes every tool to `client` (sync or async query-builder API). None restores Supabase."""
+    global _override
+    _override = client
+
+
+def _offline_client() -> Any:
+    """
+    False unless STELLAR_BACKEND=offline (checked once); then the snapshot
+    client, or None while the snapshot file can't be opened.
+    """
+    global _offline
+    if _offline is None:
+        with _lock:
+            if _offline is None:
+                from stellar_core import offline
+
+                if not offline.enabled():
+                    _offline = False
+                else:
+                    try:
+                        _offline = offline.SnapshotClient(offline.snapshot_path())
+                    except offline.OfflineError as e:
+                        print(f"WARNING: {e}")
+                        return None
+    return _offline
+
+
+async def get_async_supabase() -> Optional[AsyncClient]:
+    """
+    Returns the shared AsyncClient for the running event loop (created on first use).
+    Returns None when credentials are missing, matching the old per-module helpers.
+    """
+    if _override is not None:
+        return _override
+    offline = _offline_client()
+    if offline is not False:
+        return offline
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is not None:
+            return client
+        loop_lock = _async_locks.setdefault(loop, asyncio.Lock())
+
+    async with loop_lock:
+        with _lock:
+            client = _async_clients.get(loop)
+        if client is not None:
+            return client
+
+        creds = _credentials()
+        if not creds:
+            return None
+
+        timeout, limits = _http_config()
+        client = await acreate_client(*creds, options=AsyncClientOptions(
+            httpx_client=_CountingAsyncClient(timeout=timeout, limits=limits),
+            postgrest_client_timeout=timeout,
+        ))
+        client.postgrest
+        with _lock:
+            _async_clients[loop] = client
+        return client
+
+
+def reset_supabase() -> None:
+    """Forgets the async clients; the next call reconnects with fresh config."""
+    global _offline
+    with _lock:
+        _offline = None
+        _async_clients.clear()
+
+
+# --- PER-CALL METRICS ---
+
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, Dict[str, float]] = {}
+
+
+class _CountingAsyncClient(httpx.AsyncClient):
+    """httpx client that reports decoded response bytes to the current tool call."""
+
+    async def send(self, request, **kwargs):
+        response = await super().send(request, **kwargs)
+        if not kwargs.get("stream"):
+            telemetry.on_response_bytes(len(response.content))
+        return response
+
+
+def record_query(label: str, seconds: float, rows: int = 0, error: bool = False, source: str = "network") -> None:
+    """`source`: "network", "shared" (joined an identical query in flight) or "stale" (last-known-good)."""
+    if source == "network":
+        telemetry.on_query(rows)
+    elif source == "stale":
+        telemetry.on_stale()
+    with _metrics_lock:
+        m = _metrics.setdefault(label, {
+            "calls": 0, "errors": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0, "shared": 0, "stale": 0
+        })
+        ms = seconds * 1000
+        m["calls"] += 1
+        m["rows"] += rows
+        m["total_ms"] += ms
+        m["max_ms"] = max(m["max_ms"], ms)
+        if error:
+            m["errors"] += 1
+        if source in ("shared", "stale"):
+            m[source] += 1
+
+
+def _send(query: Any) -> Any:
+    return query.execute()
+
+
+async def aexecute(query: Any, label: str, stale_ok: bool = True) -> Any:
+    """
+    Runs a PostgREST query builder and records latency/row count under `label`
+    (normally the tool name). Exceptions are recorded and re-raised. Also
+    accepts sync query builders (local stand-ins).
+    `stale_ok=False` refuses last-known-good data during an outage (raises
+    BackendUnavailable instead), for callers that keep their own copy.
+    """
+    from stellar_core.resilience import get_resilience
+
+    start = time.perf_counter()
+    try:
+        res, source = await get_resilience().arun(query, _send, stale_ok)
+    except Exception:
+        record_query(label, time.perf_counter() - start, error=True)
+        raise
+    data = res.data
+    record_query(label, time.perf_counter() - start, len(data) if isinstance(data, list) else 1, source=source)
+    return res
+
+
+def get_query_metrics() -> Dict[str, Dict[str, float]]:
+    """Snapshot of per-label query stats, with average latency filled in."""
+    with _metrics_lock:
+        out = {}
+        for label, m in _metrics.items():
+            row = dict(m)
+            row["avg_ms"] = round(m["total_ms"] / m["calls"], 2) if m["calls"] else 0.0
+            row["total_ms"] = round(m["total_ms"], 2)
+            row["max_ms"] = round(m["max_ms"], 2)
+            out[label] = row
+        return out
+
+
+def reset_query_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
@@ -0,0 +1,299 @@
+"""
+Bulk squad-to-demand matching for the Sales Lead.
+
+find_demand_for_squad used to run one `ilike` client search per squad (capped
+at 5 rows), so matching a page of generate_squads output cost one query and
+one LLM turn per squad. DemandBook loads `clients` and open `market_tenders`
+once, indexes clients by region and industry, and matches any number of
+squads in memory.
+
+Region: when the squad's region is in the gazetteer (stellar_core.geo), a
+client is in reach if its region is inside the squad's, contains it (an
+"Auckland" client covers a Manukau squad), or lies within radius_km (default
+DEMAND_RADIUS_KM) of it; "South Auckland" therefore finds Manukau and
+Papatoetoe clients. Otherwise either region text must contain the other,
+case-insensitively. Industry: with a project type (CIVIL / STRUCTURE / INTERIOR),
+clients in industries that don't take that work keep INDUSTRY_MISMATCH of
+their score.
+
+Ranking: each client scores WEIGHTS["tier"] x tier weight + WEIGHTS["decay"] x
+silence (days since last_contact, capped at DECAY_CAP_DAYS; never contacted
+counts as fully decayed) + WEIGHTS["tenders"] x open tenders naming it.
+Distance then discounts the score linearly, by up to DISTANCE_DISCOUNT at
+DEMAND_RADIUS_KM and beyond, so a local client outranks an equal one across
+town.
+Squads pick in revenue order, highest first: each takes its best remaining
+clients, so a contested client goes to the squad that earns most. Every
+assignment also gets a `priority` (client score scaled by the squad's revenue
+share) for ordering one combined call sheet.
+
+Freshness: reloaded after SNAPSHOT_TTL seconds (or on a new day). The
+per-region ranked lists are cached per load.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from stellar_core import telemetry
+from stellar_core.db import env_number
+from stellar_core.envelope import SUMMARY_TOP
+from stellar_core.geo import PlaceGroups, band, resolve
+from stellar_core.golden_hour import CLOSED_TENDER_STATUSES, TenderSignal, tender_signals
+from stellar_core.parsing import iso_days, today_ordinal
+from stellar_core.projections import project, select_clause
+from stellar_core.resilience import unreachable
+from stellar_core.scan import scan_pages
+from stellar_core.trade_matrix import compact
+
+LABEL = "demand_book"
+
+WEIGHTS = {"tier": 0.5, "decay": 0.3, "tenders": 0.2}
+TIER_WEIGHTS = {"1": 1.0, "2": 0.6, "3": 0.3}
+OTHER_TIER_WEIGHT = 0.2
+DECAY_CAP_DAYS = 60
+TENDER_CAP = 3
+INDUSTRY_MISMATCH = 0.5
+DEMAND_RADIUS_KM = 30
+DISTANCE_DISCOUNT = 0.5
+
+# Client industries (compacted) that take each project type's work.
+PROJECT_INDUSTRIES = {
+    "CIVIL": ("civil", "infrastructure", "construction"),
+    "STRUCTURE": ("commercial", "residential", "construction"),
+    "INTERIOR": ("fitout", "commercial", "residential"),
+}
+
+
+def squad_key(squad: Dict) -> Dict:
+    """The parts of a generate_squads item that matching uses."""
+    financials = squad.get("financials") or {}
+    return {
+        "squad_id": squad.get("squad_id"),
+        "region": (squad.get("logistics") or {}).get("region") or squad.get("region") or "",
+        "revenue": float(financials.get("est_weekly_revenue") or squad.get("est_weekly_revenue") or 0),
+    }
+
+
+def squads_digest(keys: List[Dict]) -> str:
+    """Short fingerprint of a squad list, so a cursor can check it is paging the same squads."""
+    raw = json.dumps(keys, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+class DemandClient:
+    """One client row plus its precomputed score inputs."""
+
+    __slots__ = ("row", "region", "industry", "tier", "day", "signal")
+
+    def __init__(self, row: Dict, day: Optional[int], signal: Optional[TenderSignal]):
+        self.row = row
+        self.region = (row.get("region") or "").strip().lower()
+        self.industry = compact(row.get("industry"))
+        self.tier = str(row.get("tier") or "")
+        self.day = day
+        self.signal = signal
+
+    def score(self, today: int, industries: Optional[Tuple[str, ...]], km: Optional[float] = None) -> float:
+        days = DECAY_CAP_DAYS if self.day is None else min(max(today - self.day, 0), DECAY_CAP_DAYS)
+        tenders = min(self.signal.count, TENDER_CAP) / TENDER_CAP if self.signal else 0.0
+        score = (WEIGHTS["tier"] * TIER_WEIGHTS.get(self.tier, OTHER_TIER_WEIGHT)
+                 + WEIGHTS["decay"] * days / DECAY_CAP_DAYS
+                 + WEIGHTS["tenders"] * tenders)
+        if industries is not None and self.industry not in industries:
+            score *= INDUSTRY_MISMATCH
+        if km:
+            score *= 1 - DISTANCE_DISCOUNT * min(km / DEMAND_RADIUS_KM, 1.0)
+        return round(score, 4)
+
+
+class DemandBook:
+    """All clients indexed by region, with open-tender signals; see module docstring."""
+
+    def __init__(self, ttl: float = None):
+        self.ttl = ttl if ttl is not None else env_number("SNAPSHOT_TTL", 300)
+        self._clients: List[DemandClient] = []
+        self._by_region: Dict[str, List[int]] = {}
+        self._places = PlaceGroups(())
+        self._ranked: Dict[Tuple[str, str, float], List[Tuple[float, int, Optional[float]]]] = {}
+        self.loaded_at = 0.0
+        self.loaded_day: Optional[int] = None
+        self.version = 0
+        self.lock = threading.Lock()
+        self._refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def _refresh_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            return self._refresh_locks.setdefault(loop, asyncio.Lock())
+
+    async def refresh(self, label: str) -> None:
+        async with self._refresh_lock():
+            if not self.loaded_at or time.monotonic() - self.loaded_at >= self.ttl or self.loaded_day != today_ordinal():
+                try:
+                    await self._load(label)
+                except Exception as e:
+                    if not self.loaded_at or not unreachable(e):
+                        raise
+                    telemetry.on_stale()  # database down: keep serving the last load
+
+    async def _load(self, label: str) -> None:
+        rows: List[Dict] = []
+        async for page in scan_pages("clients", select_clause("clients", LABEL), label, stale_ok=False):
+            rows.extend(project("clients", LABEL, page))
+        tenders: List[Dict] = []
+        pages = scan_pages("market_tenders", select_clause("market_tenders", LABEL), label,
+                           where=lambda q: q.not_.in_("status", list(CLOSED_TENDER_STATUSES)), stale_ok=False)
+        async for page in pages:
+            tenders.extend(project("market_tenders", LABEL, page))
+
+        today = today_ordinal()
+        signals = tender_signals(tenders, today)
+        clients = [
+            DemandClient(row, day, signals.get((row.get("name") or "").strip().lower()))
+            for row, day in zip(rows, iso_days(r.get("last_contact") for r in rows))
+        ]
+        by_region: Dict[str, List[int]] = {}
+        for i, c in enumerate(clients):
+            if c.region:
+                by_region.setdefault(c.region, []).append(i)
+        places = PlaceGroups(c.row.get("region") for c in clients)
+
+        with self.lock:
+            self._clients, self._by_region, self._places, self._ranked = clients, by_region, places, {}
+            self.version += 1
+            self.loaded_at = time.monotonic()
+            self.loaded_day = today
+
+    # --- read ---
+
+    def _ranked_for(self, region: str, project_type: str, radius_km: float,
+                    today: int) -> List[Tuple[float, int, Optional[float]]]:
+        """(score, position, km) of clients in reach of `region`, best first. Call with self.lock held."""
+        key = (region, project_type, radius_km)
+        ranked = self._ranked.get(key)
+        if ranked is None:
+            industries = PROJECT_INDUSTRIES.get(project_type)
+            centre = resolve(region)
+            if centre is not None:
+                hits = self._places.match(centre, radius_km, enclosing=True)
+            else:
+                hits = [
+                    (i, None) for client_region, members in self._by_region.items()
+                    if region in client_region or client_region in region
+                    for i in members
+                ]
+            ranked = sorted(((self._clients[i].score(today, industries, km), i, km) for i, km in hits),
+                            key=lambda p: (-p[0], float("inf") if p[2] is None else p[2], p[1]))
+            self._ranked[key] = ranked
+        return ranked
+
+    def _entry(self, client: DemandClient, score: float, priority: float, km: Optional[float], today: int) -> Dict:
+        row = client.row
+        entry = {
+            "id": row.get("id"),
+            "name": row.get("name"),
+            "tier": row.get("tier"),
+            "industry": row.get("industry"),
+            "region": row.get("region"),
+            "phone": row.get("phone"),
+            "distance_km": km,
+            "band": band(km),
+            "days_silent": None if client.day is None else today - client.day,
+            "score": score,
+            "priority": priority,
+        }
+        if client.signal is not None:
+            entry.update(client.signal.as_dict(today))
+        return entry
+
+    def nearby(self, region: str, radius_km: float = 0, industry: str = "",
+               limit: int = 5) -> Optional[List[Tuple[Dict, Optional[float]]]]:
+        """
+        Up to `limit` (client row, km) in reach of `region`, nearest first,
+        optionally only industries containing `industry`. None when `region`
+        isn't in the gazetteer.
+        """
+        centre = resolve(region)
+        if centre is None:
+            return None
+        needle = (industry or "").lower()
+        out: List[Tuple[Dict, Optional[float]]] = []
+        with self.lock:
+            clients, places = self._clients, self._places
+        for i, km in places.iter_match(centre, radius_km, enclosing=True):
+            row = clients[i].row
+            if needle in (row.get("industry") or "").lower():
+                out.append((row, km))
+                if len(out) >= limit:
+                    break
+        return out
+
+    def match(self, squads: List[Dict], project_type: str = "", per_squad: int = 3,
+              exclusive: bool = True, radius_km: float = DEMAND_RADIUS_KM) -> Tuple[Dict, List[Dict]]:
+        """
+        (summary, assignments) for `squads` (squad_key() dicts). Assignments are
+        in revenue order; with `exclusive`, each client goes to one squad at most.
+        """
+        project_type = (project_type or "").upper()
+        per_squad = max(1, int(per_squad))
+        today = today_ordinal()
+        order = sorted(range(len(squads)), key=lambda i: -squads[i]["revenue"])
+        top_revenue = max((s["revenue"] for s in squads), default=0) or 1.0
+        taken = set()
+        assignments: List[Dict] = []
+        by_region: Dict[str, Dict[str, int]] = {}
+
+        with self.lock:
+            for i in order:
+                squad = squads[i]
+                region = (squad["region"] or "").strip().lower()
+                share = squad["revenue"] / top_revenue
+                picked = []
+                for score, pos, km in (self._ranked_for(region, project_type, radius_km, today) if region else ()):
+                    if exclusive and pos in taken:
+                        continue
+                    priority = round(score * (0.5 + 0.5 * share), 4)
+                    picked.append(self._entry(self._clients[pos], score, priority, km, today))
+                    taken.add(pos)
+                    if len(picked) >= per_squad:
+                        break
+                assignments.append({
+                    "squad_id": squad["squad_id"],
+                    "region": squad["region"],
+                    "est_weekly_revenue": squad["revenue"],
+                    "clients": picked,
+                })
+                r = by_region.setdefault(squad["region"] or "Unknown", {"squads": 0, "clients": 0})
+                r["squads"] += 1
+                r["clients"] += len(picked)
+            client_count = len(self._clients)
+
+        unmatched = [a["squad_id"] for a in assignments if not a["clients"]]
+        summary = {
+            "squads": len(assignments),
+            "matched": len(assignments) - len(unmatched),
+            "unmatched": unmatched[:SUMMARY_TOP],
+            "clients_assigned": sum(len(a["clients"]) for a in assignments),
+            "clients_considered": client_count,
+            "matched_weekly_revenue": sum(a["est_weekly_revenue"] for a in assignments if a["clients"]),
+            "by_region": dict(sorted(by_region.items(), key=lambda kv: -kv[1]["squads"])[:SUMMARY_TOP]),
+        }
+        return summary, assignments
+
+
+_book: Optional[DemandBook] = None
+_book_lock = threading.Lock()
+
+
+def get_demand_book() -> DemandBook:
+    """Process-wide book, built on first use so .env has been loaded by then."""
+    global _book
+    if _book is None:
+        with _book_lock:
+            if _book is None:
+                _book = DemandBook()
+    return _book
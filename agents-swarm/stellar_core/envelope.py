@@ -0,0 +1,126 @@
+"""
+Result envelope for roster-sized tool outputs.
+
+Tools whose raw output grows with the roster (bench, liability, squads) return
+
+    {"summary": {...},                      # complete aggregates, bounded size
+     "items": [...],                        # one page, best first
+     "page": {"offset", "returned", "total", "next_cursor"}}
+
+next_cursor is an opaque token: passing it back as the tool's `cursor`
+argument returns the next page. It carries the tool's original arguments, so
+nothing else needs repeating. Every envelope also respects a hard JSON byte
+budget. Items are trimmed to fit, and the cursor resumes after the last item
+returned.
+
+Config:
+    TOOL_RESULT_PAGE_SIZE   items per page (default 10)
+    TOOL_RESULT_MAX_BYTES   byte budget per tool result (default 12000)
+"""
+import base64
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from stellar_core.db import env_number
+
+SUMMARY_TOP = 10
+
+
+class CursorError(ValueError):
+    """Cursor is malformed or was issued by a different tool."""
+
+
+def page_size() -> int:
+    return max(1, int(env_number("TOOL_RESULT_PAGE_SIZE", 10)))
+
+
+def byte_budget() -> int:
+    return int(env_number("TOOL_RESULT_MAX_BYTES", 12000))
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str).encode())
+
+
+def encode_cursor(tool: str, params: Dict, offset: int, version: Optional[int]) -> str:
+    raw = json.dumps({"t": tool, "a": params, "o": offset, "v": version}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(tool: str, cursor: str) -> Tuple[Dict, int, Optional[int]]:
+    """(arguments, offset, data version) from a cursor issued by `tool`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+        if state["t"] != tool:
+            raise CursorError(f"Cursor was issued by '{state['t']}', not '{tool}'.")
+        return dict(state["a"]), int(state["o"]), state.get("v")
+    except CursorError:
+        raise
+    except Exception:
+        raise CursorError("Invalid cursor; call the tool again without one to start over.") from None
+
+
+def resume(tool: str, cursor: str, params: Dict) -> Tuple[Dict, int, Optional[int]]:
+    """Arguments/offset/version to serve: from `cursor` when given, else `params` from the top."""
+    if cursor:
+        return decode_cursor(tool, cursor)
+    return params, 0, None
+
+
+def top_counts(values: Iterable[Any], n: int = SUMMARY_TOP) -> Dict[str, int]:
+    """Most common values with their counts (bounded, for summaries)."""
+    return {str(k): v for k, v in Counter(values).most_common(n)}
+
+
+def paginate(
+    tool: str,
+    items: List[Any],
+    summary: Dict,
+    params: Dict,
+    offset: int = 0,
+    version: Optional[int] = None,
+    cursor_version: Optional[int] = None,
+    size: Optional[int] = None,
+    budget: Optional[int] = None,
+) -> Dict:
+    """
+    Envelope for `items` (already in final order) starting at `offset`.
+    `version` identifies the data the items came from. A cursor issued against
+    a different `cursor_version` still pages, but the page is flagged `stale`.
+    """
+    size = size or page_size()
+    budget = budget or byte_budget()
+    total = len(items)
+    page = items[offset:offset + size]
+
+    def build(n: int) -> Dict:
+        # An item too big for the budget on its own is skipped rather than
+        # letting the cursor stall on it.
+        end = offset + (n or min(1, len(page)))
+        info = {
+            "offset": offset,
+            "returned": n,
+            "total": total,
+            "next_cursor": encode_cursor(tool, params, end, version) if end < total else None,
+        }
+        if page and not n:
+            info["skipped_oversized"] = 1
+        if cursor_version is not None and version is not None and cursor_version != version:
+            info["stale"] = True
+        return {"summary": summary, "items": page[:n], "page": info}
+
+    # Grow the page item by item within the budget (2 bytes per ", " separator).
+    used = _size(build(0)) + 100  # room for the cursor
+    n = 0
+    for item in page:
+        used += _size(item) + 2
+        if used > budget:
+            break
+        n += 1
+    result = build(n)
+    while n and _size(result) > budget:
+        n -= 1
+        result = build(n)
+    return result
@@ -0,0 +1,219 @@
+"""
+Expiry calendar for compliance documents (work visas, Site Safe tickets).
+
+Each document kind keeps a sorted list of (expiry day, candidate id). "Expiring
+within N days", "already expired" and bucket counts are bisects on that list,
+not a rescan of the roster.
+
+Loading: only rows whose expiry falls on or before the horizon (today +
+EXPIRY_HORIZON_DAYS, or further if a caller asks for more) are fetched; the
+window is applied in the query, so far-future and missing expiries never leave
+Postgres.
+
+Freshness:
+    - Polling: every SNAPSHOT_POLL seconds, rows changed since the last seen
+      `updated_at` are fetched and re-indexed (added, moved or dropped). The
+      starting point is the newest `updated_at` in the whole table (read with
+      the load), not just in the window, so a row entering the window is
+      picked up even when nothing was in it before.
+    - Reload: after SNAPSHOT_TTL seconds, on a new (UTC) day, or when a caller
+      needs a longer horizon than the one loaded. This is also how deletes are
+      noticed.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from stellar_core import telemetry
+from stellar_core.db import aexecute, env_number, get_async_supabase
+from stellar_core.parsing import iso_day, today_ordinal
+from stellar_core.projections import project, select_clause
+from stellar_core.resilience import unreachable
+from stellar_core.scan import scan_pages, scan_table
+
+# Document kind -> PostgREST column holding its expiry.
+EXPIRY_COLUMNS = {
+    "visa": "visa_expiry",
+    "site_safe": "compliance->>siteSafeExpiry",
+}
+
+# Inclusive day ranges reported as bucket counts (days left).
+BUCKETS = ((0, 14), (15, 30), (31, 90))
+
+
+def row_expiry(kind: str, row: Dict) -> Optional[int]:
+    if kind == "site_safe":
+        return iso_day((row.get("compliance") or {}).get("siteSafeExpiry"))
+    return iso_day(row.get("visa_expiry"))
+
+
+class ExpiryIndex:
+    """Sorted (day, id) keys plus id -> (day, name), updated in place."""
+
+    def __init__(self):
+        self._keys: List[Tuple[int, Any]] = []
+        self._entries: Dict[Any, Tuple[int, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def put(self, row_id: Any, day: int, name: str) -> None:
+        self.remove(row_id)
+        insort(self._keys, (day, row_id))
+        self._entries[row_id] = (day, name)
+
+    def remove(self, row_id: Any) -> None:
+        old = self._entries.pop(row_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (old[0], row_id))]
+
+    def _bounds(self, first: Optional[int], last: Optional[int]) -> Tuple[int, int]:
+        lo = 0 if first is None else bisect_left(self._keys, (first,))
+        hi = len(self._keys) if last is None else bisect_left(self._keys, (last + 1,))
+        return lo, max(lo, hi)
+
+    def count(self, first: Optional[int] = None, last: Optional[int] = None) -> int:
+        """Documents expiring on days first..last (inclusive; None = unbounded)."""
+        lo, hi = self._bounds(first, last)
+        return hi - lo
+
+    def between(self, first: Optional[int] = None, last: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(day, name) for documents expiring on days first..last, soonest first."""
+        lo, hi = self._bounds(first, last)
+        return [self._entries[row_id] for _, row_id in self._keys[lo:hi]]
+
+
+class ExpiryCalendar:
+    """One ExpiryIndex per document kind, kept in step with `candidates`."""
+
+    def __init__(self, ttl: float = None, poll_interval: float = None, horizon_days: int = None):
+        self.ttl = ttl if ttl is not None else env_number("SNAPSHOT_TTL", 300)
+        self.poll_interval = poll_interval if poll_interval is not None else env_number("SNAPSHOT_POLL", 15)
+        self.horizon_days = int(horizon_days if horizon_days is not None else env_number("EXPIRY_HORIZON_DAYS", 90))
+        self.indexes: Dict[str, ExpiryIndex] = {kind: ExpiryIndex() for kind in EXPIRY_COLUMNS}
+        self.loaded_at = 0.0
+        self.polled_at = 0.0
+        self.loaded_day = 0
+        self.horizon = 0
+        self.high_water: Optional[str] = None
+        self.version = 0
+        self.lock = threading.Lock()
+        self._refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def _refresh_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            return self._refresh_locks.setdefault(loop, asyncio.Lock())
+
+    def _track(self, row: Dict) -> None:
+        stamp = row.get("updated_at")
+        if stamp and (self.high_water is None or stamp > self.high_water):
+            self.high_water = stamp
+
+    def _index_row(self, indexes: Dict[str, ExpiryIndex], kind: str, row: Dict, horizon: int) -> None:
+        day = row_expiry(kind, row)
+        if day is None or day > horizon:
+            indexes[kind].remove(row.get("id"))
+        else:
+            indexes[kind].put(row.get("id"), day, f"{row.get('first_name')} {row.get('last_name')}")
+
+    async def refresh(self, label: str, within_days: int = 0) -> None:
+        """Brings the indexes up to date for a query `within_days` ahead."""
+        async with self._refresh_lock():
+            today = today_ordinal()
+            now = time.monotonic()
+            try:
+                if (not self.loaded_at or now - self.loaded_at >= self.ttl or today != self.loaded_day
+                        or today + within_days > self.horizon):
+                    await self._load(label, today, max(self.horizon_days, within_days))
+                elif now - self.polled_at >= self.poll_interval:
+                    await self._poll(label)
+            except Exception as e:
+                if not self.loaded_at or not unreachable(e):
+                    raise
+                telemetry.on_stale()  # database down: keep serving the last load
+
+    async def _latest_change(self, label: str) -> Optional[str]:
+        """Newest `updated_at` anywhere in `candidates`, in or out of the window."""
+        sb = await get_async_supabase()
+        if not sb:
+            raise RuntimeError("DB Connection Failed")
+        query = sb.table("candidates").select("updated_at").not_.is_("updated_at", "null")
+        res = await aexecute(query.order("updated_at", desc=True).limit(1), label, stale_ok=False)
+        return res.data[0]["updated_at"] if res.data else None
+
+    async def _load(self, label: str, today: int, horizon_days: int) -> None:
+        horizon = today + horizon_days
+        # Strictly before the day after the horizon: works for timestamps and 'YYYY-MM-DD' text.
+        cutoff = date.fromordinal(horizon + 1).isoformat()
+        # Taken first: a row changed while the window loads is polled again, never missed.
+        high_water = await self._latest_change(label)
+        indexes = {kind: ExpiryIndex() for kind in EXPIRY_COLUMNS}
+        for kind, column in EXPIRY_COLUMNS.items():
+            pages = scan_pages("candidates", select_clause("candidates", label), label,
+                               where=lambda q, column=column: q.lt(column, cutoff), stale_ok=False)
+            async for page in pages:
+                for row in project("candidates", label, page):
+                    self._index_row(indexes, kind, row, horizon)
+
+        with self.lock:
+            self.indexes = indexes
+            self.high_water = high_water
+            self.horizon = horizon
+            self.loaded_day = today
+            self.loaded_at = self.polled_at = time.monotonic()
+            self.version += 1
+
+    async def _poll(self, label: str) -> None:
+        self.polled_at = time.monotonic()
+        if self.high_water is None:
+            return
+        # No window here: a changed row may have moved out of it and must be dropped.
+        changed = [row async for row in scan_table("candidates", select_clause("candidates", label), label,
+                                                  since=self.high_water, stale_ok=False)]
+        if not changed:
+            return
+        with self.lock:
+            for row in project("candidates", label, changed):
+                for kind in EXPIRY_COLUMNS:
+                    self._index_row(self.indexes, kind, row, self.horizon)
+                self._track(row)
+            self.version += 1
+
+    def report(self, kind: str, within_days: int) -> Dict:
+        """
+        For one kind: `risks` (already expired, then expiring within
+        `within_days`; most overdue first, days_left < 0 = expired), their
+        counts, and bucket counts.
+        """
+        today = today_ordinal()
+        with self.lock:
+            index = self.indexes[kind]
+            risks = index.between(None, today + within_days)
+            expired = index.count(None, today - 1)
+            buckets = {f"{lo}-{hi}": index.count(today + lo, today + hi) for lo, hi in BUCKETS}
+        buckets["expired"] = expired
+        return {
+            "risks": [{"name": name, "days_left": day - today} for day, name in risks],
+            "expired_count": expired,
+            "expiring_count": len(risks) - expired,
+            "buckets": buckets,
+        }
+
+
+_calendar: Optional[ExpiryCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_expiry_calendar() -> ExpiryCalendar:
+    """Process-wide calendar, built on first use so .env has been loaded by then."""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = ExpiryCalendar()
+    return _calendar
@@ -0,0 +1,200 @@
+"""
+Vectorized placement-book engine for the Accountant.
+
+Pay/charge rates are parsed once into NumPy arrays; margins, Busy Fool masks and
+totals are then computed in bulk. sweep() evaluates a grid of what-if scenarios
+(burden multiplier x hours x rate changes) against the whole book in one go.
+
+Totals are exact sums (math.fsum: correctly rounded, independent of row
+order), so the incremental stellar_core.ledger can match them bit for bit.
+"""
+import itertools
+import math
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from stellar_core.candidate import Candidate
+
+MAX_SCENARIOS = 1000
+# Upper bound on scenario x placement cells evaluated per NumPy pass.
+_CHUNK_CELLS = 2_000_000
+
+
+def deal_order(deal: Dict):
+    """Busy Fool listing order: lowest net GP first, then by name."""
+    return deal["net_gp"], deal["name"] or "", deal["client"] or ""
+
+
+def bench_liability(candidates: Sequence[Candidate]) -> Dict:
+    """
+    Cash burn of available candidates with guaranteed hours: raw pay, no
+    burden. Biggest burners first.
+    """
+    liable = [c for c in candidates if c.status == "available" and c.guaranteed_hours > 0]
+    burn_list = sorted((
+        {"name": c.name, "weekly_burn": c.guaranteed_hours * c.pay_rate, "guaranteed_hours": c.guaranteed_hours}
+        for c in liable
+    ), key=liability_order)
+    total_burn = math.fsum(b["weekly_burn"] for b in burn_list)
+    return {
+        "status": "Clean" if total_burn == 0 else "Burning Cash",
+        "total_weekly_burn": total_burn,
+        "liability_list": burn_list,
+    }
+
+
+def liability_order(entry: Dict):
+    return -(entry.get("weekly_burn") or 0), entry.get("name") or ""
+
+
+class PlacementBook:
+    """Columnar view of revenue-generating placements."""
+
+    def __init__(self, names: List[str], clients: List[str], pay: np.ndarray, charge: np.ndarray):
+        self.names = names
+        self.clients = clients
+        self.pay = pay
+        self.charge = charge
+        self._rate_groups = None
+
+    @classmethod
+    def from_candidates(cls, candidates: Sequence[Candidate]) -> "PlacementBook":
+        # Rates were parsed once when the Candidate records were built.
+        return cls(
+            names=[c.name for c in candidates],
+            clients=[c.current_project or "Unknown" for c in candidates],
+            pay=np.fromiter((c.pay_rate for c in candidates), dtype=np.float64, count=len(candidates)),
+            charge=np.fromiter((c.charge_rate for c in candidates), dtype=np.float64, count=len(candidates)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rate_groups(self):
+        """
+        Distinct (pay, charge) pairs and how many placements share each. Rates
+        cluster heavily, so sweeps work on these groups rather than every row.
+        """
+        if self._rate_groups is None:
+            if len(self):
+                pairs, counts = np.unique(np.column_stack([self.pay, self.charge]), axis=0, return_counts=True)
+                self._rate_groups = (pairs[:, 0].copy(), pairs[:, 1].copy(), counts.astype(np.float64))
+            else:
+                empty = np.zeros(0)
+                self._rate_groups = (empty, empty, empty)
+        return self._rate_groups
+
+    def evaluate(self, rules: Dict[str, float]) -> Dict:
+        """Totals and Busy Fool deals (worst net GP first) under one set of rules."""
+        hours = rules["weekly_hours"]
+        revenue = self.charge * hours
+        cost = self.pay * rules["burden"] * hours
+        net_gp = revenue - cost
+        margin_pct = np.divide(net_gp * 100, revenue, out=np.zeros_like(net_gp), where=revenue > 0)
+        busy = (net_gp < rules["min_gp"]) | (margin_pct < rules["min_margin_pct"])
+
+        total_revenue = math.fsum(revenue)
+        total_payroll = math.fsum(cost)
+        gross = total_revenue - total_payroll
+        total_pct = (gross / total_revenue * 100) if total_revenue > 0 else 0
+
+        return {
+            "weekly_revenue": total_revenue,
+            "weekly_payroll": total_payroll,
+            "weekly_gross_profit": gross,
+            "margin_percent": total_pct,
+            "busy_fool_deals": sorted((
+                {
+                    "name": self.names[i],
+                    "net_gp": round(float(net_gp[i]), 2),
+                    "margin_pct": round(float(margin_pct[i]), 1),
+                    "client": self.clients[i],
+                }
+                for i in np.flatnonzero(busy)
+            ), key=deal_order),
+        }
+
+    def sweep(self, scenarios: Sequence[Dict[str, float]], rules: Dict[str, float]) -> List[Dict]:
+        """
+        Evaluates every scenario against the whole book. A scenario may override
+        `burden` and `weekly_hours` and apply `charge_rate_change_pct` /
+        `pay_rate_change_pct` uplifts; anything missing comes from `rules`.
+        """
+        if not scenarios:
+            return []
+        burden = np.array([s.get("burden", rules["burden"]) for s in scenarios], dtype=np.float64)[:, None]
+        hours = np.array([s.get("weekly_hours", rules["weekly_hours"]) for s in scenarios], dtype=np.float64)[:, None]
+        charge_f = 1 + np.array([s.get("charge_rate_change_pct", 0) for s in scenarios], dtype=np.float64)[:, None] / 100
+        pay_f = 1 + np.array([s.get("pay_rate_change_pct", 0) for s in scenarios], dtype=np.float64)[:, None] / 100
+
+        pay, charge, counts = self.rate_groups()
+        n = len(scenarios)
+        revenue_t = np.empty(n)
+        payroll_t = np.empty(n)
+        busy_count = np.empty(n, dtype=np.int64)
+
+        step = max(1, _CHUNK_CELLS // max(1, len(counts)))
+        for lo in range(0, n, step):
+            sl = slice(lo, lo + step)
+            # Hourly charge (u) and burdened pay (v) per rate group. A placement is
+            # a Busy Fool when  h(u - v) < min_gp  or  (u - v) / u < min_margin,
+            # i.e. when  v > min(u - min_gp / h, u * (1 - min_margin)).
+            u = charge_f[sl] * charge
+            v = (burden[sl] * pay_f[sl]) * pay
+            limit = np.minimum(u - rules["min_gp"] / hours[sl], u * (1 - rules["min_margin_pct"] / 100))
+            busy_count[sl] = np.rint((v > limit) @ counts)
+            revenue_t[sl] = hours[sl, 0] * (u @ counts)
+            payroll_t[sl] = hours[sl, 0] * (v @ counts)
+
+        gross_t = revenue_t - payroll_t
+        pct_t = np.divide(gross_t * 100, revenue_t, out=np.zeros_like(gross_t), where=revenue_t > 0)
+
+        return [
+            {
+                "burden": float(burden[i, 0]),
+                "weekly_hours": float(hours[i, 0]),
+                "charge_rate_change_pct": round(float((charge_f[i, 0] - 1) * 100), 4),
+                "pay_rate_change_pct": round(float((pay_f[i, 0] - 1) * 100), 4),
+                "weekly_revenue": round(float(revenue_t[i]), 2),
+                "weekly_gross_profit": round(float(gross_t[i]), 2),
+                "margin_percent": round(float(pct_t[i]), 2),
+                "status": "Healthy" if pct_t[i] > rules["healthy_margin_pct"] else "Critical",
+                "busy_fool_count": int(busy_count[i]),
+            }
+            for i in range(n)
+        ]
+
+
+def scenario_grid(
+    burden_multipliers: Optional[Sequence[float]] = None,
+    weekly_hours: Optional[Sequence[float]] = None,
+    charge_rate_change_pct: Optional[Sequence[float]] = None,
+    pay_rate_change_pct: Optional[Sequence[float]] = None,
+) -> List[Dict[str, float]]:
+    """Cartesian product of the given axes; omitted axes stay at the baseline rule."""
+    axes = {
+        "burden": burden_multipliers,
+        "weekly_hours": weekly_hours,
+        "charge_rate_change_pct": charge_rate_change_pct,
+        "pay_rate_change_pct": pay_rate_change_pct,
+    }
+    keys = [k for k, v in axes.items() if v]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(axes[k] for k in keys))]
+
+
+_book_lock = threading.Lock()
+_book_cache: Dict[str, tuple] = {}
+
+
+def cached_book(key: str, version: int, candidates: Sequence[Candidate]) -> PlacementBook:
+    """PlacementBook for `candidates`, rebuilt only when the snapshot version moves."""
+    with _book_lock:
+        hit = _book_cache.get(key)
+        if hit and hit[0] == version:
+            return hit[1]
+    book = PlacementBook.from_candidates(candidates)
+    with _book_lock:
+        _book_cache[key] = (version, book)
+    return book
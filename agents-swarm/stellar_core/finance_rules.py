@@ -0,0 +1,38 @@
+"""
+The Accountant's rules, in one place.
+
+Both the Postgres aggregation (agent_financial_health / agent_bench_liability,
+see supabase/migrations/0005_agent_finance_rpc.sql) and the Python fallback take
+their numbers from here, so the two paths can't drift apart.
+"""
+from typing import Any, Dict
+
+from stellar_core.db import env_number
+
+BURDEN_MULTIPLIER = 1.30      # The 1.30 Rule: labour cost incl. ACC/KiwiSaver/holiday pay
+WEEKLY_HOURS = 40             # Forecast week
+BUSY_FOOL_MIN_GP = 400        # Net GP/week below this is a Busy Fool
+BUSY_FOOL_MIN_MARGIN_PCT = 15
+HEALTHY_MARGIN_PCT = 18       # Company-wide margin needed for "Healthy"
+
+
+def finance_rules() -> Dict[str, float]:
+    """Current rules; each one can be overridden via env (e.g. FINANCE_BURDEN_MULTIPLIER)."""
+    return {
+        "burden": env_number("FINANCE_BURDEN_MULTIPLIER", BURDEN_MULTIPLIER),
+        "weekly_hours": env_number("FINANCE_WEEKLY_HOURS", WEEKLY_HOURS),
+        "min_gp": env_number("FINANCE_BUSY_FOOL_MIN_GP", BUSY_FOOL_MIN_GP),
+        "min_margin_pct": env_number("FINANCE_BUSY_FOOL_MIN_MARGIN_PCT", BUSY_FOOL_MIN_MARGIN_PCT),
+        "healthy_margin_pct": env_number("FINANCE_HEALTHY_MARGIN_PCT", HEALTHY_MARGIN_PCT),
+    }
+
+
+def rpc_params(rules: Dict[str, float]) -> Dict[str, Any]:
+    """Rules mapped onto the SQL function's named parameters."""
+    return {
+        "p_burden": rules["burden"],
+        "p_weekly_hours": rules["weekly_hours"],
+        "p_min_gp": rules["min_gp"],
+        "p_min_margin_pct": rules["min_margin_pct"],
+        "p_healthy_margin_pct": rules["healthy_margin_pct"],
+    }
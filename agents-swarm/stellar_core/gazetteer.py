@@ -0,0 +1,235 @@
+"""
+Offline New Zealand gazetteer: the suburbs, towns, areas and regions the
+roster and client book use, with approximate centre coordinates (WGS84,
+about a kilometre of accuracy, which is plenty for travel bands).
+
+    REGIONS   region -> (lat, lon) of its main centre
+    AREAS     area -> region; an area's centre is the mean of its places
+    PLACES    (name, lat, lon, parent) where parent is an area or a region
+    ALIASES   other spellings -> gazetteer name
+
+Names are matched by stellar_core.geo, which folds case, macrons, punctuation
+and "Mount"/"Mt", so "Mt Eden", "Mount Eden" and "mt. eden" are one place.
+Names must be unique across all three levels.
+"""
+
+REGIONS = {
+    "Northland": (-35.725, 174.323),
+    "Auckland": (-36.848, 174.763),
+    "Waikato": (-37.787, 175.279),
+    "Bay of Plenty": (-37.687, 176.165),
+    "Gisborne": (-38.662, 178.018),
+    "Hawke's Bay": (-39.565, 176.880),
+    "Taranaki": (-39.057, 174.075),
+    "Manawatu-Whanganui": (-40.352, 175.608),
+    "Wellington": (-41.287, 174.776),
+    "Nelson-Tasman": (-41.270, 173.284),
+    "Marlborough": (-41.514, 173.960),
+    "West Coast": (-42.450, 171.210),
+    "Canterbury": (-43.531, 172.637),
+    "Otago": (-45.874, 170.503),
+    "Southland": (-46.413, 168.353),
+}
+
+AREAS = {
+    "Auckland Central": "Auckland",
+    "North Shore": "Auckland",
+    "West Auckland": "Auckland",
+    "South Auckland": "Auckland",
+    "East Auckland": "Auckland",
+    "Rodney": "Auckland",
+    "Franklin": "Auckland",
+    "Wellington City": "Wellington",
+    "Hutt Valley": "Wellington",
+    "Kapiti Coast": "Wellington",
+    "Christchurch": "Canterbury",
+}
+
+PLACES = (
+    # --- Auckland ---
+    ("Auckland CBD", -36.848, 174.763, "Auckland Central"),
+    ("Ponsonby", -36.855, 174.745, "Auckland Central"),
+    ("Herne Bay", -36.845, 174.735, "Auckland Central"),
+    ("Grey Lynn", -36.860, 174.735, "Auckland Central"),
+    ("Westmere", -36.855, 174.722, "Auckland Central"),
+    ("Point Chevalier", -36.865, 174.710, "Auckland Central"),
+    ("Kingsland", -36.872, 174.743, "Auckland Central"),
+    ("Parnell", -36.855, 174.780, "Auckland Central"),
+    ("Newmarket", -36.870, 174.777, "Auckland Central"),
+    ("Mt Eden", -36.877, 174.757, "Auckland Central"),
+    ("Epsom", -36.888, 174.770, "Auckland Central"),
+    ("Remuera", -36.878, 174.800, "Auckland Central"),
+    ("Mt Albert", -36.885, 174.720, "Auckland Central"),
+    ("Sandringham", -36.890, 174.737, "Auckland Central"),
+    ("Avondale", -36.897, 174.693, "Auckland Central"),
+    ("Mt Roskill", -36.910, 174.737, "Auckland Central"),
+    ("Royal Oak", -36.910, 174.775, "Auckland Central"),
+    ("Onehunga", -36.923, 174.785, "Auckland Central"),
+    ("Ellerslie", -36.898, 174.808, "Auckland Central"),
+    ("Penrose", -36.915, 174.815, "Auckland Central"),
+    ("Mt Wellington", -36.905, 174.845, "Auckland Central"),
+    ("Glen Innes", -36.878, 174.855, "Auckland Central"),
+    ("Mission Bay", -36.848, 174.832, "Auckland Central"),
+    ("St Heliers", -36.855, 174.865, "Auckland Central"),
+    ("Albany", -36.728, 174.700, "North Shore"),
+    ("Takapuna", -36.788, 174.772, "North Shore"),
+    ("Devonport", -36.830, 174.797, "North Shore"),
+    ("Milford", -36.773, 174.765, "North Shore"),
+    ("Glenfield", -36.780, 174.720, "North Shore"),
+    ("Northcote", -36.803, 174.747, "North Shore"),
+    ("Birkenhead", -36.812, 174.726, "North Shore"),
+    ("Beach Haven", -36.793, 174.700, "North Shore"),
+    ("Greenhithe", -36.770, 174.685, "North Shore"),
+    ("Sunnynook", -36.758, 174.735, "North Shore"),
+    ("Rosedale", -36.745, 174.725, "North Shore"),
+    ("Mairangi Bay", -36.738, 174.755, "North Shore"),
+    ("Browns Bay", -36.716, 174.747, "North Shore"),
+    ("Torbay", -36.698, 174.750, "North Shore"),
+    ("Westgate", -36.817, 174.607, "West Auckland"),
+    ("Massey", -36.840, 174.610, "West Auckland"),
+    ("West Harbour", -36.815, 174.620, "West Auckland"),
+    ("Hobsonville", -36.795, 174.655, "West Auckland"),
+    ("Whenuapai", -36.790, 174.620, "West Auckland"),
+    ("Te Atatu", -36.845, 174.650, "West Auckland"),
+    ("Henderson", -36.879, 174.630, "West Auckland"),
+    ("Ranui", -36.865, 174.600, "West Auckland"),
+    ("Swanson", -36.867, 174.577, "West Auckland"),
+    ("Kelston", -36.900, 174.665, "West Auckland"),
+    ("New Lynn", -36.908, 174.684, "West Auckland"),
+    ("Glen Eden", -36.910, 174.650, "West Auckland"),
+    ("Titirangi", -36.937, 174.655, "West Auckland"),
+    ("Manukau", -36.993, 174.880, "South Auckland"),
+    ("Papatoetoe", -36.973, 174.840, "South Auckland"),
+    ("Otahuhu", -36.943, 174.840, "South Auckland"),
+    ("Mangere", -36.968, 174.800, "South Auckland"),
+    ("Mangere Bridge", -36.937, 174.787, "South Auckland"),
+    ("Airport Oaks", -37.000, 174.800, "South Auckland"),
+    ("Otara", -36.960, 174.875, "South Auckland"),
+    ("East Tamaki", -36.945, 174.895, "South Auckland"),
+    ("Flat Bush", -36.965, 174.915, "South Auckland"),
+    ("Wiri", -37.000, 174.865, "South Auckland"),
+    ("Manurewa", -37.023, 174.893, "South Auckland"),
+    ("Clendon Park", -37.023, 174.865, "South Auckland"),
+    ("Weymouth", -37.045, 174.865, "South Auckland"),
+    ("Takanini", -37.048, 174.920, "South Auckland"),
+    ("Papakura", -37.065, 174.945, "South Auckland"),
+    ("Pakuranga", -36.905, 174.875, "East Auckland"),
+    ("Highland Park", -36.900, 174.900, "East Auckland"),
+    ("Half Moon Bay", -36.885, 174.897, "East Auckland"),
+    ("Bucklands Beach", -36.870, 174.905, "East Auckland"),
+    ("Howick", -36.895, 174.925, "East Auckland"),
+    ("Botany", -36.930, 174.910, "East Auckland"),
+    ("Beachlands", -36.883, 175.000, "East Auckland"),
+    ("Orewa", -36.587, 174.693, "Rodney"),
+    ("Silverdale", -36.615, 174.675, "Rodney"),
+    ("Whangaparaoa", -36.635, 174.745, "Rodney"),
+    ("Warkworth", -36.400, 174.662, "Rodney"),
+    ("Kumeu", -36.777, 174.557, "Rodney"),
+    ("Helensville", -36.680, 174.450, "Rodney"),
+    ("Drury", -37.103, 174.950, "Franklin"),
+    ("Karaka", -37.100, 174.880, "Franklin"),
+    ("Pukekohe", -37.200, 174.900, "Franklin"),
+    ("Waiuku", -37.250, 174.730, "Franklin"),
+    # --- Northland ---
+    ("Whangarei", -35.725, 174.323, "Northland"),
+    ("Kerikeri", -35.227, 173.947, "Northland"),
+    ("Kaitaia", -35.115, 173.265, "Northland"),
+    ("Dargaville", -35.940, 173.870, "Northland"),
+    # --- Waikato ---
+    ("Hamilton", -37.787, 175.279, "Waikato"),
+    ("Ngaruawahia", -37.667, 175.150, "Waikato"),
+    ("Huntly", -37.560, 175.160, "Waikato"),
+    ("Pokeno", -37.245, 175.020, "Waikato"),
+    ("Cambridge", -37.890, 175.470, "Waikato"),
+    ("Te Awamutu", -38.010, 175.325, "Waikato"),
+    ("Morrinsville", -37.655, 175.530, "Waikato"),
+    ("Matamata", -37.810, 175.770, "Waikato"),
+    ("Thames", -37.140, 175.540, "Waikato"),
+    ("Tokoroa", -38.220, 175.870, "Waikato"),
+    ("Te Kuiti", -38.335, 175.165, "Waikato"),
+    ("Taupo", -38.686, 176.070, "Waikato"),
+    # --- Bay of Plenty ---
+    ("Tauranga", -37.687, 176.165, "Bay of Plenty"),
+    ("Mt Maunganui", -37.640, 176.185, "Bay of Plenty"),
+    ("Papamoa", -37.700, 176.285, "Bay of Plenty"),
+    ("Te Puke", -37.785, 176.325, "Bay of Plenty"),
+    ("Katikati", -37.550, 175.917, "Bay of Plenty"),
+    ("Rotorua", -38.137, 176.250, "Bay of Plenty"),
+    ("Whakatane", -37.953, 176.990, "Bay of Plenty"),
+    # --- East coast and lower North Island ---
+    ("Napier", -39.493, 176.912, "Hawke's Bay"),
+    ("Hastings", -39.640, 176.845, "Hawke's Bay"),
+    ("Havelock North", -39.670, 176.880, "Hawke's Bay"),
+    ("New Plymouth", -39.057, 174.075, "Taranaki"),
+    ("Hawera", -39.590, 174.283, "Taranaki"),
+    ("Palmerston North", -40.352, 175.608, "Manawatu-Whanganui"),
+    ("Feilding", -40.225, 175.565, "Manawatu-Whanganui"),
+    ("Whanganui", -39.930, 175.050, "Manawatu-Whanganui"),
+    ("Levin", -40.622, 175.287, "Manawatu-Whanganui"),
+    # --- Wellington ---
+    ("Wellington CBD", -41.287, 174.776, "Wellington City"),
+    ("Te Aro", -41.295, 174.775, "Wellington City"),
+    ("Newtown", -41.313, 174.778, "Wellington City"),
+    ("Kilbirnie", -41.318, 174.795, "Wellington City"),
+    ("Miramar", -41.315, 174.815, "Wellington City"),
+    ("Karori", -41.285, 174.738, "Wellington City"),
+    ("Johnsonville", -41.223, 174.805, "Wellington City"),
+    ("Porirua", -41.135, 174.840, "Wellington"),
+    ("Petone", -41.227, 174.870, "Hutt Valley"),
+    ("Lower Hutt", -41.210, 174.905, "Hutt Valley"),
+    ("Wainuiomata", -41.262, 174.945, "Hutt Valley"),
+    ("Upper Hutt", -41.125, 175.070, "Hutt Valley"),
+    ("Paraparaumu", -40.915, 175.005, "Kapiti Coast"),
+    ("Waikanae", -40.875, 175.065, "Kapiti Coast"),
+    ("Masterton", -40.950, 175.660, "Wellington"),
+    # --- South Island ---
+    ("Nelson", -41.270, 173.284, "Nelson-Tasman"),
+    ("Richmond", -41.340, 173.183, "Nelson-Tasman"),
+    ("Blenheim", -41.514, 173.960, "Marlborough"),
+    ("Greymouth", -42.450, 171.210, "West Coast"),
+    ("Christchurch CBD", -43.531, 172.637, "Christchurch"),
+    ("Riccarton", -43.530, 172.597, "Christchurch"),
+    ("Addington", -43.543, 172.618, "Christchurch"),
+    ("Sydenham", -43.550, 172.637, "Christchurch"),
+    ("Linwood", -43.535, 172.670, "Christchurch"),
+    ("Shirley", -43.505, 172.660, "Christchurch"),
+    ("Papanui", -43.495, 172.610, "Christchurch"),
+    ("Sockburn", -43.538, 172.555, "Christchurch"),
+    ("Hornby", -43.543, 172.525, "Christchurch"),
+    ("Halswell", -43.585, 172.570, "Christchurch"),
+    ("Rolleston", -43.592, 172.380, "Canterbury"),
+    ("Lincoln", -43.640, 172.485, "Canterbury"),
+    ("Kaiapoi", -43.378, 172.657, "Canterbury"),
+    ("Rangiora", -43.304, 172.595, "Canterbury"),
+    ("Ashburton", -43.903, 171.745, "Canterbury"),
+    ("Timaru", -44.397, 171.255, "Canterbury"),
+    ("Dunedin", -45.874, 170.503, "Otago"),
+    ("Mosgiel", -45.875, 170.350, "Otago"),
+    ("Oamaru", -45.097, 170.970, "Otago"),
+    ("Queenstown", -45.031, 168.662, "Otago"),
+    ("Frankton", -45.020, 168.735, "Otago"),
+    ("Cromwell", -45.045, 169.195, "Otago"),
+    ("Alexandra", -45.250, 169.380, "Otago"),
+    ("Wanaka", -44.700, 169.135, "Otago"),
+    ("Invercargill", -46.413, 168.353, "Southland"),
+    ("Gore", -46.100, 168.945, "Southland"),
+)
+
+ALIASES = {
+    "Auckland City": "Auckland Central",
+    "Central Auckland": "Auckland Central",
+    "Manukau City": "Manukau",
+    "Manukau City Centre": "Manukau",
+    "Te Atatu Peninsula": "Te Atatu",
+    "Te Atatu South": "Te Atatu",
+    "Hutt": "Hutt Valley",
+    "Hutt City": "Lower Hutt",
+    "Wellington Central": "Wellington CBD",
+    "Kapiti": "Kapiti Coast",
+    "Christchurch Central": "Christchurch CBD",
+    "Chch": "Christchurch",
+    "BOP": "Bay of Plenty",
+    "Manawatu": "Manawatu-Whanganui",
+    "Tasman": "Nelson-Tasman",
+    "Queenstown Lakes": "Queenstown",
+}
@@ -0,0 +1,251 @@
+"""
+Place resolution and proximity matching over the offline gazetteer.
+
+Region filters used to be substring text (`ilike("suburb", "%region%")`), so
+"South Auckland" never matched Manukau or Papatoetoe and "Auckland" only
+matched "Auckland CBD". resolve() turns free text into a gazetteer Place
+(a locality, an area like "South Auckland", or a region), and reach() is the
+one proximity rule every tool shares. A record is in reach of a centre when
+
+    - it is inside the centre (same locality, or a locality of that area /
+      region), or
+    - it is within `radius_km` of the centre, or
+    - with `enclosing`, the record's own place contains the centre (a client
+      listed as "Auckland" covers a squad in Manukau).
+
+Distances are great-circle km between place centres, rounded to 0.1. band()
+names them: local (<= 10 km), commute (<= 30), regional (<= 60), travel.
+
+PlaceGroups indexes many records (the roster, the client book) by resolved
+place, with a GridIndex over the places in use, so a query touches places
+rather than rows. Records whose location isn't in the gazetteer keep the old
+text rule.
+
+The gazetteer is loaded once per process; resolve() is memoized per text.
+"""
+import functools
+import math
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from stellar_core.gazetteer import ALIASES, AREAS, PLACES, REGIONS
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.2
+GRID_CELL_KM = 10.0
+BANDS = ((10, "local"), (30, "commute"), (60, "regional"))
+OUTSIDE_BANDS = "travel"
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str  # "locality" / "area" / "region"
+    lat: float
+    lon: float
+    area: Optional[str]
+    region: str
+
+
+def words(text: str) -> str:
+    """Lower-case words with macrons, punctuation and Mount/Saint spellings folded."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"[`'’]", "", text.replace("&", " and "))
+    out = []
+    for w in re.findall(r"[a-z0-9]+", text):
+        out.append({"mount": "mt", "saint": "st"}.get(w, w))
+    return " ".join(out)
+
+
+def _key(text: str) -> str:
+    return words(text).replace(" ", "")
+
+
+class _Gazetteer(NamedTuple):
+    by_key: Dict[str, Place]
+    by_name: Dict[str, Place]
+    longest_first: List[Tuple[str, Place]]  # (" spaced words ", place) for containment
+
+
+@functools.lru_cache(maxsize=None)
+def gazetteer() -> _Gazetteer:
+    """Every Place by name and lookup key (built once)."""
+    by_name: Dict[str, Place] = {}
+    members: Dict[str, List[Tuple[float, float]]] = {}
+    for name, (lat, lon) in REGIONS.items():
+        by_name[name] = Place(name, "region", lat, lon, None, name)
+    for name, lat, lon, parent in PLACES:
+        area = parent if parent in AREAS else None
+        by_name[name] = Place(name, "locality", lat, lon, area, AREAS.get(parent, parent))
+        if area:
+            members.setdefault(area, []).append((lat, lon))
+    for name, region in AREAS.items():
+        points = members[name]
+        lat = sum(p[0] for p in points) / len(points)
+        lon = sum(p[1] for p in points) / len(points)
+        by_name[name] = Place(name, "area", round(lat, 3), round(lon, 3), name, region)
+
+    by_key = {_key(name): place for name, place in by_name.items()}
+    by_key.update({_key(alias): by_name[name] for alias, name in ALIASES.items()})
+    spaced = {f" {words(n)} ": by_name[n] for n in by_name}
+    spaced.update({f" {words(a)} ": by_name[n] for a, n in ALIASES.items()})
+    longest_first = sorted(spaced.items(), key=lambda kv: -len(kv[0]))
+    return _Gazetteer(by_key, by_name, longest_first)
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve(text: str) -> Optional[Place]:
+    """
+    The gazetteer Place `text` names, or None. Tries the whole text, then each
+    comma-separated part ("Westgate, Auckland"), then the longest place name
+    it contains as whole words ("Papatoetoe East", "Greater Wellington").
+    """
+    if not text or not text.strip():
+        return None
+    g = gazetteer()
+    place = g.by_key.get(_key(text))
+    if place is not None:
+        return place
+    for part in re.split(r"[,;/()]|\s-\s", text):
+        place = g.by_key.get(_key(part))
+        if place is not None:
+            return place
+    padded = f" {words(text)} "
+    for name, place in g.longest_first:
+        if name in padded:
+            return place
+    return None
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def band(km: Optional[float]) -> Optional[str]:
+    """Travel band for a distance (None stays None)."""
+    if km is None:
+        return None
+    for limit, name in BANDS:
+        if km <= limit:
+            return name
+    return OUTSIDE_BANDS
+
+
+def contains(outer: Place, inner: Place) -> bool:
+    return inner.name == outer.name or inner.area == outer.name or inner.region == outer.name
+
+
+def reach(centre: Place, place: Place, radius_km: float = 0, enclosing: bool = False) -> Optional[float]:
+    """km from `centre` to `place` when `place` is in reach (see module docstring), else None."""
+    km = distance_km(centre.lat, centre.lon, place.lat, place.lon)
+    if contains(centre, place) or (enclosing and contains(place, centre)) or km <= radius_km:
+        return round(km, 1)
+    return None
+
+
+class GridIndex:
+    """Points bucketed into GRID_CELL_KM cells for radius queries."""
+
+    def __init__(self, points: Iterable[Tuple[Any, float, float]], cell_km: float = GRID_CELL_KM):
+        self.cell = cell_km / KM_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], List[Tuple[Any, float, float]]] = {}
+        for key, lat, lon in points:
+            self._cells.setdefault(self._cell_of(lat, lon), []).append((key, lat, lon))
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[float, Any]]:
+        """(km, key) of points within `radius_km`, nearest first."""
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(min(abs(lat) + dlat, 89.0))), 0.01))
+        lo_i, lo_j = self._cell_of(lat - dlat, lon - dlon)
+        hi_i, hi_j = self._cell_of(lat + dlat, lon + dlon)
+        out = []
+        for i in range(lo_i, hi_i + 1):
+            for j in range(lo_j, hi_j + 1):
+                for key, plat, plon in self._cells.get((i, j), ()):
+                    km = distance_km(lat, lon, plat, plon)
+                    if km <= radius_km:
+                        out.append((round(km, 1), key))
+        out.sort(key=lambda p: (p[0], str(p[1])))
+        return out
+
+
+class PlaceGroups:
+    """Record positions grouped by the Place of their location text."""
+
+    def __init__(self, locations: Iterable[Optional[str]]):
+        self.members: Dict[str, List[int]] = {}
+        self.unplaced: Dict[str, List[int]] = {}
+        for i, text in enumerate(locations):
+            place = resolve(text or "")
+            if place is not None:
+                self.members.setdefault(place.name, []).append(i)
+            elif text and text.strip():
+                self.unplaced.setdefault(text.strip().lower(), []).append(i)
+
+        by_name = gazetteer().by_name
+        self._children: Dict[str, List[str]] = {}
+        for name in self.members:
+            place = by_name[name]
+            for parent in {place.area, place.region} - {None, name}:
+                self._children.setdefault(parent, []).append(name)
+        self.grid = GridIndex((name, by_name[name].lat, by_name[name].lon) for name in self.members)
+
+    def match(self, centre: Place, radius_km: float = 0, enclosing: bool = False) -> List[Tuple[int, Optional[float]]]:
+        """
+        (position, km) of records in reach of `centre`, nearest place first.
+        Unplaced records whose text contains the centre's name, or is contained
+        in it, follow with km None.
+        """
+        return list(self.iter_match(centre, radius_km, enclosing))
+
+    def iter_match(self, centre: Place, radius_km: float = 0,
+                   enclosing: bool = False) -> Iterator[Tuple[int, Optional[float]]]:
+        """match(), lazily: stop early when only the nearest few are needed."""
+        by_name = gazetteer().by_name
+        found: Dict[str, float] = {}
+        names = [centre.name, *self._children.get(centre.name, ())]
+        if enclosing:
+            names += [centre.area, centre.region]
+        for name in names:
+            if name in self.members and name not in found:
+                found[name] = reach(centre, by_name[name], 0, enclosing)
+        if radius_km > 0:
+            for km, name in self.grid.within(centre.lat, centre.lon, radius_km):
+                found.setdefault(name, km)
+
+        for name, km in sorted(found.items(), key=lambda kv: (kv[1], kv[0])):
+            for i in self.members[name]:
+                yield i, km
+        needle = centre.name.lower()
+        for text, positions in self.unplaced.items():
+            if needle in text or text in needle:
+                for i in positions:
+                    yield i, None
+
+
+class NearFilter:
+    """Snapshot-row predicate for a tool's `near` / `radius_km` arguments; remembers kept rows' distances."""
+
+    def __init__(self, centre: Place, radius_km: float = 0, location=lambda row: row.get("suburb") or row.get("state")):
+        self.centre = centre
+        self.radius_km = radius_km
+        self.location = location
+        self._km: Dict[Any, float] = {}
+
+    def __call__(self, row: Dict) -> bool:
+        place = resolve(self.location(row) or "")
+        km = reach(self.centre, place, self.radius_km) if place is not None else None
+        if km is not None:
+            self._km[row.get("id")] = km
+        return km is not None
+
+    def km(self, row: Dict) -> Optional[float]:
+        return self._km.get(row.get("id"))
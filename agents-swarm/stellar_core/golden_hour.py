@@ -0,0 +1,225 @@
+"""
+Materialized Golden Hour board for the Sales Lead.
+
+Tier 1 clients are kept in decay order (oldest `last_contact` first, never
+contacted ahead of everyone) in a sorted key list. A changed `last_contact`
+moves one entry with two bisects; nothing is re-sorted or re-parsed. Open
+`market_tenders` are indexed by the client / main contractor name they mention
+and merged into each entry.
+
+The rendered call list is cached per (board version, day), so repeat calls are
+served from memory without touching the database or the list.
+
+Freshness:
+    - Polling: every SNAPSHOT_POLL seconds, Tier 1 clients whose `last_contact`
+      moved past the newest one seen are fetched and re-slotted (`clients` has
+      no updated_at; a logged call only ever moves last_contact forward).
+    - apply_change(): change-feed hook for `clients` INSERT/UPDATE/DELETE.
+    - Reload: after SNAPSHOT_TTL seconds (tier changes, deletes, tenders).
+"""
+import asyncio
+import threading
+import time
+import weakref
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from stellar_core import telemetry
+from stellar_core.db import env_number
+from stellar_core.parsing import iso_day, iso_days, today_ordinal
+from stellar_core.projections import project, select_clause
+from stellar_core.resilience import unreachable
+from stellar_core.scan import scan_pages, scan_table
+
+SILENCE_DAYS = 14
+CLOSED_TENDER_STATUSES = ("Won", "Lost")
+# Sort key for clients never contacted: ahead of any real date.
+_NEVER = -1
+
+
+class TenderSignal:
+    """Open tenders naming one client (as client or main contractor)."""
+
+    __slots__ = ("count", "next_title", "next_closing", "next_value")
+
+    def __init__(self):
+        self.count = 0
+        self.next_title = None
+        self.next_closing: Optional[int] = None
+        self.next_value = None
+
+    def add(self, title: str, closing: Optional[int], value: Any) -> None:
+        self.count += 1
+        if closing is not None and (self.next_closing is None or closing < self.next_closing):
+            self.next_title, self.next_closing, self.next_value = title, closing, value
+
+    def as_dict(self, today: int) -> Dict:
+        return {
+            "open_tenders": self.count,
+            "next_closing": None if self.next_closing is None else {
+                "title": self.next_title,
+                "days_to_close": self.next_closing - today,
+                "value": self.next_value,
+            },
+        }
+
+
+def tender_signals(rows: List[Dict], today: int) -> Dict[str, TenderSignal]:
+    """Open, not-yet-closed tenders grouped by lower-cased client / contractor name."""
+    signals: Dict[str, TenderSignal] = {}
+    closings = iso_days(r.get("closing_date") for r in rows)
+    for row, closing in zip(rows, closings):
+        if row.get("status") in CLOSED_TENDER_STATUSES or (closing is not None and closing < today):
+            continue
+        names = {(row.get(k) or "").strip().lower() for k in ("client", "main_contractor")}
+        for name in names - {""}:
+            signals.setdefault(name, TenderSignal()).add(row.get("title"), closing, row.get("value"))
+    return signals
+
+
+class GoldenHourBoard:
+    """Tier 1 clients in decay order, plus tender signals and a rendered-payload cache."""
+
+    def __init__(self, ttl: float = None, poll_interval: float = None):
+        self.ttl = ttl if ttl is not None else env_number("SNAPSHOT_TTL", 300)
+        self.poll_interval = poll_interval if poll_interval is not None else env_number("SNAPSHOT_POLL", 15)
+        self._keys: List[Tuple[int, Any]] = []
+        self._clients: Dict[Any, Tuple[int, str]] = {}
+        self._tenders: Dict[str, TenderSignal] = {}
+        self.high_water: Optional[str] = None
+        self.loaded_at = 0.0
+        self.polled_at = 0.0
+        self.version = 0
+        self._rendered: Optional[Tuple[int, int, Dict]] = None
+        self.lock = threading.Lock()
+        self._refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def _refresh_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            return self._refresh_locks.setdefault(loop, asyncio.Lock())
+
+    # --- maintenance (call with self.lock held) ---
+
+    def _put(self, client_id: Any, name: str, day: Optional[int], stamp: Optional[str]) -> None:
+        self._remove(client_id)
+        key = _NEVER if day is None else day
+        insort(self._keys, (key, client_id))
+        self._clients[client_id] = (key, name)
+        if stamp and (self.high_water is None or stamp > self.high_water):
+            self.high_water = stamp
+        self.version += 1
+
+    def _remove(self, client_id: Any) -> None:
+        old = self._clients.pop(client_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (old[0], client_id))]
+            self.version += 1
+
+    def _apply_rows(self, rows: List[Dict]) -> None:
+        stamps = [r.get("last_contact") for r in rows]
+        for row, day, stamp in zip(rows, iso_days(stamps), stamps):
+            if str(row.get("tier")) == "1":
+                self._put(row.get("id"), row.get("name"), day, stamp)
+            else:
+                self._remove(row.get("id"))
+
+    # --- refresh ---
+
+    async def refresh(self, label: str) -> None:
+        async with self._refresh_lock():
+            now = time.monotonic()
+            try:
+                if not self.loaded_at or now - self.loaded_at >= self.ttl:
+                    await self._load(label)
+                elif now - self.polled_at >= self.poll_interval:
+                    await self._poll(label)
+            except Exception as e:
+                if not self.loaded_at or not unreachable(e):
+                    raise
+                telemetry.on_stale()  # database down: keep serving the last load
+
+    async def _load(self, label: str) -> None:
+        clients: List[Dict] = []
+        pages = scan_pages("clients", select_clause("clients", label), label, where=lambda q: q.eq("tier", "1"),
+                           stale_ok=False)
+        async for page in pages:
+            clients.extend(project("clients", label, page))
+
+        tenders: List[Dict] = []
+        pages = scan_pages("market_tenders", select_clause("market_tenders", label), label,
+                           where=lambda q: q.not_.in_("status", list(CLOSED_TENDER_STATUSES)), stale_ok=False)
+        async for page in pages:
+            tenders.extend(project("market_tenders", label, page))
+
+        with self.lock:
+            self._keys, self._clients, self.high_water = [], {}, None
+            self._apply_rows(clients)
+            self._keys.sort()
+            self._tenders = tender_signals(tenders, today_ordinal())
+            self.version += 1
+            self.loaded_at = self.polled_at = time.monotonic()
+
+    async def _poll(self, label: str) -> None:
+        self.polled_at = time.monotonic()
+        if self.high_water is None:
+            return
+        changed = [
+            row async for row in scan_table(
+                "clients", select_clause("clients", label), label,
+                where=lambda q: q.eq("tier", "1").gt("last_contact", self.high_water), stale_ok=False,
+            )
+        ]
+        with self.lock:
+            self._apply_rows(project("clients", label, changed))
+
+    def apply_change(self, event: str, record: Dict = None, old_record: Dict = None) -> None:
+        """Change-feed hook for `clients` (Supabase realtime payload shape). Ignored before the first load."""
+        if not self.loaded_at:
+            return
+        with self.lock:
+            if event.upper() == "DELETE":
+                self._remove((old_record or record or {}).get("id"))
+            elif record:
+                self._apply_rows([record])
+
+    # --- read ---
+
+    def call_list(self) -> Dict:
+        """Decaying Tier 1 clients (plus any with open tenders), most severe first."""
+        today = today_ordinal()
+        with self.lock:
+            hit = self._rendered
+            if hit and hit[0] == self.version and hit[1] == today:
+                return hit[2]
+
+            calls = []
+            for key, client_id in self._keys:
+                _, name = self._clients[client_id]
+                days = None if key == _NEVER else today - key
+                signal = self._tenders.get((name or "").strip().lower())
+                if days is not None and days <= SILENCE_DAYS and signal is None:
+                    continue
+                entry = {"name": name, "days_silent": days}
+                if signal is not None:
+                    entry.update(signal.as_dict(today))
+                calls.append(entry)
+
+            payload = {"strategy": "Attack Decay", "as_of": date.fromordinal(today).isoformat(), "call_list": calls}
+            self._rendered = (self.version, today, payload)
+            return payload
+
+
+_board: Optional[GoldenHourBoard] = None
+_board_lock = threading.Lock()
+
+
+def get_golden_hour_board() -> GoldenHourBoard:
+    """Process-wide board, built on first use so .env has been loaded by then."""
+    global _board
+    if _board is None:
+        with _board_lock:
+            if _board is None:
+                _board = GoldenHourBoard()
+    return _board
@@ -0,0 +1,257 @@
+"""
+Append-only metric history on local disk.
+
+The Accountant and GM only ever saw "right now"; a trend meant rescanning
+and recomputing. A snapshot job (stellar_gm.tools.history) records the
+headline numbers every STELLAR_HISTORY_INTERVAL seconds (default 3600) into a
+HistoryStore, and get_trend reads them back without touching Supabase.
+
+Layout (STELLAR_HISTORY_DIR, default ./stellar_history):
+
+    metrics-<schema>.bin    fixed-width little-endian records: ts (f8, Unix
+                            seconds, UTC) then every column in COLUMNS order
+    metrics-<schema>.json   the column list that file was written with
+
+Records are only ever appended, one write per sample. A torn last record
+(crash mid-write) is ignored on read and cut off before the next append.
+Changing COLUMNS starts a new file; reads merge every file and fill columns a
+file doesn't have with NaN. Money is stored as f8, counts and percentages as
+f4: 76 bytes per sample, under 1 MB a year at the default interval.
+
+Reads are NumPy arrays, cached until a file grows. query() downsamples to
+hour / day / week (ISO, Monday) / month buckets in UTC with last / mean / min /
+max per bucket.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from stellar_core.db import env_number
+from stellar_core.expiry import BUCKETS
+
+DEFAULT_DIR = "stellar_history"
+
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    # get_financial_health
+    ("weekly_revenue", "f8"),
+    ("weekly_gross_profit", "f8"),
+    ("margin_percent", "f4"),
+    ("busy_fool_count", "f4"),
+    # get_bench_liability
+    ("bench_weekly_burn", "f8"),
+    ("bench_liable_count", "f4"),
+    ("bench_guaranteed_hours", "f4"),
+    # get_bench_strength
+    ("bench_available", "f4"),
+    ("bench_mobile", "f4"),
+    ("bench_seniors", "f4"),
+    # check_visa_risks buckets
+    ("visa_expired", "f4"),
+    *((f"visa_{lo}_{hi}", "f4") for lo, hi in BUCKETS),
+)
+METRICS = tuple(name for name, _ in COLUMNS)
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+BUCKET_NAMES = ("hour", "day", "week", "month")
+AGGREGATES = ("last", "mean", "min", "max")
+
+
+class HistoryError(ValueError):
+    """Bad query (unknown metric, bucket or aggregate)."""
+
+
+def _dtype(columns: Sequence[Tuple[str, str]]) -> np.dtype:
+    return np.dtype([("ts", "<f8")] + [(name, "<" + kind) for name, kind in columns])
+
+
+def _schema_id(columns: Sequence[Tuple[str, str]]) -> str:
+    return hashlib.sha1(json.dumps(list(columns)).encode()).hexdigest()[:8]
+
+
+def bucket_keys(ts: np.ndarray, bucket: str) -> np.ndarray:
+    """Integer bucket index per timestamp (UTC)."""
+    if bucket in BUCKET_SECONDS:
+        return np.floor(ts / BUCKET_SECONDS[bucket]).astype(np.int64)
+    days = np.floor(ts / 86400).astype(np.int64)
+    if bucket == "week":
+        return (days + 3) // 7  # 1970-01-01 was a Thursday; weeks start Monday
+    if bucket == "month":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    raise HistoryError(f"Unknown bucket '{bucket}'; use one of {', '.join(BUCKET_NAMES)}.")
+
+
+def bucket_start(key: int, bucket: str) -> str:
+    """ISO start of bucket `key` (date for day/week/month, date-time for hour)."""
+    if bucket == "hour":
+        return str(np.datetime64(int(key) * 3600, "s").astype("datetime64[m]"))
+    if bucket == "day":
+        return str(np.datetime64(int(key), "D"))
+    if bucket == "week":
+        return str(np.datetime64(int(key) * 7 - 3, "D"))
+    return str(np.datetime64(int(key), "M").astype("datetime64[D]"))
+
+
+def _aggregate(values: np.ndarray, starts: np.ndarray, agg: str) -> np.ndarray:
+    """Per-bucket `agg` of `values` (buckets begin at `starts`), skipping NaN."""
+    present = ~np.isnan(values)
+    if agg == "mean":
+        sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+        counts = np.add.reduceat(present.astype(np.int64), starts)
+        return np.divide(sums, counts, out=np.full(len(starts), np.nan), where=counts > 0)
+    if agg in ("min", "max"):
+        fill, ufunc = (np.inf, np.minimum) if agg == "min" else (-np.inf, np.maximum)
+        out = ufunc.reduceat(np.where(present, values, fill), starts)
+        return np.where(np.isinf(out), np.nan, out)
+    # last non-missing value in each bucket
+    idx = np.maximum.reduceat(np.where(present, np.arange(len(values)), -1), starts)
+    out = np.full(len(starts), np.nan)
+    ok = idx >= starts
+    out[ok] = values[idx[ok]]
+    return out
+
+
+class HistoryStore:
+    """One directory of metric files; see module docstring."""
+
+    def __init__(self, directory: str = None, interval: float = None):
+        self.directory = directory or os.environ.get("STELLAR_HISTORY_DIR") or DEFAULT_DIR
+        self.interval = interval if interval is not None else env_number("STELLAR_HISTORY_INTERVAL", 3600)
+        self.schema = _schema_id(COLUMNS)
+        self.dtype = _dtype(COLUMNS)
+        self._cached: Optional[Tuple[Tuple, Dict[str, np.ndarray]]] = None
+        self.lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"metrics-{self.schema}.bin")
+
+    # --- write ---
+
+    def append(self, sample: Dict[str, Optional[float]], ts: float = None) -> Optional[float]:
+        """
+        Appends `sample` (metric -> value; missing / None = NaN) stamped at the
+        start of its interval slot. Returns that stamp, or None if the slot is
+        already recorded.
+        """
+        now = time.time() if ts is None else ts
+        slot = float(np.floor(now / self.interval) * self.interval) if self.interval > 0 else float(now)
+        with self.lock:
+            latest = self._latest()
+            if latest is not None and slot <= latest:
+                return None
+            record = np.zeros(1, dtype=self.dtype)
+            record["ts"] = slot
+            for name in METRICS:
+                value = sample.get(name)
+                record[name] = np.nan if value is None else value
+            os.makedirs(self.directory, exist_ok=True)
+            manifest = self.path[:-len(".bin")] + ".json"
+            if not os.path.exists(manifest):
+                with open(manifest, "w") as f:
+                    json.dump({"columns": [list(c) for c in COLUMNS]}, f)
+            self._trim_torn(self.path)
+            with open(self.path, "ab") as f:
+                f.write(record.tobytes())
+        return slot
+
+    def _trim_torn(self, path: str) -> None:
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size % self.dtype.itemsize:
+                with open(path, "r+b") as f:
+                    f.truncate(size - size % self.dtype.itemsize)
+
+    def _latest(self) -> Optional[float]:
+        """Newest stamp in any file, read from each file's last whole record."""
+        latest = None
+        for path, columns in self._files():
+            width = _dtype(columns).itemsize
+            whole = os.path.getsize(path) // width
+            if whole:
+                with open(path, "rb") as f:
+                    f.seek((whole - 1) * width)
+                    ts = float(np.frombuffer(f.read(8), dtype="<f8")[0])
+                latest = ts if latest is None else max(latest, ts)
+        return latest
+
+    # --- read ---
+
+    def _files(self) -> List[Tuple[str, List[Tuple[str, str]]]]:
+        """(data file, its columns) for every schema in the directory."""
+        out = []
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return out
+        for name in names:
+            if name.startswith("metrics-") and name.endswith(".json"):
+                data = os.path.join(self.directory, name[:-len(".json")] + ".bin")
+                if os.path.exists(data):
+                    with open(os.path.join(self.directory, name)) as f:
+                        out.append((data, [tuple(c) for c in json.load(f)["columns"]]))
+        return out
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Every sample as float64 columns ("ts" plus METRICS), oldest first."""
+        files = self._files()
+        stamp = tuple((path, os.stat(path).st_mtime_ns, os.path.getsize(path)) for path, _ in files)
+        cached = self._cached
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        parts = []
+        for path, columns in files:
+            dtype = _dtype(columns)
+            records = np.fromfile(path, dtype=np.uint8)
+            records = records[:len(records) - len(records) % dtype.itemsize].view(dtype)
+            part = {"ts": records["ts"].astype(np.float64)}
+            for name in METRICS:
+                part[name] = (records[name].astype(np.float64) if name in records.dtype.names
+                              else np.full(len(records), np.nan))
+            parts.append(part)
+        if parts:
+            merged = {k: np.concatenate([p[k] for p in parts]) for k in ("ts",) + METRICS}
+            order = np.argsort(merged["ts"], kind="stable")
+            merged = {k: v[order] for k, v in merged.items()}
+        else:
+            merged = {k: np.zeros(0) for k in ("ts",) + METRICS}
+        self._cached = (stamp, merged)
+        return merged
+
+    def query(self, metrics: Sequence[str], start: float, end: float,
+              bucket: str = "day", agg: str = "last") -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+        """(bucket keys, metric -> per-bucket values, samples per bucket) for start <= ts < end."""
+        unknown = [m for m in metrics if m not in METRICS]
+        if unknown:
+            raise HistoryError(f"Unknown metric(s) {', '.join(unknown)}; known: {', '.join(METRICS)}.")
+        if agg not in AGGREGATES:
+            raise HistoryError(f"Unknown aggregate '{agg}'; use one of {', '.join(AGGREGATES)}.")
+        cols = self.columns()
+        lo, hi = np.searchsorted(cols["ts"], [start, end], side="left")
+        ts = cols["ts"][lo:hi]
+        keys = bucket_keys(ts, bucket)
+        if not len(keys):
+            return keys, {m: np.zeros(0) for m in metrics}, np.zeros(0, dtype=np.int64)
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+        counts = np.diff(np.append(starts, len(keys)))
+        values = {m: _aggregate(cols[m][lo:hi], starts, agg) for m in metrics}
+        return keys[starts], values, counts
+
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """Process-wide store, built on first use so .env has been loaded by then."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HistoryStore()
+    return _store
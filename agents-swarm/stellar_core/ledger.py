@@ -0,0 +1,265 @@
+"""
+Incremental finance ledger for the Accountant.
+
+get_financial_health and get_bench_liability used to re-price the whole roster
+on every call, though placements change a few times a day. FinanceLedger keeps
+the company-wide numbers running instead:
+
+    revenue / burdened payroll (placed + on_job), hence gross profit and margin
+    the Busy Fool set
+    bench burn and guaranteed hours (available, guaranteed_hours > 0)
+
+It listens to the `candidates` snapshot (SnapshotCache.add_listener), so every
+row the snapshot takes in, from polling or the change feed
+(stellar_core.changefeed), is applied as a delta: the row's old contribution
+comes out and its new one goes in. Queries read the running totals; the
+listings are sorted once per change.
+
+Parity: totals are kept as exact sums (ExactSum), and the batch path
+(finance_engine) uses math.fsum, which is the same correctly rounded value, so
+the ledger and a full recompute agree exactly, not just to a tolerance.
+
+Reconciliation: every FINANCE_LEDGER_RECONCILE seconds (default 300) the next
+query also runs the batch calculation. Any difference is logged, counted in
+stats(), and the ledger is rebuilt from the snapshot. A full snapshot reload,
+or a change to the finance rules, rebuilds it too.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from stellar_core.cache import get_snapshot_cache
+from stellar_core.candidate import Candidate, get_candidate_records
+from stellar_core.db import env_number
+from stellar_core.finance_engine import PlacementBook, bench_liability, deal_order, liability_order
+from stellar_core.finance_rules import finance_rules
+from stellar_core.projections import project
+
+PLACED_STATUSES = ("on_job", "placed")
+# Floats are multiples of 2**-1074; scaled by this, every sum is an exact int.
+_SCALE_BITS = 1074
+
+
+class ExactSum:
+    """Running sum of floats with no rounding error; `value` equals math.fsum of what is in it."""
+
+    __slots__ = ("_total",)
+
+    def __init__(self):
+        self._total = 0
+
+    @staticmethod
+    def _scaled(x: float) -> int:
+        n, d = float(x).as_integer_ratio()
+        return n << (_SCALE_BITS - d.bit_length() + 1)
+
+    def add(self, x: float) -> None:
+        self._total += self._scaled(x)
+
+    def remove(self, x: float) -> None:
+        self._total -= self._scaled(x)
+
+    @property
+    def value(self) -> float:
+        return self._total / (1 << _SCALE_BITS)  # int / int is correctly rounded
+
+
+class _Entry:
+    """One candidate's contribution to the ledger."""
+
+    __slots__ = ("revenue", "payroll", "deal", "burn", "hours", "liability")
+
+    def __init__(self, c: Candidate, rules: Dict[str, float]):
+        self.revenue = self.payroll = self.burn = self.hours = None
+        self.deal = self.liability = None
+        if c.status in PLACED_STATUSES:
+            # Same arithmetic, in the same order, as PlacementBook.evaluate().
+            hours = rules["weekly_hours"]
+            self.revenue = c.charge_rate * hours
+            self.payroll = c.pay_rate * rules["burden"] * hours
+            net_gp = self.revenue - self.payroll
+            margin_pct = net_gp * 100 / self.revenue if self.revenue > 0 else 0.0
+            if net_gp < rules["min_gp"] or margin_pct < rules["min_margin_pct"]:
+                self.deal = {
+                    "name": c.name,
+                    "net_gp": round(float(net_gp), 2),
+                    "margin_pct": round(float(margin_pct), 1),
+                    "client": c.current_project or "Unknown",
+                }
+        elif c.status == "available" and c.guaranteed_hours > 0:
+            self.hours = c.guaranteed_hours
+            self.burn = c.guaranteed_hours * c.pay_rate
+            self.liability = {"name": c.name, "weekly_burn": self.burn, "guaranteed_hours": self.hours}
+
+
+class FinanceLedger:
+    """Running finance totals for one set of rules; see module docstring."""
+
+    def __init__(self, reconcile_interval: float = None):
+        self.reconcile_interval = (reconcile_interval if reconcile_interval is not None
+                                   else env_number("FINANCE_LEDGER_RECONCILE", 300))
+        self.rules: Optional[Dict[str, float]] = None
+        self.version: Optional[int] = None  # snapshot version the totals reflect
+        self.reconciled_at = 0.0
+        self._entries: Dict[Any, _Entry] = {}
+        self._revenue = ExactSum()
+        self._payroll = ExactSum()
+        self._burn = ExactSum()
+        self._hours = ExactSum()
+        self._placements = 0
+        self._deals: Dict[Any, Dict] = {}
+        self._liabilities: Dict[Any, Dict] = {}
+        self._sorted: Dict[str, Tuple[int, List[Dict]]] = {}
+        self._changes = 0
+        self._cache = None
+        self.lock = threading.Lock()
+        self.counters = {"deltas": 0, "rebuilds": 0, "reconciles": 0, "drifts": 0}
+
+    # --- write ---
+
+    def _apply(self, row_id: Any, entry: Optional[_Entry]) -> None:
+        """Swaps `row_id`'s contribution for `entry` (None = remove). Call with self.lock held."""
+        old = self._entries.pop(row_id, None)
+        for e, sign in ((old, -1), (entry, 1)):
+            if e is None:
+                continue
+            if e.revenue is not None:
+                (self._revenue.add if sign > 0 else self._revenue.remove)(e.revenue)
+                (self._payroll.add if sign > 0 else self._payroll.remove)(e.payroll)
+                self._placements += sign
+            if e.burn is not None:
+                (self._burn.add if sign > 0 else self._burn.remove)(e.burn)
+                (self._hours.add if sign > 0 else self._hours.remove)(e.hours)
+        self._deals.pop(row_id, None)
+        self._liabilities.pop(row_id, None)
+        if entry is not None:
+            self._entries[row_id] = entry
+            if entry.deal is not None:
+                self._deals[row_id] = entry.deal
+            if entry.liability is not None:
+                self._liabilities[row_id] = entry.liability
+        self._changes += 1
+
+    def on_change(self, version: int, upserted: List[Dict], deleted: List[Any], reloaded: bool) -> None:
+        """SnapshotCache listener for `candidates`."""
+        with self.lock:
+            if self.rules is None or self.version is None:
+                return
+            if reloaded:
+                self.version = None  # rebuilt on the next query
+                return
+            for row in project("candidates", "candidate_record", upserted):
+                self._apply(row.get("id"), _Entry(Candidate(row), self.rules))
+            for row_id in deleted:
+                self._apply(row_id, None)
+            self.version = version
+            self.counters["deltas"] += len(upserted) + len(deleted)
+
+    def rebuild(self, version: int, records: Sequence[Candidate], rules: Dict[str, float]) -> None:
+        with self.lock:
+            self.rules = dict(rules)
+            self._entries = {}
+            self._revenue, self._payroll, self._burn, self._hours = ExactSum(), ExactSum(), ExactSum(), ExactSum()
+            self._placements = 0
+            self._deals, self._liabilities, self._sorted = {}, {}, {}
+            for c in records:
+                self._apply(c.id, _Entry(c, self.rules))
+            self.version = version
+            self.counters["rebuilds"] += 1
+
+    async def sync(self, label: str) -> None:
+        """Brings the ledger up to the current snapshot (deltas arrive via on_change)."""
+        cache = get_snapshot_cache()
+        if cache is not self._cache:
+            cache.add_listener("candidates", self.on_change)
+            self._cache = cache
+            with self.lock:
+                self.version = None
+        rules = finance_rules()
+        version, _ = await cache.versioned_rows("candidates", label)  # polls / reloads, firing on_change
+        with self.lock:
+            current = self.version == version and self.rules == rules
+            due = time.monotonic() - self.reconciled_at >= self.reconcile_interval
+        if current and not due:
+            return
+        version, records = await get_candidate_records(label)
+        if current:
+            self.reconcile(version, records)
+        else:
+            self.rebuild(version, records, rules)
+        self.reconciled_at = time.monotonic()
+
+    def reconcile(self, version: int, records: Sequence[Candidate]) -> bool:
+        """Compares against a full batch recompute; rebuilds on any difference. True if they agreed."""
+        with self.lock:
+            rules = self.rules
+            if self.version != version:
+                return True  # moved on since; the next query catches up
+        self.counters["reconciles"] += 1
+        placements = [c for c in records if c.status in PLACED_STATUSES]
+        expected = (PlacementBook.from_candidates(placements).evaluate(rules), bench_liability(records))
+        health, liability = self.financial_health(), self.bench_liability()
+        agreed = (
+            health["weekly_revenue"] == expected[0]["weekly_revenue"]
+            and health["weekly_payroll"] == expected[0]["weekly_payroll"]
+            and health["busy_fool_deals"] == expected[0]["busy_fool_deals"]
+            and liability["total_weekly_burn"] == expected[1]["total_weekly_burn"]
+            and liability["liability_list"] == expected[1]["liability_list"]
+        )
+        if not agreed:
+            self.counters["drifts"] += 1
+            print(f"WARNING: finance ledger drifted from the batch totals at snapshot {version}; rebuilding.")
+            self.rebuild(version, records, rules)
+        return agreed
+
+    # --- read ---
+
+    def _listing(self, name: str, source: Dict[Any, Dict], key) -> List[Dict]:
+        """`source` values sorted by `key`, cached until the next change. Call with self.lock held."""
+        hit = self._sorted.get(name)
+        if hit is None or hit[0] != self._changes:
+            hit = self._sorted[name] = (self._changes, sorted(source.values(), key=key))
+        return hit[1]
+
+    def financial_health(self) -> Dict:
+        """Same shape as PlacementBook.evaluate(), plus placement count."""
+        with self.lock:
+            revenue, payroll = self._revenue.value, self._payroll.value
+            gross = revenue - payroll
+            return {
+                "weekly_revenue": revenue,
+                "weekly_payroll": payroll,
+                "weekly_gross_profit": gross,
+                "margin_percent": (gross / revenue * 100) if revenue > 0 else 0,
+                "placements": self._placements,
+                "busy_fool_deals": self._listing("deals", self._deals, deal_order),
+            }
+
+    def bench_liability(self) -> Dict:
+        """Same shape as finance_engine.bench_liability(), plus guaranteed-hour total."""
+        with self.lock:
+            burn, hours = self._burn.value, self._hours.value
+            return {
+                "status": "Clean" if burn == 0 else "Burning Cash",
+                "total_weekly_burn": burn,
+                "total_guaranteed_hours": int(hours) if hours.is_integer() else hours,
+                "liability_list": self._listing("liabilities", self._liabilities, liability_order),
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"version": self.version, "entries": len(self._entries), **self.counters}
+
+
+_ledger: Optional[FinanceLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_finance_ledger() -> FinanceLedger:
+    """Process-wide ledger, built on first use so .env has been loaded by then."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = FinanceLedger()
+    return _ledger
@@ -0,0 +1,225 @@
+"""
+Turn- and session-scoped tool-call memoization.
+
+The GM chains tools (bench liability -> squads -> demand) and often repeats a
+call with the same arguments within one conversation. as_tool() runs every
+tool through memoize(). A call made with ADK's ToolContext is keyed on
+
+    (session id, tool name, normalized arguments)
+
+where normalized means bound to the signature, defaults applied and keys
+sorted, so search_talent("digger") == search_talent(query="digger", status="available").
+
+Reuse rules:
+    - same turn (ADK invocation): reused for up to TOOL_MEMO_TURN_TTL seconds
+      (default 300), so answers inside a turn are consistent;
+    - later turns of the same session: reused while younger than
+      TOOL_MEMO_SESSION_TTL seconds (default 30; 0 = never);
+    - identical calls in flight at once (parallel function calls) share one
+      execution.
+Error results, and results built from last-known-good data while the database
+was down (stellar_core.resilience), are never stored. Calls without a
+ToolContext (sync wrappers, scripts, the status snapshot's internal calls) are
+not memoized.
+
+Invalidation: invalidate(tool=..., session_id=...) drops entries explicitly;
+SnapshotCache.invalidate() drops everything. TOOL_MEMO=off disables the
+layer; TOOL_MEMO_MAX_ENTRIES (default 2000) bounds it (LRU).
+
+Standard library only at import time: the lazy registry (stellar_core.registry)
+uses with_tool_context() before any tools module is loaded.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+TOOL_CONTEXT = "tool_context"
+
+
+def with_tool_context(signature: inspect.Signature) -> inspect.Signature:
+    """`signature` plus the keyword-only `tool_context` ADK injects (and leaves out of the declaration)."""
+    if TOOL_CONTEXT in signature.parameters:
+        return signature
+    param = inspect.Parameter(TOOL_CONTEXT, inspect.Parameter.KEYWORD_ONLY, default=None)
+    return signature.replace(parameters=[*signature.parameters.values(), param])
+
+
+def _scope(ctx: Any) -> Tuple[Optional[str], Optional[str]]:
+    """(session id, invocation id) from an ADK ToolContext."""
+    if ctx is None:
+        return None, None
+    session = getattr(ctx, "session", None) or getattr(getattr(ctx, "_invocation_context", None), "session", None)
+    return getattr(session, "id", None), getattr(ctx, "invocation_id", None)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def normalize_args(signature: inspect.Signature, args: tuple, kwargs: Dict) -> str:
+    """Canonical JSON for a call: bound to `signature`, defaults applied, keys sorted."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return json.dumps(_plain(dict(bound.arguments)), sort_keys=True, default=str)
+
+
+def is_error(result: Any) -> bool:
+    if isinstance(result, str):
+        return result.startswith("Error")  # e.g. "Error: Database connection failed"
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, list) and len(result) == 1 and isinstance(result[0], dict):
+        return "error" in result[0]
+    return False
+
+
+class ToolMemo:
+    """Session-keyed results store; see module docstring."""
+
+    def __init__(self, turn_ttl: float = None, session_ttl: float = None, max_entries: int = None):
+        from stellar_core.db import env_number
+
+        self.turn_ttl = turn_ttl if turn_ttl is not None else env_number("TOOL_MEMO_TURN_TTL", 300)
+        self.session_ttl = session_ttl if session_ttl is not None else env_number("TOOL_MEMO_SESSION_TTL", 30)
+        self.max_entries = int(max_entries if max_entries is not None else env_number("TOOL_MEMO_MAX_ENTRIES", 2000))
+        # key -> (result, stored_at, invocation id)
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[Any, float, Optional[str]]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, str], invocation: Optional[str], now: float) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            result, stored_at, stored_in = entry
+            limit = self.turn_ttl if invocation is not None and invocation == stored_in else self.session_ttl
+            if now - stored_at > limit:
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, result
+
+    def put(self, key: Tuple[str, str, str], result: Any, invocation: Optional[str], now: float) -> None:
+        with self._lock:
+            self._entries[key] = (result, now, invocation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def call(self, key: Tuple[str, str, str], invocation: Optional[str], run: Callable[[], Awaitable[Any]]) -> Any:
+        from stellar_core import telemetry
+
+        found, result = self.get(key, invocation, time.monotonic())
+        if found:
+            telemetry.on_memo_hit()
+            return result
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pending = self._pending.get(key)
+            owner = pending is None or pending.get_loop() is not loop
+            if owner:
+                pending = self._pending[key] = loop.create_future()
+            else:
+                self.hits += 1
+        if not owner:
+            telemetry.on_memo_hit()
+            return await asyncio.shield(pending)
+
+        with self._lock:
+            self.misses += 1
+        try:
+            result = await run()
+        except BaseException as e:
+            pending.set_exception(e)
+            pending.exception()  # mark retrieved; waiters re-raise it themselves
+            raise
+        else:
+            pending.set_result(result)
+            if not is_error(result) and not telemetry.served_stale():
+                self.put(key, result, invocation, time.monotonic())
+            return result
+        finally:
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+
+    def invalidate(self, tool: str = None, session_id: str = None) -> int:
+        """Drops entries for `tool` and/or `session_id` (everything if neither). Returns how many."""
+        with self._lock:
+            doomed = [k for k in self._entries
+                      if (session_id is None or k[0] == session_id) and (tool is None or k[1] == tool)]
+            for k in doomed:
+                del self._entries[k]
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "turn_ttl": self.turn_ttl, "session_ttl": self.session_ttl}
+
+
+_memo: Optional[ToolMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_tool_memo() -> ToolMemo:
+    """Process-wide memo, built on first use so .env has been loaded by then."""
+    global _memo
+    if _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = ToolMemo()
+    return _memo
+
+
+def enabled() -> bool:
+    return os.environ.get("TOOL_MEMO", "on").lower() not in ("0", "off", "false", "no")
+
+
+def invalidate(tool: str = None, session_id: str = None) -> int:
+    """Explicit invalidation hook (e.g. after a write the agents should see at once)."""
+    return get_tool_memo().invalidate(tool, session_id) if _memo is not None else 0
+
+
+def memoize(fn: Callable[..., Awaitable[Any]], name: str) -> Callable[..., Awaitable[Any]]:
+    """
+    Wraps tool coroutine `fn` (registered as `name`) so calls carrying a
+    ToolContext are memoized per session. The wrapper accepts `tool_context`
+    and does not pass it on.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def memoized(*args, tool_context=None, **kwargs):
+        session_id, invocation = _scope(tool_context)
+        if session_id is None or not enabled():
+            return await fn(*args, **kwargs)
+        try:
+            key = (session_id, name, normalize_args(signature, args, kwargs))
+        except TypeError:
+            return await fn(*args, **kwargs)  # let the tool report the bad call
+        return await get_tool_memo().call(key, invocation, lambda: fn(*args, **kwargs))
+
+    memoized.__signature__ = with_tool_context(signature)
+    return memoized
+
+
+def memo_stats() -> Dict[str, Any]:
+    """Entries held, hits and misses so far, and the TTLs in force."""
+    return get_tool_memo().stats()
@@ -0,0 +1,495 @@
+"""
+Offline snapshot backend: every tool runs against a local SQLite file.
+
+For demos, load tests and outages. From agents-swarm/:
+
+    python -m stellar_core.offline export snapshot.db     # Supabase -> file
+    python -m stellar_core.offline info snapshot.db
+    STELLAR_BACKEND=offline STELLAR_SNAPSHOT=snapshot.db adk web .
+
+export copies SNAPSHOT_TABLES (all columns, keyset-scanned in id order) into
+one SQLite file. It adds the indexes in INDEXES, the local twins of the
+Postgres ones in supabase/migrations, including the Site Safe expiry
+expression index. The file is written under a temporary name and renamed, so
+readers never see half a snapshot.
+
+With STELLAR_BACKEND=offline, stellar_core.db hands every tool a
+SnapshotClient instead of Supabase. It implements the query-builder calls the
+tools make (select, eq/neq/gt/gte/lt/lte, in_, is_, like/ilike, not_, order,
+limit, range) by compiling them to SQL. PostgREST semantics are kept:
+    - NULL never matches a comparison, also under not_;
+    - `col->>key` reads a JSON key as text;
+    - filter values are cast to the column's type;
+    - rows without an order() come back in id order.
+Values round-trip exactly: each column's kind (text, number, bool, json) is
+recorded at export. rpc() raises, as a database without migration 0005 would,
+so finance tools take their Python path. Writes are not supported.
+
+Connections are read-only, one per thread, with the file memory-mapped
+(STELLAR_SNAPSHOT_MMAP_MB, default 256).
+
+Config:
+    STELLAR_BACKEND    supabase (default) | offline
+    STELLAR_SNAPSHOT   snapshot path (default stellar_snapshot.db)
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from stellar_core.db import env_number, get_async_supabase
+
+FORMAT_VERSION = 1
+
+SNAPSHOT_TABLES = ("candidates", "clients", "market_tenders", "market_tender_stakeholders")
+
+# Indexed columns per table (created when the column exists). `col->>key`
+# makes an expression index on the JSON key.
+INDEXES: Dict[str, Tuple[str, ...]] = {
+    "candidates": ("status", "updated_at", "visa_expiry", "compliance->>siteSafeExpiry", "role"),
+    "clients": ("status", "region", "tier", "last_contact", "updated_at"),
+    "market_tenders": ("status", "closing_date", "updated_at"),
+    "market_tender_stakeholders": ("tender_id",),
+}
+
+DEFAULT_PATH = "stellar_snapshot.db"
+
+
+class OfflineError(Exception):
+    """Snapshot missing or unreadable, or a query the offline backend cannot serve."""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code  # PostgREST error code where one applies
+
+
+def enabled() -> bool:
+    return (os.environ.get("STELLAR_BACKEND") or "supabase").lower() == "offline"
+
+
+def snapshot_path() -> str:
+    return os.environ.get("STELLAR_SNAPSHOT") or DEFAULT_PATH
+
+
+# --- column kinds ---
+
+def _kind(values: Iterable[Any]) -> str:
+    """How a column is stored: text/number as-is, bool as 0/1, anything else as JSON text."""
+    types = {type(v) for v in values if v is not None}
+    if not types or types == {str}:
+        return "text"
+    if types == {bool}:
+        return "bool"
+    if types <= {int, float}:
+        return "number"
+    return "json"
+
+
+def _encode(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "bool":
+        return int(value)
+    if kind == "json":
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def _decode(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "bool":
+        return bool(value)
+    if kind == "json":
+        return json.loads(value)
+    return value
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _json_text(column: str, key: str) -> str:
+    """SQL for PostgREST's `column->>key` (JSON booleans read as 'true'/'false')."""
+    path = "'$." + _quote(key).replace("'", "''") + "'"
+    col = _quote(column)
+    return (f"CASE json_type({col}, {path}) WHEN 'true' THEN 'true' WHEN 'false' THEN 'false' "
+            f"ELSE CAST(json_extract({col}, {path}) AS TEXT) END")
+
+
+# --- export ---
+
+def write_snapshot(path: str, tables: Dict[str, Iterable[Dict]], source: str = "") -> Dict[str, Any]:
+    """Writes `tables` (rows as dicts) to a new snapshot at `path`; returns its info."""
+    tmp = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("CREATE TABLE _stellar_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE _stellar_columns (table_name TEXT, column_name TEXT, kind TEXT, position INTEGER)")
+        counts = {}
+        for table, rows in tables.items():
+            rows = sorted(rows, key=lambda r: r["id"])
+            columns = list(dict.fromkeys(c for row in rows for c in row))
+            if "id" not in columns:
+                columns.insert(0, "id")
+            kinds = {c: _kind(r.get(c) for r in rows) for c in columns}
+
+            # Untyped columns keep each value's storage class (no int/real/text coercion).
+            conn.execute(f"CREATE TABLE {_quote(table)} ({', '.join(_quote(c) for c in columns)})")
+            conn.executemany("INSERT INTO _stellar_columns VALUES (?, ?, ?, ?)",
+                             [(table, c, kinds[c], i) for i, c in enumerate(columns)])
+            placeholders = ", ".join("?" * len(columns))
+            conn.executemany(f"INSERT INTO {_quote(table)} VALUES ({placeholders})",
+                             ([_encode(kinds[c], r.get(c)) for c in columns] for r in rows))
+            conn.execute(f"CREATE UNIQUE INDEX {_quote(table + '_id_idx')} ON {_quote(table)} (\"id\")")
+            for column in INDEXES.get(table, ()):
+                base, _, key = column.partition("->>")
+                if base not in kinds or (key and kinds[base] != "json"):
+                    continue
+                expr = _json_text(base, key) if key else _quote(base)
+                name = f"{table}_{base}_{key}_idx" if key else f"{table}_{base}_idx"
+                conn.execute(f"CREATE INDEX {_quote(name)} ON {_quote(table)} ({expr})")
+            counts[table] = len(rows)
+
+        info = {
+            "format_version": FORMAT_VERSION,
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "source": source,
+            "rows": counts,
+        }
+        conn.executemany("INSERT INTO _stellar_meta VALUES (?, ?)", [(k, json.dumps(v)) for k, v in info.items()])
+        conn.execute("ANALYZE")
+        conn.commit()
+    except BaseException:
+        conn.close()
+        os.remove(tmp)
+        raise
+    conn.close()
+    os.replace(tmp, path)
+    return info
+
+
+async def export_snapshot(path: str, tables: Sequence[str] = SNAPSHOT_TABLES, log=print) -> Dict[str, Any]:
+    """Copies `tables` from Supabase into a snapshot at `path`. Tables that don't exist are skipped."""
+    from stellar_core.scan import scan_table
+
+    if enabled():
+        raise OfflineError("STELLAR_BACKEND=offline: unset it to export from Supabase.")
+    if not await get_async_supabase():
+        raise OfflineError("No Supabase credentials (SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY).")
+
+    data: Dict[str, List[Dict]] = {}
+    for table in tables:
+        start = time.perf_counter()
+        try:
+            data[table] = [row async for row in scan_table(table, "*", "offline_export")]
+        except Exception as e:
+            log(f"skipped {table}: {e}")
+            continue
+        log(f"{table}: {len(data[table]):,} rows in {time.perf_counter() - start:.1f}s")
+    if not data:
+        raise OfflineError("Nothing exported.")
+    return write_snapshot(path, data, source=os.environ.get("SUPABASE_URL", ""))
+
+
+def snapshot_info(path: str) -> Dict[str, Any]:
+    """The metadata written by write_snapshot()."""
+    return SnapshotClient(path).info
+
+
+# --- query builder ---
+
+class SnapshotResponse:
+    """Shape of postgrest's APIResponse that the tools read."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+_like_cache: Dict[Tuple[str, bool], "re.Pattern"] = {}
+
+
+def _like(pattern: Optional[str], value: Any, ignore_case: int) -> Optional[int]:
+    """SQL function for PostgREST like/ilike (SQLite's LIKE is ASCII-only case-insensitive)."""
+    if value is None or pattern is None:
+        return None
+    key = (pattern, bool(ignore_case))
+    compiled = _like_cache.get(key)
+    if compiled is None:
+        body = "".join(".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern)
+        compiled = _like_cache[key] = re.compile(f"^{body}$", re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+    return int(compiled.match(str(value)) is not None)
+
+
+_SQL_OPS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class SnapshotQuery:
+    """One builder chain: table(...).select(...).<filters>.execute()."""
+
+    def __init__(self, db: "SnapshotClient", table: str):
+        self._db = db
+        self._table = table
+        self._columns: Optional[List[str]] = None
+        self._filters: List[Tuple[str, str, Any, bool]] = []  # (op, column, value, negated)
+        self._negate = False
+        self._order: List[Tuple[str, bool, Optional[bool]]] = []
+        self._offset = 0
+        self._limit: Optional[int] = None
+        self._count: Optional[str] = None
+
+    # --- builder ---
+
+    def select(self, *columns: str, count: Optional[str] = None, **_):
+        cols = [c.strip() for c in ",".join(columns or ("*",)).split(",") if c.strip()]
+        self._columns = None if cols == ["*"] else cols
+        self._count = count
+        return self
+
+    def _filter(self, op: str, column: str, value: Any):
+        self._filters.append((op, column, value, self._negate))
+        self._negate = False
+        return self
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def eq(self, column: str, value: Any):
+        return self._filter("eq", column, value)
+
+    def neq(self, column: str, value: Any):
+        return self._filter("neq", column, value)
+
+    def gt(self, column: str, value: Any):
+        return self._filter("gt", column, value)
+
+    def gte(self, column: str, value: Any):
+        return self._filter("gte", column, value)
+
+    def lt(self, column: str, value: Any):
+        return self._filter("lt", column, value)
+
+    def lte(self, column: str, value: Any):
+        return self._filter("lte", column, value)
+
+    def in_(self, column: str, values: Iterable[Any]):
+        return self._filter("in", column, list(values))
+
+    def is_(self, column: str, value: Any):
+        return self._filter("is", column, value)
+
+    def like(self, column: str, pattern: str):
+        return self._filter("like", column, pattern)
+
+    def ilike(self, column: str, pattern: str):
+        return self._filter("ilike", column, pattern)
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **_):
+        self._order.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, **_):
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    # --- compilation ---
+
+    def _expr(self, kinds: Dict[str, str], column: str) -> Tuple[str, str]:
+        """(SQL expression, kind) for a column reference."""
+        base, _, key = column.partition("->>")
+        if base not in kinds:
+            raise OfflineError(f"column {self._table}.{base} does not exist")
+        if key:
+            if kinds[base] != "json":
+                raise OfflineError(f"column {self._table}.{base} is not JSON")
+            return _json_text(base, key), "text"
+        return _quote(base), kinds[base]
+
+    @staticmethod
+    def _value(kind: str, value: Any) -> Any:
+        """Filter value cast to the column's type (PostgREST sends text)."""
+        if value is None:
+            return None
+        if kind == "bool":
+            return int(value) if isinstance(value, bool) else int(str(value).lower() == "true")
+        if kind == "number" and not isinstance(value, (int, float)):
+            try:
+                return float(value)
+            except ValueError:
+                return value
+        if kind == "text" and not isinstance(value, str):
+            return str(value).lower() if isinstance(value, bool) else str(value)
+        if kind == "json" and not isinstance(value, str):
+            return json.dumps(value, separators=(",", ":"))
+        return value
+
+    def _where(self, kinds: Dict[str, str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for op, column, value, negated in self._filters:
+            expr, kind = self._expr(kinds, column)
+            if op in _SQL_OPS:
+                clause = f"{expr} {_SQL_OPS[op]} ?"
+                params.append(self._value(kind, value))
+            elif op == "in":
+                if value:
+                    clause = f"{expr} IN ({', '.join('?' * len(value))})"
+                    params.extend(self._value(kind, v) for v in value)
+                else:
+                    clause = f"{expr} <> {expr}"  # matches nothing; NULL stays NULL under NOT
+            elif op == "is":
+                if value in (None, "null"):
+                    clause = f"{expr} IS NULL"
+                else:
+                    clause = f"{expr} IS ?"
+                    params.append(self._value(kind, value))
+            else:
+                clause = f"stellar_like(?, {expr}, {int(op == 'ilike')})"
+                params.append(value)
+            clauses.append(f"NOT ({clause})" if negated else f"({clause})")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _sql(self) -> Tuple[str, List[Any], List[Tuple[str, str]], str, List[Any]]:
+        kinds = self._db.columns(self._table)
+        if self._columns is None:
+            selected = [(c, c) for c in kinds]
+        else:
+            selected = [(c, c.split("->>")[-1]) for c in self._columns]
+        select = ", ".join(self._expr(kinds, c)[0] for c, _ in selected)
+        where, params = self._where(kinds)
+
+        order = []
+        for column, desc, nullsfirst in self._order:
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            order.append(f"{self._expr(kinds, column)[0]} {'DESC' if desc else 'ASC'} "
+                         f"NULLS {'FIRST' if nulls_first else 'LAST'}")
+        # No order: storage order, which export made id order.
+        sql = f"SELECT {select} FROM {_quote(self._table)}{where} ORDER BY {', '.join(order) or 'rowid'}"
+        page_params = list(params)
+        if self._limit is not None or self._offset:
+            sql += " LIMIT ? OFFSET ?"
+            page_params += [-1 if self._limit is None else self._limit, self._offset]
+        return sql, page_params, selected, where, params
+
+    def _run(self) -> SnapshotResponse:
+        sql, page_params, selected, where, params = self._sql()
+        kinds = self._db.columns(self._table)
+        decoders = [kinds.get(c, "text") if "->>" not in c else "text" for c, _ in selected]
+        conn = self._db.connection()
+        rows = [
+            {name: _decode(kind, value) for (_, name), kind, value in zip(selected, decoders, raw)}
+            for raw in conn.execute(sql, page_params)
+        ]
+        count = None
+        if self._count:
+            count = conn.execute(f"SELECT COUNT(*) FROM {_quote(self._table)}{where}", params).fetchone()[0]
+        return SnapshotResponse(rows, count)
+
+    def execute(self) -> SnapshotResponse:
+        try:
+            return self._run()
+        except sqlite3.Error as e:
+            raise OfflineError(f"{self._table}: {e}") from e
+
+
+class _SnapshotRpc:
+    def __init__(self, fn: str):
+        self._fn = fn
+
+    def execute(self):
+        raise OfflineError(f"Could not find the function public.{self._fn} in the offline snapshot", "PGRST202")
+
+
+class SnapshotClient:
+    """Client object stellar_core.db returns when STELLAR_BACKEND=offline; see module docstring."""
+
+    def __init__(self, path: str, mmap_mb: Optional[float] = None):
+        if not os.path.exists(path):
+            raise OfflineError(f"No snapshot at {path}; create one with `python -m stellar_core.offline export {path}`.")
+        self.path = os.path.abspath(path)
+        self.mmap_bytes = int((mmap_mb if mmap_mb is not None else env_number("STELLAR_SNAPSHOT_MMAP_MB", 256)) * 1024 * 1024)
+        self._local = threading.local()
+        conn = self.connection()
+        self._columns: Dict[str, Dict[str, str]] = {}
+        for table, column, kind in conn.execute(
+                "SELECT table_name, column_name, kind FROM _stellar_columns ORDER BY table_name, position"):
+            self._columns.setdefault(table, {})[column] = kind
+        self.info = {k: json.loads(v) for k, v in conn.execute("SELECT key, value FROM _stellar_meta")}
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's read-only connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+                conn.execute(f"PRAGMA mmap_size={self.mmap_bytes}")
+                conn.execute("PRAGMA query_only=1")
+            except sqlite3.Error as e:
+                raise OfflineError(f"Cannot open snapshot {self.path}: {e}") from e
+            conn.create_function("stellar_like", 3, _like, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def columns(self, table: str) -> Dict[str, str]:
+        """Column -> kind for `table`, in export order."""
+        try:
+            return self._columns[table]
+        except KeyError:
+            raise OfflineError(f'relation "public.{table}" is not in the offline snapshot') from None
+
+    def table(self, name: str) -> SnapshotQuery:
+        return SnapshotQuery(self, name)
+
+    def rpc(self, fn: str, params: Dict = None) -> _SnapshotRpc:
+        return _SnapshotRpc(fn)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(prog="python -m stellar_core.offline", description="Offline snapshot of the swarm's tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="copy tables from Supabase into a snapshot file")
+    export.add_argument("path", nargs="?", default=None, help=f"snapshot file (default $STELLAR_SNAPSHOT or {DEFAULT_PATH})")
+    export.add_argument("--tables", default=",".join(SNAPSHOT_TABLES), help="comma list of tables")
+    info = commands.add_parser("info", help="show a snapshot's metadata")
+    info.add_argument("path", nargs="?", default=None)
+    args = parser.parse_args(argv)
+    path = args.path or snapshot_path()
+
+    try:
+        if args.command == "export":
+            from stellar_core.config import load_env
+
+            load_env()
+            tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+            result = asyncio.run(export_snapshot(path, tables))
+            print(f"Wrote {path}")
+        else:
+            result = snapshot_info(path)
+    except OfflineError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
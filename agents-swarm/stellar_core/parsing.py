@@ -0,0 +1,47 @@
+"""
+Parsers for the loosely-typed values stored in Supabase.
+"""
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def parse_currency(value: Any) -> float:
+    """'$1,234.50' / '45' / 45 -> float. Empty or unparseable -> 0.0."""
+    if not value: return 0.0
+    if isinstance(value, (int, float)): return float(value)
+    digits = ''.join(c for c in str(value) if c.isdigit() or c == '.')
+    try:
+        return float(digits)
+    except ValueError:
+        return 0.0
+
+
+def today_ordinal() -> int:
+    """Today's UTC date as a proleptic ordinal (the unit iso_day() returns)."""
+    return datetime.now(timezone.utc).date().toordinal()
+
+
+def iso_day(value: Any) -> Optional[int]:
+    """
+    'YYYY-MM-DD' or an ISO timestamp (any offset, or 'Z') -> UTC day ordinal.
+    None for empty or unparseable values.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        if len(value) <= 10:
+            return date.fromisoformat(value).toordinal()
+        return datetime.fromisoformat(value).astimezone(timezone.utc).date().toordinal()
+    except ValueError:
+        return None
+
+
+def iso_days(values: Iterable[Any]) -> List[Optional[int]]:
+    """iso_day() over a column; repeated stamps (common for dates) are parsed once."""
+    seen: Dict[Any, Optional[int]] = {}
+    out = []
+    for v in values:
+        if v not in seen:
+            seen[v] = iso_day(v)
+        out.append(seen[v])
+    return out
@@ -0,0 +1,140 @@
+"""
+Column projection registry.
+
+Each tool declares the columns it reads, per table. Query builders select only
+those columns (snapshots select the union across tools), so the `compliance`
+JSON and long profile fields only travel when someone actually needs them.
+
+Tools working on stellar_core.candidate.Candidate records declare the columns
+behind the record attributes they read (candidate.SOURCES), not the whole
+record: the shared records are built from the `candidate_record` union.
+
+Set STELLAR_STRICT_COLUMNS=1 (dev / CI runs) to hand tools guarded rows and
+records that raise UndeclaredColumnError on any read outside their declaration.
+tests/test_projections.py runs every tool this way against the bench's
+LocalSupabase.
+"""
+import os
+from typing import Dict, Iterable, List, Tuple
+
+# Fields read to build a stellar_core.candidate.Candidate record (every attribute).
+CANDIDATE_RECORD = (
+    "id", "updated_at", "first_name", "last_name", "role", "status", "suburb", "state",
+    "pay_rate", "charge_out_rate", "guaranteed_hours", "current_project", "residency", "compliance",
+)
+
+# Finance ledger / placement book: names, status, rates, client, guaranteed hours.
+FINANCE_RECORD = (
+    "id", "updated_at", "first_name", "last_name", "status",
+    "pay_rate", "charge_out_rate", "current_project", "guaranteed_hours",
+)
+
+# Candidate.as_dict() payload plus status/region filters (Candidate Manager).
+ENRICHED_CANDIDATE = (
+    "id", "updated_at", "first_name", "last_name", "role", "status", "suburb", "state",
+    "pay_rate", "charge_out_rate", "residency", "compliance",
+)
+
+TOOL_COLUMNS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "candidates": {
+        # Shared Candidate records (stellar_core.candidate)
+        "candidate_record": CANDIDATE_RECORD,
+        # Accountant (the ledger serves health and liability together)
+        "get_financial_health": FINANCE_RECORD,
+        "get_bench_liability": FINANCE_RECORD,
+        "run_margin_scenarios": ("id", "updated_at", "first_name", "last_name", "status",
+                                 "pay_rate", "charge_out_rate", "current_project"),
+        # Candidate Manager
+        "search_talent": ENRICHED_CANDIDATE,
+        "get_bench_strength": ENRICHED_CANDIDATE,
+        "generate_squads": ENRICHED_CANDIDATE,
+        # Shared role/trade search index (stellar_core.talent_index)
+        "talent_index": ("id", "role", "trade", "status"),
+        # Immigration
+        "check_visa_risks": ("id", "updated_at", "first_name", "last_name", "visa_expiry", "compliance"),
+        # Systems IT
+        "audit_data_quality": ("id", "updated_at", "first_name", "last_name", "phone", "email"),
+        # GM legacy tools (stellar_gm/tools)
+        "gm_search_talent": ("id", "updated_at", "first_name", "last_name", "role", "status", "residency", "suburb"),
+        "gm_get_financial_health": ("first_name", "last_name", "status", "pay_rate", "charge_out_rate", "current_project"),
+    },
+    "clients": {
+        "search_clients": (
+            "id", "name", "industry", "tier", "region", "status",
+            "phone", "email", "active_jobs", "last_contact",
+        ),
+        "get_golden_hour_list": ("id", "name", "tier", "last_contact"),
+        # Squad-to-demand matcher (stellar_core.demand)
+        "demand_book": (
+            "id", "name", "industry", "tier", "region", "status",
+            "phone", "email", "active_jobs", "last_contact",
+        ),
+    },
+    "market_tenders": {
+        "get_golden_hour_list": ("id", "title", "client", "main_contractor", "status", "value", "closing_date"),
+        "demand_book": ("id", "title", "client", "main_contractor", "status", "value", "closing_date"),
+    },
+}
+
+# Always fetched into snapshots: row identity and change tracking.
+SNAPSHOT_KEYS = ("id", "updated_at")
+
+
+class UndeclaredColumnError(KeyError):
+    """A tool read a column missing from its TOOL_COLUMNS entry."""
+
+
+def columns_for(table: str, tool: str) -> Tuple[str, ...]:
+    try:
+        return TOOL_COLUMNS[table][tool]
+    except KeyError:
+        raise KeyError(f"No column projection registered for {table}.{tool}") from None
+
+
+def select_clause(table: str, tool: str) -> str:
+    """Comma-separated PostgREST select list for one tool."""
+    return ",".join(columns_for(table, tool))
+
+
+def snapshot_columns(table: str) -> str:
+    """Union of every tool's columns for `table` (plus id/updated_at), or '*' if unregistered."""
+    tools = TOOL_COLUMNS.get(table)
+    if not tools:
+        return "*"
+    cols = list(SNAPSHOT_KEYS)
+    for declared in tools.values():
+        cols.extend(c for c in declared if c not in cols)
+    return ",".join(cols)
+
+
+def strict_mode() -> bool:
+    return os.environ.get("STELLAR_STRICT_COLUMNS", "").lower() in ("1", "true", "yes")
+
+
+class StrictRow(dict):
+    """Row restricted to a tool's declared columns; any other read raises."""
+
+    def __init__(self, table: str, tool: str, declared: Iterable[str], row: Dict):
+        super().__init__((c, row.get(c)) for c in declared)
+        self._where = f"{table}.{tool}"
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise UndeclaredColumnError(f"{self._where} read undeclared column '{key}'")
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key not in self:
+            raise UndeclaredColumnError(f"{self._where} read undeclared column '{key}'")
+        return super().get(key, default)
+
+
+def project(table: str, tool: str, rows: List[Dict]) -> List[Dict]:
+    """
+    Enforces the registry on rows handed to a tool. Outside strict mode this
+    only validates the declaration exists and returns the rows untouched.
+    """
+    declared = columns_for(table, tool)
+    if not strict_mode():
+        return rows
+    return [StrictRow(table, tool, declared, r) for r in rows]
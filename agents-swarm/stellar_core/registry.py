@@ -0,0 +1,219 @@
+"""
+Lazy tool registry.
+
+Agents used to import every tools module up front. The GM alone imported all
+six packages, and with them supabase, httpx and numpy, before `adk web` could
+serve anything. lazy_tools() builds the tool declarations from the tools
+module's source instead (parsed with `ast`, not imported), so the model sees
+the same name, signature and docstring. The module itself is imported the
+first time the tool is called, or earlier by prewarm().
+
+A tool whose signature can't be rebuilt from source (annotations outside
+typing/builtins, non-literal defaults, *args) falls back to an eager import,
+so correctness never depends on the parser.
+
+Each agent.py ends with agent_ready(), which records the package's startup
+time (stellar_core.startup) and starts the background prewarm:
+
+STELLAR_PREWARM:
+    off      nothing; modules load on first call
+    imports  import every registered tools module on a background thread (default)
+    data     imports, then load the candidate snapshot and its records (once)
+"""
+import ast
+import importlib
+import importlib.util
+import inspect
+import os
+import threading
+import time
+import typing
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from stellar_core import startup
+from stellar_core.memo import with_tool_context
+
+# Names tool annotations may use; anything else means "import eagerly".
+_ANNOTATION_NAMES = {name: getattr(typing, name) for name in ("Any", "Dict", "List", "Optional", "Tuple", "Union")}
+_ANNOTATION_NAMES.update({t.__name__: t for t in (bool, dict, float, int, list, str)})
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _annotation(node: Optional[ast.expr]) -> Any:
+    if node is None:
+        return inspect.Parameter.empty
+    try:
+        return eval(compile(ast.Expression(node), "<annotation>", "eval"), {"__builtins__": {}}, dict(_ANNOTATION_NAMES))
+    except Exception:
+        raise _Unsupported(ast.unparse(node)) from None
+
+
+def _default(node: Optional[ast.expr]) -> Any:
+    if node is None:
+        return inspect.Parameter.empty
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise _Unsupported(ast.unparse(node)) from None
+
+
+def _declaration(fn: ast.AsyncFunctionDef) -> Tuple[inspect.Signature, Dict[str, Any], Optional[str]]:
+    """(signature, __annotations__, raw docstring) of one async def, from source."""
+    args = fn.args
+    if args.vararg or args.kwarg or args.posonlyargs:
+        raise _Unsupported("*args/**kwargs/positional-only")
+    defaults = [None] * (len(args.args) - len(args.defaults)) + list(args.defaults)
+    params = []
+    annotations: Dict[str, Any] = {}
+    for kind, arg_nodes, arg_defaults in (
+        (inspect.Parameter.POSITIONAL_OR_KEYWORD, args.args, defaults),
+        (inspect.Parameter.KEYWORD_ONLY, args.kwonlyargs, args.kw_defaults),
+    ):
+        for arg, default in zip(arg_nodes, arg_defaults):
+            annotation = _annotation(arg.annotation)
+            if annotation is not inspect.Parameter.empty:
+                annotations[arg.arg] = annotation
+            params.append(inspect.Parameter(arg.arg, kind, default=_default(default), annotation=annotation))
+    returns = _annotation(fn.returns)
+    if returns is not inspect.Parameter.empty:
+        annotations["return"] = returns
+    return inspect.Signature(params, return_annotation=returns), annotations, ast.get_docstring(fn, clean=False)
+
+
+_sources: Dict[str, Dict[str, ast.AsyncFunctionDef]] = {}
+_sources_lock = threading.Lock()
+
+
+def _module_functions(module: str) -> Dict[str, ast.AsyncFunctionDef]:
+    """Top-level async defs of `module`, parsed (not imported) once per process."""
+    with _sources_lock:
+        found = _sources.get(module)
+        if found is None:
+            spec = importlib.util.find_spec(module)
+            if spec is None or not spec.origin:
+                raise ImportError(f"No source for tools module {module}")
+            with open(spec.origin, encoding="utf-8") as f:
+                tree = ast.parse(f.read(), spec.origin)
+            found = _sources[module] = {n.name: n for n in tree.body if isinstance(n, ast.AsyncFunctionDef)}
+        return found
+
+
+def tool_name(fn_name: str) -> str:
+    return fn_name[:-len("_async")] if fn_name.endswith("_async") else fn_name
+
+
+class LazyTool:
+    """One registered tool: declaration up front, implementation on first use."""
+
+    def __init__(self, module: str, fn_name: str):
+        self.module = module
+        self.fn_name = fn_name
+        self.name = tool_name(fn_name)
+        self._impl: Optional[Callable[..., Awaitable[Any]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._impl is not None
+
+    def load(self) -> Callable[..., Awaitable[Any]]:
+        """Imports the tools module (once) and returns the instrumented tool."""
+        if self._impl is None:
+            with self._lock:
+                if self._impl is None:
+                    from stellar_core.aio import as_tool
+
+                    start = time.perf_counter()
+                    fn = getattr(importlib.import_module(self.module), self.fn_name)
+                    self._impl = as_tool(fn)
+                    startup.record_tool_load(self.name, self.module, time.perf_counter() - start)
+        return self._impl
+
+    def declare(self) -> Callable[..., Awaitable[Any]]:
+        """The function handed to the Agent: real name/signature/docstring, lazy body."""
+        node = _module_functions(self.module).get(self.fn_name)
+        if node is None:
+            raise AttributeError(f"{self.module} has no async def {self.fn_name}")
+        try:
+            signature, annotations, doc = _declaration(node)
+        except _Unsupported:
+            return self.load()
+
+        async def tool(*args, **kwargs):
+            return await self.load()(*args, **kwargs)
+
+        tool.__name__ = tool.__qualname__ = self.name
+        tool.__doc__ = doc
+        tool.__module__ = self.module
+        tool.__signature__ = with_tool_context(signature)
+        tool.__annotations__ = annotations
+        tool.lazy_tool = self
+        return tool
+
+
+_registry: Dict[Tuple[str, str], LazyTool] = {}
+_registry_lock = threading.Lock()
+
+
+def lazy_tools(module: str, *fn_names: str) -> List[Callable[..., Awaitable[Any]]]:
+    """Declarations for `module`'s async tools (e.g. "get_bench_strength_async"), imported on first call."""
+    out = []
+    for fn_name in fn_names:
+        with _registry_lock:
+            entry = _registry.setdefault((module, fn_name), LazyTool(module, fn_name))
+        out.append(entry.declare())
+    return out
+
+
+def registered_tools() -> List[LazyTool]:
+    with _registry_lock:
+        return list(_registry.values())
+
+
+def prewarm_mode() -> str:
+    mode = (os.environ.get("STELLAR_PREWARM") or "imports").lower()
+    return mode if mode in ("off", "imports", "data") else "imports"
+
+
+_data_warmed = False
+
+
+def _prewarm(mode: str) -> None:
+    global _data_warmed
+    for entry in registered_tools():
+        try:
+            entry.load()
+        except Exception as e:
+            print(f"WARNING: prewarm could not load {entry.name}: {e}")
+    with _registry_lock:
+        warm_data = mode == "data" and not _data_warmed
+        _data_warmed = _data_warmed or warm_data
+    if warm_data:
+        try:
+            from stellar_core.aio import run_sync
+            from stellar_core.candidate import get_candidate_records
+
+            run_sync(get_candidate_records("candidate_record"))
+        except Exception as e:
+            print(f"WARNING: prewarm could not load the candidate snapshot: {e}")
+
+
+def prewarm(mode: Optional[str] = None) -> Optional[threading.Thread]:
+    """Loads every registered tool not yet loaded on a background thread (None when off)."""
+    mode = mode or prewarm_mode()
+    if mode == "off":
+        return None
+    thread = threading.Thread(target=_prewarm, args=(mode,), name="stellar-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def agent_ready(package: str, tools: List[Any]) -> Dict:
+    """End of an agent.py: records startup time for `package` and starts the prewarm."""
+    pending = sum(1 for t in tools if getattr(t, "lazy_tool", None) is not None and not t.lazy_tool.loaded)
+    report = startup.agent_ready(package, len(tools), pending)
+    prewarm()
+    return report
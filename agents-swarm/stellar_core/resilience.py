@@ -0,0 +1,336 @@
+"""
+Single-flight, retries and a circuit breaker for database reads.
+
+Every query the tools make goes through stellar_core.db.aexecute(), which
+hands it to Resilience:
+
+Single-flight: identical reads in flight at the same moment (several `adk web`
+sessions asking for the bench at once, snapshot reloads on different event
+loops) share one network call. Identity is query_key(): method, path, params
+and body of a PostgREST request, or request_key() on a local stand-in. Every
+caller gets the same response, so its rows are shared: treat them as
+read-only, as with snapshot rows.
+
+Retries: transient failures (is_transient(): network errors and timeouts,
+HTTP 408 / 429 / 5xx, Postgres connection, resource and statement-timeout
+codes) are retried up to SUPABASE_RETRIES times (default 2) after a jittered
+exponential backoff of SUPABASE_RETRY_BASE seconds (0.2) doubling per attempt,
+capped at SUPABASE_RETRY_MAX (2). postgrest's own retry (503 / 520 only,
+sleeping up to 30 s) is switched off so there is one bounded policy. Any other
+error (unknown column, missing rpc) is raised straight away.
+
+Circuit breaker: SUPABASE_BREAKER_FAILURES (default 5) transient failures in a
+row open it, and reads fail fast for SUPABASE_BREAKER_COOLDOWN seconds (30).
+Then one trial read goes through; success closes the breaker, failure re-opens it.
+
+Last-known-good: successful stale_ok reads are kept per query key (LRU, at
+most SUPABASE_STALE_ROWS rows in all, default 50000). While the breaker is
+open, or once retries run out, a read with a kept response is answered from
+it; the tool call is flagged stale in telemetry and not memoized. With nothing
+kept, BackendUnavailable is raised. Views that keep their own copy (table
+snapshots, the expiry calendar, the demand book, the Golden Hour board) read
+with stale_ok=False: their pages are not kept here, and they keep serving what
+they hold when a reload fails.
+
+Reads are GET / HEAD requests and rpc calls (the swarm's rpcs are read-only
+aggregations). Anything else is passed straight through.
+
+describe() turns these errors into the message a tool hands the model.
+stellar_bench.faults wraps a local client with injected failures to exercise
+all of this without a network.
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+from stellar_core.db import env_number
+
+# Postgres SQLSTATE prefixes worth retrying: connection exceptions, insufficient
+# resources, operator intervention (incl. statement timeout), serialization
+# failures; PGRST000-003 are PostgREST losing its database connection.
+TRANSIENT_SQLSTATES = ("08", "53", "57", "40001", "40P01", "PGRST000", "PGRST001", "PGRST002", "PGRST003")
+# PostgREST "function not in the schema cache" and Postgres undefined_function.
+MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+UNAVAILABLE_MESSAGE = "Database temporarily unavailable; try again shortly."
+
+
+class BackendUnavailable(RuntimeError):
+    """The database can't be reached right now and there is no last-known-good copy of the data."""
+
+
+class _Abandoned(Exception):
+    """The leader of a shared query was cancelled; followers run it themselves."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for failures a retry (or a later call) can fix."""
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if getattr(exc, "transient", False):
+        return True
+    code = getattr(exc, "code", None)
+    if code is None:
+        return False
+    code = str(code)
+    if code.isdigit() and len(code) == 3:
+        return code in ("408", "429") or code.startswith("5")
+    return code.startswith(TRANSIENT_SQLSTATES)
+
+
+def missing_function(exc: BaseException) -> bool:
+    """An rpc the database doesn't define (e.g. its migration isn't applied)."""
+    return str(getattr(exc, "code", None)) in MISSING_FUNCTION_CODES
+
+
+def unreachable(exc: BaseException) -> bool:
+    """The database couldn't be reached (as opposed to rejecting the query)."""
+    return isinstance(exc, BackendUnavailable) or is_transient(exc)
+
+
+def describe(exc: BaseException) -> str:
+    """Message for a tool's error result: plain words for outages, the error text otherwise."""
+    if unreachable(exc):
+        return UNAVAILABLE_MESSAGE
+    return str(exc)
+
+
+def query_key(query: Any) -> Optional[Tuple]:
+    """Identity of a read query for coalescing and last-known-good; None = not a read."""
+    request = getattr(query, "request", None)
+    if request is not None and hasattr(request, "http_method"):
+        method, path = request.http_method, str(request.path)
+        if method not in ("GET", "HEAD") and "rpc/" not in path:
+            return None
+        body = json.dumps(request.json, sort_keys=True, default=str) if request.json is not None else None
+        return (method, path, str(request.params), body,
+                request.headers.get("Accept"), request.headers.get("Prefer"))
+    request_key = getattr(query, "request_key", None)
+    return ("local", request_key()) if callable(request_key) else None
+
+
+def _rows(response: Any) -> int:
+    data = getattr(response, "data", None)
+    return len(data) if isinstance(data, list) else 1
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` failures in a row -> half-open after `cooldown` s."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._trial_at: Optional[float] = None  # half-open trial in flight since
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        May a request go to the network now? Half-open lets one trial through
+        (another after `cooldown`, in case the first never reported back).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if now - self.opened_at < self.cooldown:
+                    return False
+                self.state = "half_open"
+            if self._trial_at is not None and now - self._trial_at < self.cooldown:
+                return False
+            self._trial_at = now
+            return True
+
+    def success(self) -> None:
+        with self._lock:
+            self.state, self.failures, self._trial_at = "closed", 0, None
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_at = None
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+                if self.state == "closed":
+                    print(f"WARNING: database circuit breaker opened after {self.failures} failures in a row.")
+                    self.opens += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class Resilience:
+    """Process-wide read policy; see module docstring."""
+
+    def __init__(self, retries: int = None, base_delay: float = None, max_delay: float = None,
+                 breaker_failures: int = None, cooldown: float = None, stale_rows: int = None):
+        self.retries = int(retries if retries is not None else env_number("SUPABASE_RETRIES", 2))
+        self.base_delay = base_delay if base_delay is not None else env_number("SUPABASE_RETRY_BASE", 0.2)
+        self.max_delay = max_delay if max_delay is not None else env_number("SUPABASE_RETRY_MAX", 2)
+        self.stale_rows = int(stale_rows if stale_rows is not None else env_number("SUPABASE_STALE_ROWS", 50000))
+        self.breaker = CircuitBreaker(
+            int(breaker_failures if breaker_failures is not None else env_number("SUPABASE_BREAKER_FAILURES", 5)),
+            cooldown if cooldown is not None else env_number("SUPABASE_BREAKER_COOLDOWN", 30),
+        )
+        self._flights: Dict[Hashable, concurrent.futures.Future] = {}
+        self._good: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._good_rows = 0
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "coalesced": 0, "retries": 0, "fast_fails": 0, "stale": 0, "unavailable": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number `attempt` (1-based): full jitter under the capped exponential."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    # --- last-known-good ---
+
+    def _remember(self, key: Hashable, response: Any) -> None:
+        rows = _rows(response)
+        if rows > self.stale_rows:
+            return
+        with self._lock:
+            old = self._good.pop(key, None)
+            if old is not None:
+                self._good_rows -= old[1]
+            self._good[key] = (response, rows)
+            self._good_rows += rows
+            while self._good_rows > self.stale_rows:
+                _, (_, dropped) = self._good.popitem(last=False)
+                self._good_rows -= dropped
+
+    def _fallback(self, key: Hashable, error: BackendUnavailable, stale_ok: bool) -> Tuple[Any, str]:
+        """(last-known-good response, "stale") for `key`, or re-raise `error`."""
+        with self._lock:
+            kept = self._good.get(key) if stale_ok else None
+        if kept is None:
+            self._count("unavailable")
+            raise error
+        self._count("stale")
+        return kept[0], "stale"
+
+    # --- the read path ---
+
+    def _prepare(self, query: Any) -> Optional[Tuple]:
+        key = query_key(query)
+        if key is not None and hasattr(getattr(query, "request", None), "retry_enabled"):
+            query.request.retry_enabled = False  # ours replaces postgrest's retry
+        self._count("calls")
+        return key
+
+    def _failed(self, exc: Exception, attempt: int) -> None:
+        """Books a failed attempt; re-raises unless another try is worth it."""
+        if not is_transient(exc):
+            self.breaker.success()  # the database answered; the query itself is wrong
+            raise exc
+        self.breaker.failure()
+        if attempt > self.retries:
+            raise BackendUnavailable(UNAVAILABLE_MESSAGE) from exc
+        self._count("retries")
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            self._count("fast_fails")
+            raise BackendUnavailable(UNAVAILABLE_MESSAGE)
+
+    def _succeeded(self, key: Hashable, response: Any, stale_ok: bool) -> Any:
+        self.breaker.success()
+        if stale_ok:  # stale_ok=False callers keep their own copy
+            self._remember(key, response)
+        return response
+
+    async def arun(self, query: Any, send: Callable[[Any], Any], stale_ok: bool = True) -> Tuple[Any, str]:
+        """
+        (response, source) for `query`; source is "network", "shared" (joined an
+        identical call in flight) or "stale" (last-known-good, only if `stale_ok`).
+        `send(query)` performs one attempt and may return an awaitable.
+        """
+        key = self._prepare(query)
+        if key is None:
+            response = send(query)
+            return (await response if inspect.isawaitable(response) else response), "network"
+        try:
+            return await self._flight(key, query, send, stale_ok)
+        except BackendUnavailable as e:
+            return self._fallback(key, e, stale_ok)
+
+    async def _flight(self, key: Hashable, query: Any, send: Callable[[Any], Any], stale_ok: bool) -> Tuple[Any, str]:
+        """Joins the identical call in flight, or becomes it."""
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = concurrent.futures.Future()
+                    break
+            self._count("coalesced")
+            try:
+                return await asyncio.shield(asyncio.wrap_future(flight)), "shared"
+            except _Abandoned:
+                continue
+
+        try:
+            response = await self._attempts(key, query, send, stale_ok)
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        except BaseException:
+            flight.set_exception(_Abandoned())
+            raise
+        else:
+            flight.set_result(response)
+            return response, "network"
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    async def _attempts(self, key: Hashable, query: Any, send: Callable[[Any], Any], stale_ok: bool) -> Any:
+        attempt = 0
+        while True:
+            attempt += 1
+            self._admit()
+            try:
+                response = send(query)
+                if inspect.isawaitable(response):
+                    response = await response
+            except Exception as e:
+                self._failed(e, attempt)
+                await asyncio.sleep(self.delay(attempt))
+                continue
+            return self._succeeded(key, response, stale_ok)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "breaker": self.breaker.state,
+                "breaker_opens": self.breaker.opens,
+                "stale_entries": len(self._good),
+                "stale_rows": self._good_rows,
+                **self.counters,
+            }
+
+
+_resilience: Optional[Resilience] = None
+_resilience_lock = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """Process-wide policy, built on first use so .env has been loaded by then."""
+    global _resilience
+    if _resilience is None:
+        with _resilience_lock:
+            if _resilience is None:
+                _resilience = Resilience()
+    return _resilience
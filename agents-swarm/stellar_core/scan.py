@@ -0,0 +1,66 @@
+"""
+Keyset-paginated table scans.
+
+PostgREST caps every response (1000 rows by default on Supabase), so a single
+`select` silently truncates big tables. scan_table() walks the table in `id`
+order one page at a time (`id > last_id`, never OFFSET) and yields rows as they
+arrive, so callers hold one page in memory regardless of table size.
+
+Both are async generators on the async client: `async for row in scan_table(...)`.
+"""
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from stellar_core.db import aexecute, get_async_supabase
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+async def scan_pages(
+    table: str,
+    columns: str,
+    label: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    since: Optional[str] = None,
+    where: Optional[Callable[[Any], Any]] = None,
+    stale_ok: bool = True,
+) -> AsyncIterator[List[Dict]]:
+    """
+    Yields `table` one page (list of rows) at a time. `columns` must include `id`.
+    With `since`, only rows whose `updated_at` is later than it. `where` adds
+    extra server-side filters (takes and returns the query builder).
+    `stale_ok=False`: no last-known-good pages during an outage (see db.aexecute).
+    """
+    sb = await get_async_supabase()
+    if not sb:
+        raise RuntimeError("DB Connection Failed")
+
+    last_id = None
+    while True:
+        query = sb.table(table).select(columns)
+        if since:
+            query = query.gt("updated_at", since)
+        if where:
+            query = where(query)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = (await aexecute(query.order("id").limit(page_size), label, stale_ok)).data
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
+
+
+async def scan_table(
+    table: str,
+    columns: str,
+    label: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    since: Optional[str] = None,
+    where: Optional[Callable[[Any], Any]] = None,
+    stale_ok: bool = True,
+) -> AsyncIterator[Dict]:
+    """Row-at-a-time view over scan_pages()."""
+    async for page in scan_pages(table, columns, label, page_size, since, where, stale_ok):
+        for row in page:
+            yield row
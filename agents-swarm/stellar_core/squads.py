@@ -0,0 +1,105 @@
+"""
+Squad assembly engine.
+
+Given enriched candidates (is_senior / is_mobile / charge_rate), builds squads of
+a fixed composition that maximise total charge-out revenue, with at least one
+mobile member (the 'Ute') per squad.
+
+Revenue is additive per member, so the optimum is: build as many squads as the
+mobility constraint allows, fill them with the highest-charge people, then make
+the cheapest swaps (non-mobile out, mobile in) until every squad can carry a
+mobile member. Everything is sort + linear scans, O(n log n) per region.
+"""
+from typing import Dict, List, Tuple
+
+
+def _max_squads(seniors: List[Dict], juniors: List[Dict], n_seniors: int, n_juniors: int) -> int:
+    mobile_s = sum(1 for c in seniors if c["is_mobile"])
+    mobile_j = sum(1 for c in juniors if c["is_mobile"])
+    k = len(seniors) // n_seniors
+    if n_juniors:
+        k = min(k, len(juniors) // n_juniors)
+    # Each squad needs a mobile member, and mobiles only fit in the slots we have.
+    while k > 0 and min(mobile_s, k * n_seniors) + min(mobile_j, k * n_juniors) < k:
+        k -= 1
+    return k
+
+
+def _swap_costs(pool: List[Dict], picked: int) -> List[Tuple[float, int, int]]:
+    """
+    Cheapest-first swaps for one pool (sorted by charge desc, first `picked` taken):
+    (revenue lost, index dropped, index added).
+    """
+    drop = [i for i in range(picked - 1, -1, -1) if not pool[i]["is_mobile"]]
+    add = [i for i in range(picked, len(pool)) if pool[i]["is_mobile"]]
+    return [(pool[d]["charge_rate"] - pool[a]["charge_rate"], d, a) for d, a in zip(drop, add)]
+
+
+def _pick(seniors: List[Dict], juniors: List[Dict], k: int, n_seniors: int, n_juniors: int):
+    picked_s = set(range(k * n_seniors))
+    picked_j = set(range(k * n_juniors))
+    need = k - sum(1 for i in picked_s if seniors[i]["is_mobile"]) - sum(1 for i in picked_j if juniors[i]["is_mobile"])
+
+    if need > 0:
+        swaps_s = _swap_costs(seniors, k * n_seniors)
+        swaps_j = _swap_costs(juniors, k * n_juniors)
+        si = ji = 0
+        while need > 0:
+            take_s = ji >= len(swaps_j) or (si < len(swaps_s) and swaps_s[si][0] <= swaps_j[ji][0])
+            if take_s:
+                _, d, a = swaps_s[si]; si += 1
+                picked_s.discard(d); picked_s.add(a)
+            else:
+                _, d, a = swaps_j[ji]; ji += 1
+                picked_j.discard(d); picked_j.add(a)
+            need -= 1
+
+    return [seniors[i] for i in sorted(picked_s)], [juniors[i] for i in sorted(picked_j)]
+
+
+def _distribute(members: List[Dict], squads: List[List[Dict]], slots: int) -> int:
+    """
+    Places mobile members one per squad (in list order), then fills the remaining
+    slots. Returns how many squads got a mobile member.
+    """
+    covered = 0
+    rest = []
+    for c in members:
+        if c["is_mobile"] and covered < len(squads):
+            squads[covered].append(c)
+            covered += 1
+        else:
+            rest.append(c)
+    i = 0
+    for c in rest:
+        while len(squads[i]) >= slots:
+            i += 1
+        squads[i].append(c)
+    return covered
+
+
+def assemble_squads(candidates: List[Dict], n_seniors: int = 1, n_juniors: int = 2) -> List[Tuple[List[Dict], List[Dict]]]:
+    """
+    Optimal squads for one region's pool. Returns (seniors, juniors) per squad,
+    highest-revenue squads first. Members not placed are simply left out.
+    """
+    if n_seniors < 1 or n_juniors < 0:
+        return []
+    by_charge = lambda c: -c["charge_rate"]
+    seniors = sorted((c for c in candidates if c["is_senior"]), key=by_charge)
+    juniors = sorted((c for c in candidates if not c["is_senior"]), key=by_charge) if n_juniors else []
+
+    k = _max_squads(seniors, juniors, n_seniors, n_juniors)
+    if k == 0:
+        return []
+
+    picked_s, picked_j = _pick(seniors, juniors, k, n_seniors, n_juniors)
+    senior_slots = [[] for _ in range(k)]
+    junior_slots = [[] for _ in range(k)]
+    covered = _distribute(picked_s, senior_slots, n_seniors)
+    # Squads still without a mobile senior get a mobile junior first.
+    _distribute(picked_j, junior_slots[covered:] + junior_slots[:covered], n_juniors)
+
+    squads = list(zip(senior_slots, junior_slots))
+    squads.sort(key=lambda sq: -sum(c["charge_rate"] for c in sq[0] + sq[1]))
+    return squads
@@ -0,0 +1,74 @@
+"""
+Cold-start timing per agent package.
+
+Each agent package's __init__ calls package_started() and its agent.py ends
+with stellar_core.registry.agent_ready(); in between are the package's
+imports (google-adk, .env) and building the Agent. First-call tool loads
+(stellar_core.registry) are recorded too, since with lazy tools that is where
+module imports now happen.
+
+startup_report() returns everything recorded. Each ready agent also:
+    - prints one `[startup]` line (set STELLAR_STARTUP_REPORT=0 to silence),
+    - appends a JSON line to STELLAR_TELEMETRY_FILE when set,
+    - is exported as stellar_agent_startup_seconds by telemetry.prometheus_text().
+
+Standard library only, so timing starts before anything heavy is imported.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+_lock = threading.Lock()
+_packages: Dict[str, Dict] = {}
+_tool_loads: Dict[str, Dict] = {}
+
+
+def package_started(package: str) -> None:
+    with _lock:
+        _packages.setdefault(package, {"started": time.perf_counter(), "started_at": time.time()})
+
+
+def agent_ready(package: str, tools: int = 0, lazy_tools: int = 0) -> Dict:
+    """Marks `package`'s agent as built; returns its startup record."""
+    now = time.perf_counter()
+    with _lock:
+        rec = _packages.setdefault(package, {"started": now, "started_at": time.time()})
+        if "ready_ms" in rec:
+            return _public(package, rec)
+        rec["ready_ms"] = round((now - rec["started"]) * 1000, 2)
+        rec["tools"] = tools
+        rec["lazy_tools"] = lazy_tools
+        report = _public(package, rec)
+
+    if os.environ.get("STELLAR_STARTUP_REPORT", "1").lower() not in ("0", "false", "no"):
+        print(f"[startup] {package} ready in {report['ready_ms']:.1f} ms "
+              f"({tools} tools, {lazy_tools} loaded on first call)")
+    from stellar_core import telemetry
+
+    telemetry.emit({"event": "agent_startup", **report})
+    return report
+
+
+def record_tool_load(tool: str, module: str, seconds: float) -> None:
+    """A lazy tool's module was imported (first call or prewarm)."""
+    with _lock:
+        _tool_loads[tool] = {"module": module, "load_ms": round(seconds * 1000, 2), "loaded_at": time.time()}
+
+
+def _public(package: str, rec: Dict) -> Dict:
+    return {
+        "package": package,
+        "started_at": rec["started_at"],
+        "ready_ms": rec.get("ready_ms"),
+        "tools": rec.get("tools", 0),
+        "lazy_tools": rec.get("lazy_tools", 0),
+    }
+
+
+def startup_report(package: Optional[str] = None) -> Dict:
+    """{"agents": {package: record}, "tool_loads": {tool: record}} (one package if given)."""
+    with _lock:
+        agents = {p: _public(p, r) for p, r in _packages.items() if "ready_ms" in r and package in (None, p)}
+        loads = {t: dict(r) for t, r in _tool_loads.items()}
+    return {"agents": agents, "tool_loads": loads}
@@ -0,0 +1,232 @@
+"""
+In-memory role/trade search index over the candidate snapshot.
+
+Rosters are large but job titles are not: a six-figure roster has a few hundred
+distinct role/trade texts. The index therefore scores *texts*, then reads
+candidate ids straight out of each text's per-status bucket:
+
+    text  -> status -> candidate ids (insertion ordered)
+    term  -> texts containing it
+    trigram -> vocabulary terms (for fuzzy matching)
+
+A query token matches a vocabulary term exactly, as a substring ("carp" ->
+carpenter), or by trigram similarity ("hammerhnad" -> hammerhand). Phrases are
+also compared with spaces removed ("Hammer hand" == "Hammerhand"), and trades
+are tagged through TRADE_SYNONYMS ("Excavator Operator" -> Digger).
+
+The index follows the snapshot version; on a change only rows whose snapshot
+object changed are re-slotted.
+"""
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from stellar_core.cache import get_snapshot_cache
+from stellar_core.projections import project
+from stellar_core.trade_matrix import TRADE_SYNONYMS
+
+# Match weights: best match per query token counts, averaged over tokens.
+EXACT = 1.0
+SUBSTRING = 0.95
+SYNONYM = 0.9
+FUZZY = 0.8
+FUZZY_MIN_SIMILARITY = 0.4
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_TAG = "="
+
+
+def normalize(text: Optional[str]) -> str:
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _synonym_phrases() -> List[Tuple[str, str]]:
+    """(phrase with spaces removed, trade tag), longest first."""
+    phrases = []
+    for trade, names in TRADE_SYNONYMS.items():
+        for name in [trade] + names:
+            phrases.append((normalize(name).replace(" ", ""), _TAG + trade.lower()))
+    return sorted(set(phrases), key=lambda p: -len(p[0]))
+
+
+_PHRASES = _synonym_phrases()
+
+
+def trade_tags(text: str) -> Set[str]:
+    """Synonym tags for normalized `text` (matched with spaces removed)."""
+    compact = text.replace(" ", "")
+    return {tag for phrase, tag in _PHRASES if phrase in compact}
+
+
+def text_terms(text: str) -> FrozenSet[str]:
+    """Tokens, adjacent token pairs joined ('hammer hand' -> 'hammerhand') and trade tags."""
+    tokens = text.split()
+    terms = set(tokens)
+    terms.update(a + b for a, b in zip(tokens, tokens[1:]))
+    terms.update(trade_tags(text))
+    return frozenset(terms)
+
+
+class TalentIndex:
+    """Role/trade index keyed by normalized text; see module docstring."""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._rows: Dict[Any, Dict] = {}
+        self._text_of: Dict[Any, Tuple[str, Any]] = {}
+        self._buckets: Dict[str, Dict[Any, Dict[Any, None]]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._trigram_count: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # --- maintenance (self.lock held) ---
+
+    def _add_text(self, text: str) -> None:
+        self._buckets[text] = {}
+        for term in text_terms(text):
+            self._postings.setdefault(term, set()).add(text)
+            if term.startswith(_TAG) or term in self._trigram_count:
+                continue
+            grams = trigrams(term)
+            self._trigram_count[term] = len(grams)
+            for g in grams:
+                self._trigrams.setdefault(g, set()).add(term)
+
+    def _put(self, row: Dict) -> None:
+        row_id = row.get("id")
+        self._remove(row_id)
+        text = normalize(f"{row.get('role') or ''} {row.get('trade') or ''}")
+        if text not in self._buckets:
+            self._add_text(text)
+        status = row.get("status")
+        self._buckets[text].setdefault(status, {})[row_id] = None
+        self._text_of[row_id] = (text, status)
+
+    def _remove(self, row_id: Any) -> None:
+        old = self._text_of.pop(row_id, None)
+        if old is not None:
+            text, status = old
+            self._buckets[text][status].pop(row_id, None)
+
+    def sync(self, version: int, rows: Iterable[Dict]) -> None:
+        """Brings the index to snapshot `version`; only changed rows are re-slotted."""
+        with self.lock:
+            if version == self.version:
+                return
+            current: Dict[Any, Dict] = {}
+            changed = []
+            for row in rows:
+                row_id = row.get("id")
+                current[row_id] = row
+                if self._rows.get(row_id) is not row:
+                    changed.append(row)
+            for row_id in self._rows.keys() - current.keys():
+                self._remove(row_id)
+            for row in project("candidates", "talent_index", changed):
+                self._put(row)
+            self._rows = current
+            self.version = version
+
+    # --- query ---
+
+    def _fuzzy(self, token: str) -> Dict[str, float]:
+        grams = trigrams(token)
+        shared = Counter(term for g in grams for term in self._trigrams.get(g, ()))
+        out = {}
+        for term, n in shared.items():
+            similarity = n / (len(grams) + self._trigram_count[term] - n)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                out[term] = FUZZY * similarity
+        return out
+
+    def _token_matches(self, token: str) -> Dict[str, float]:
+        """Vocabulary terms matching one query token, with weights."""
+        matches = self._fuzzy(token) if len(token) >= 3 else {}
+        for term in self._trigram_count:
+            if token in term:
+                matches[term] = EXACT if term == token else max(matches.get(term, 0), SUBSTRING)
+        return matches
+
+    def _score_texts(self, query: str) -> List[Tuple[float, str]]:
+        text = normalize(query)
+        tokens = text.split()
+        if not tokens:
+            return []
+        # Whole query, spaces removed ("hammer hand"), and synonym tags match every token at once.
+        phrase: Dict[str, float] = {}
+        compact = text.replace(" ", "")
+        if len(tokens) > 1:
+            for term, weight in self._token_matches(compact).items():
+                if weight >= SUBSTRING:
+                    phrase[term] = weight
+        for tag in trade_tags(text):
+            phrase[tag] = SYNONYM
+
+        phrase_best: Dict[str, float] = {}
+        for term, weight in phrase.items():
+            for t in self._postings.get(term, ()):
+                phrase_best[t] = max(phrase_best.get(t, 0), weight)
+
+        totals: Dict[str, float] = {}
+        for token in tokens:
+            best: Dict[str, float] = {}
+            for term, weight in self._token_matches(token).items():
+                for t in self._postings.get(term, ()):
+                    if weight > best.get(t, 0):
+                        best[t] = weight
+            for t in best.keys() | phrase_best.keys():
+                totals[t] = totals.get(t, 0) + max(best.get(t, 0), phrase_best.get(t, 0))
+        return sorted(((score / len(tokens), t) for t, score in totals.items()), key=lambda s: (-s[0], s[1]))
+
+    def search(self, query: str, status: Optional[str] = None, limit: int = 15,
+               keep: Optional[Callable[[Dict], bool]] = None) -> List[Tuple[Dict, float]]:
+        """
+        Best matches for `query` as (snapshot row, score), highest score first.
+        `status` None / "" means any status; `keep`, if given, filters rows
+        before they count towards `limit`.
+        """
+        out: List[Tuple[Dict, float]] = []
+        with self.lock:
+            for score, text in self._score_texts(query):
+                buckets = self._buckets[text]
+                groups = buckets.values() if not status else [buckets.get(status, {})]
+                for ids in groups:
+                    for row_id in ids:
+                        if keep is not None and not keep(self._rows[row_id]):
+                            continue
+                        out.append((self._rows[row_id], round(score, 3)))
+                        if len(out) >= limit:
+                            return out
+        return out
+
+
+_index: Optional[TalentIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_talent_index() -> TalentIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TalentIndex()
+    return _index
+
+
+async def search_candidates(query: str, status: Optional[str], limit: int, label: str,
+                            keep: Optional[Callable[[Dict], bool]] = None) -> List[Tuple[Dict, float]]:
+    """Refreshes the shared index from the snapshot, then searches it."""
+    version, rows = await get_snapshot_cache().versioned_rows("candidates", label)
+    index = get_talent_index()
+    index.sync(version, rows)
+    return index.search(query, status, limit, keep)
@@ -0,0 +1,302 @@
+"""
+Per-tool-call instrumentation.
+
+instrument() wraps a tool coroutine (as_tool() applies it to every tool the
+agents register) and records, per call:
+
+    wall time, Supabase round-trips, rows fetched, response bytes decoded,
+    the size of the result handed back to the LLM (JSON bytes), whether it
+    failed (raised, or returned an error result as stellar_core.memo.is_error
+    defines it), whether it
+    was served from the turn/session memo (stellar_core.memo), and whether any
+    of its data was last-known-good while the database was down
+    (stellar_core.resilience).
+
+Round-trips/rows/bytes are attributed through a ContextVar that the db layer
+reports into, so work done in child tasks (e.g. the status snapshot's gather)
+counts towards the tool call that started it.
+
+Exporters (config read on first call, after .env is loaded):
+    - OpenTelemetry: a span per call when opentelemetry is importable
+      (google-adk ships it); attributes are `stellar.*`.
+    - Prometheus text: prometheus_text(); STELLAR_METRICS_PORT serves it on
+      http://0.0.0.0:<port>/metrics from a daemon thread.
+    - File: STELLAR_TELEMETRY_FILE appends one JSON line per call (offline runs);
+      emit() adds other events (e.g. agent startup) to the same file.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:  # optional: spans are skipped without it
+    trace = None
+
+from stellar_core.memo import is_error
+
+# Latency histogram buckets (seconds), Prometheus-style upper bounds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class ToolCall:
+    """Counters for one in-flight tool call."""
+
+    __slots__ = ("tool", "round_trips", "rows", "bytes", "memo_hit", "stale")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.round_trips = 0
+        self.rows = 0
+        self.bytes = 0
+        self.memo_hit = False
+        self.stale = False
+
+
+_current: contextvars.ContextVar[Optional[ToolCall]] = contextvars.ContextVar("stellar_tool_call", default=None)
+
+
+def on_query(rows: int) -> None:
+    """db layer hook: one Supabase round-trip returning `rows` rows."""
+    call = _current.get()
+    if call is not None:
+        call.round_trips += 1
+        call.rows += rows
+
+
+def on_response_bytes(n: int) -> None:
+    """db layer hook: `n` response body bytes decoded."""
+    call = _current.get()
+    if call is not None:
+        call.bytes += n
+
+
+def on_memo_hit() -> None:
+    """memo hook: the current call was answered from the memo."""
+    call = _current.get()
+    if call is not None:
+        call.memo_hit = True
+
+
+def on_stale() -> None:
+    """db layer hook: a query was answered with last-known-good data."""
+    call = _current.get()
+    if call is not None:
+        call.stale = True
+
+
+def served_stale() -> bool:
+    """Has the current call used last-known-good data so far?"""
+    call = _current.get()
+    return call is not None and call.stale
+
+
+def result_size(result: Any) -> int:
+    """Bytes of `result` as JSON, roughly what the model receives."""
+    try:
+        return len(json.dumps(result, default=str).encode())
+    except (TypeError, ValueError):
+        return len(str(result).encode())
+
+
+ERROR_KINDS = ("raised", "returned")
+
+
+class ToolMetrics:
+    """Process-wide per-tool aggregates, rendered as Prometheus text."""
+
+    def __init__(self):
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: ToolCall, seconds: float, result_bytes: int, error: Optional[str]) -> None:
+        """`error` is None, or the ERROR_KINDS entry saying how the call failed."""
+        with self._lock:
+            m = self._tools.setdefault(call.tool, {
+                "calls": 0, "errors": 0, "errors_raised": 0, "errors_returned": 0, "seconds": 0.0, "round_trips": 0, "rows": 0,
+                "bytes": 0, "result_bytes": 0, "memo_hits": 0, "stale": 0, "buckets": [0] * len(LATENCY_BUCKETS),
+            })
+            m["calls"] += 1
+            if error:
+                m["errors"] += 1
+                m[f"errors_{error}"] += 1
+            m["seconds"] += seconds
+            m["round_trips"] += call.round_trips
+            m["rows"] += call.rows
+            m["bytes"] += call.bytes
+            m["result_bytes"] += result_bytes
+            m["memo_hits"] += int(call.memo_hit)
+            m["stale"] += int(call.stale)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    m["buckets"][i] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {tool: {k: (list(v) if k == "buckets" else v) for k, v in m.items()} for tool, m in self._tools.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+    def prometheus_text(self) -> str:
+        counters = (
+            ("calls", "stellar_tool_calls_total", "Tool calls."),
+            ("round_trips", "stellar_tool_db_round_trips_total", "Supabase round-trips made by tool calls."),
+            ("rows", "stellar_tool_db_rows_total", "Rows fetched by tool calls."),
+            ("bytes", "stellar_tool_db_bytes_total", "Response bytes decoded by tool calls."),
+            ("result_bytes", "stellar_tool_result_bytes_total", "JSON bytes returned to the LLM."),
+            ("memo_hits", "stellar_tool_memo_hits_total", "Tool calls answered from the turn/session memo."),
+            ("stale", "stellar_tool_stale_total", "Tool calls served last-known-good data while the database was down."),
+        )
+        tools = self.snapshot()
+        lines: List[str] = []
+        for key, metric, help_text in counters:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{tool="{tool}"}} {m[key]}' for tool, m in sorted(tools.items())]
+
+        metric = "stellar_tool_errors_total"
+        lines += [f"# HELP {metric} Failed tool calls: kind=raised (exception) or returned (error result).",
+                  f"# TYPE {metric} counter"]
+        for tool, m in sorted(tools.items()):
+            lines += [f'{metric}{{tool="{tool}",kind="{kind}"}} {m[f"errors_{kind}"]}' for kind in ERROR_KINDS]
+
+        metric = "stellar_tool_duration_seconds"
+        lines += [f"# HELP {metric} Tool call wall time.", f"# TYPE {metric} histogram"]
+        for tool, m in sorted(tools.items()):
+            for bound, count in zip(LATENCY_BUCKETS, m["buckets"]):
+                lines.append(f'{metric}_bucket{{tool="{tool}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{tool="{tool}",le="+Inf"}} {m["calls"]}')
+            lines.append(f'{metric}_sum{{tool="{tool}"}} {round(m["seconds"], 6)}')
+            lines.append(f'{metric}_count{{tool="{tool}"}} {m["calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = ToolMetrics()
+
+_config_lock = threading.Lock()
+_configured = False
+_file_path: Optional[str] = None
+_file_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Serves prometheus_text() at /metrics on `port` (once per process)."""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name="stellar-metrics", daemon=True).start()
+    return _server
+
+
+def _configure() -> None:
+    global _configured, _file_path
+    if _configured:
+        return
+    with _config_lock:
+        if _configured:
+            return
+        _file_path = os.environ.get("STELLAR_TELEMETRY_FILE") or None
+        port = os.environ.get("STELLAR_METRICS_PORT")
+        if port:
+            try:
+                start_metrics_server(int(port))
+            except (OSError, ValueError) as e:
+                print(f"WARNING: metrics endpoint not started on port {port}: {e}")
+        _configured = True
+
+
+def emit(record: Dict) -> None:
+    """Appends `record` (plus a timestamp) to STELLAR_TELEMETRY_FILE, if configured."""
+    _configure()
+    if not _file_path:
+        return
+    line = json.dumps({**record, "ts": time.time()}, default=str)
+    with _file_lock:
+        with open(_file_path, "a") as f:
+            f.write(line + "\n")
+
+
+def instrument(fn: Callable[..., Awaitable[Any]], name: str = None) -> Callable[..., Awaitable[Any]]:
+    """Wraps tool coroutine `fn` so every call is measured and exported under `name`."""
+    tool = name or fn.__name__
+
+    @functools.wraps(fn)
+    async def measured(*args, **kwargs):
+        _configure()
+        call = ToolCall(tool)
+        token = _current.set(call)
+        span_cm = trace.get_tracer("stellar").start_as_current_span(f"tool {tool}") if trace else contextlib.nullcontext()
+        with span_cm as span:
+            start = time.perf_counter()
+            error: Optional[str] = None
+            result = None
+            try:
+                result = await fn(*args, **kwargs)
+                if is_error(result):
+                    error = "returned"
+                return result
+            except BaseException:
+                error = "raised"
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                _current.reset(token)
+                size = 0 if error == "raised" else result_size(result)
+                metrics.record(call, seconds, size, error)
+                record = {
+                    "tool": tool, "ms": round(seconds * 1000, 2), "round_trips": call.round_trips,
+                    "rows": call.rows, "bytes": call.bytes, "result_bytes": size, "error": error is not None,
+                    "memo_hit": call.memo_hit, "stale": call.stale,
+                }
+                if error:
+                    record["error_kind"] = error
+                if span is not None:
+                    for key, value in record.items():
+                        if key != "tool":
+                            span.set_attribute(f"stellar.{key}", value)
+                emit(record)
+
+    return measured
+
+
+def get_tool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-tool aggregates (calls, errors, errors_raised, errors_returned, seconds, round_trips, rows, bytes, result_bytes, memo_hits, stale, buckets)."""
+    return metrics.snapshot()
+
+
+def prometheus_text() -> str:
+    """Tool metrics plus per-agent startup times (stellar_core.startup)."""
+    from stellar_core.startup import startup_report
+
+    text = metrics.prometheus_text()
+    agents = startup_report()["agents"]
+    if agents:
+        metric = "stellar_agent_startup_seconds"
+        lines = [f"# HELP {metric} Agent package import-to-ready time.", f"# TYPE {metric} gauge"]
+        lines += [f'{metric}{{agent="{p}"}} {r["ready_ms"] / 1000}' for p, r in sorted(agents.items())]
+        text += "\n".join(lines) + "\n"
+    return text
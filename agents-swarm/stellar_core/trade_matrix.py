@@ -0,0 +1,81 @@
+"""
+The Trade Matrix: which trades may work on which project type.
+
+The matrix (plus synonyms) is compiled once at import into one regex per
+project type over case- and punctuation-normalised role text, so a check is a
+single search no matter how many trades a site allows. Trades match as whole
+words (a plural "s" allowed): "GIB-Fixer" is GIB, "Plasterboarder" is not.
+"""
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+TRADE_MATRIX = {
+    "CIVIL": ["Labourer", "Digger", "Drainlayer"],
+    "STRUCTURE": ["Carpenter", "Hammerhand", "Concrete"],
+    "INTERIOR": ["Painter", "GIB"]
+}
+
+# Other names the same trade goes by on CVs and job sheets, keyed by the
+# Trade Matrix trade they mean. Used by the talent search index. Licences
+# (LBP) are not trades: an "LBP Roofer" is a Roofer.
+TRADE_SYNONYMS: Dict[str, List[str]] = {
+    "Labourer": ["Laborer", "General Labourer", "Site Labourer", "Construction Worker"],
+    "Digger": ["Excavator", "Excavator Operator", "Digger Operator", "Machine Operator", "Plant Operator"],
+    "Drainlayer": ["Drain Layer", "Pipelayer", "Pipe Layer"],
+    "Carpenter": ["Chippy", "Joiner"],
+    "Hammerhand": ["Hammer Hand", "Apprentice Carpenter"],
+    "Concrete": ["Concreter", "Concrete Finisher", "Concrete Placer"],
+    "Painter": ["Decorator", "Painter and Decorator"],
+    "GIB": ["Plasterboard", "GIB Fixer", "GIB Stopper", "Stopper", "Plasterer"],
+}
+
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def compact(text: Optional[str]) -> str:
+    """Lower-case with spaces and punctuation removed ('GIB-Fixer' -> 'gibfixer')."""
+    return _NON_WORD.sub("", (text or "").lower())
+
+
+def normalise(text: Optional[str]) -> str:
+    """Lower-case words separated by single spaces ('GIB-Fixer' -> 'gib fixer')."""
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def _compile() -> Dict[str, Tuple[Pattern, Dict[str, str]]]:
+    rules = {}
+    for project_type, trades in TRADE_MATRIX.items():
+        aliases = {}
+        for trade in trades:
+            for name in [trade] + TRADE_SYNONYMS.get(trade, []):
+                aliases[normalise(name)] = trade
+        names = "|".join(re.escape(a) for a in sorted(aliases, key=len, reverse=True))
+        pattern = re.compile(rf"\b(?P<name>{names})s?\b")
+        rules[project_type] = (pattern, aliases)
+    return rules
+
+
+_RULES = _compile()
+
+
+def is_known_project_type(project_type: Optional[str]) -> bool:
+    return (project_type or "").upper() in _RULES
+
+
+def match_trade(project_type: str, role: Optional[str]) -> Optional[str]:
+    """The Trade Matrix trade `role` counts as on `project_type`, or None if not allowed."""
+    rule = _RULES.get((project_type or "").upper())
+    if rule is None:
+        return None
+    pattern, aliases = rule
+    hit = pattern.search(normalise(role))
+    return aliases[hit.group("name")] if hit else None
+
+
+def is_valid_trade(project_type: str, role: Optional[str]) -> bool:
+    """
+    True if `role` names one of the trades allowed on `project_type` as whole
+    words (case-insensitive, so "LBP Carpenter" counts as a Carpenter).
+    """
+    return match_trade(project_type, role) is not None
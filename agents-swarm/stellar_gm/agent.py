@@ -1,16 +1,20 @@
 import os
 from google.adk.agents.llm_agent import Agent
-from dotenv import load_dotenv
+from stellar_core.config import load_env
+from stellar_core.registry import agent_ready, lazy_tools
 
-# --- IMPORT THE SPECIALISTS ---
-# These imports assume you have created the folder structure I defined.
-from stellar_accountant.tools.financials import get_financial_health, get_bench_liability
-from stellar_candidate_mgr.tools.candidates import search_talent, generate_squads, get_bench_strength
-from stellar_immigration.tools.immigration import check_visa_risks, get_arrival_logistics
-from stellar_sales_lead.tools.sales import search_clients, get_golden_hour_list, find_demand_for_squad
-from stellar_systems_it.tools.systems import audit_data_quality, validate_trade_logic
+# --- THE SPECIALISTS' TOOLS ---
+# Declared from source and imported on first call (or by the background prewarm),
+# so loading the GM doesn't import every specialist package up front.
+FINANCIALS = "stellar_accountant.tools.financials"
+TRENDS = "stellar_accountant.tools.trends"
+CANDIDATES = "stellar_candidate_mgr.tools.candidates"
+IMMIGRATION = "stellar_immigration.tools.immigration"
+SALES = "stellar_sales_lead.tools.sales"
+SYSTEMS = "stellar_systems_it.tools.systems"
+STATUS = "stellar_gm.tools.status"
 
-load_dotenv()
+load_env()
 
 # --- THE GENERAL MANAGER (StellarCoPilot) ---
 # This single agent orchestrates the entire business.
@@ -32,45 +36,58 @@ agent = Agent(
 
     **HOW TO USE YOUR TOOLS:**
     
+    0. **STATUS UPDATES (The Full Split)**
+       - Use `get_status_snapshot` for any status update. One call returns Financials, Bench Strength and Visa Risks together.
+       
     1. **FINANCIALS & RISK (The Accountant)**
        - Use `get_financial_health` to check Margins and Gross Profit.
        - Use `get_bench_liability` immediately if asked about "Cash Burn", "Costs", or "Bleed".
+       - Use `run_margin_scenarios` for "What if" margin questions (burden, hours, rate changes) in a single call.
+       - Use `get_trend` for "how has it moved" questions (margin, bench burn, bench size, visa risk over weeks or months). It reads recorded history, not the live tables.
        
     2. **TALENT LOGISTICS (The Quartermaster)**
        - Use `get_bench_strength` to see who is available to work TODAY.
        - Use `generate_squads` to bundle candidates into commercial teams (e.g., "Build me a Civil Squad in South Auckland").
-       - Use `search_talent` for specific role lookups (e.g. "Find me a Crane Operator").
+       - Use `search_talent` for specific role lookups (e.g. "Find me a Crane Operator"); add `near` / `radius_km` for "within 30 km of Westgate".
        
     3. **SALES & GROWTH (The Hunter)**
        - Use `get_golden_hour_list` to plan the morning call block (Retention + Growth).
        - Use `find_demand_for_squad` ONLY after you have identified a Squad. Match the Supply to the Demand.
+       - Use `match_squads_to_demand` for more than one squad: pass the `items` from `generate_squads` in one call, not one `find_demand_for_squad` per squad.
        - Use `search_clients` to find specific client details.
        
     4. **COMPLIANCE (The Sentinel)**
-       - Use `check_visa_risks` to audit the workforce for expirations.
+       - Use `check_visa_risks` to audit the workforce for expirations (visas and Site Safe tickets, already expired and upcoming).
        - Use `get_arrival_logistics` to track offshore pipelines and pastoral care.
        
     5. **SYSTEMS (The CTO)**
        - Use `audit_data_quality` if you suspect the data is wrong or searches return nothing.
        - Use `validate_trade_logic` if you are unsure if a candidate fits a project type (e.g. "Can a Painter work on a Civil site?").
+       - Use `validate_squad_trades` to check a whole proposed deployment (the squad `items` from `generate_squads`, or a roster) against a project type in one call before pitching it.
 
     **STRATEGIC PROTOCOLS:**
-    - **The "Full Split":** If the user asks for a status update, you must check Financials, Bench Strength, and Visa Risks together.
-    - **The "Matchmaker":** If you see high `bench_liability`, immediately use `generate_squads` and then `find_demand_for_squad` to propose a solution.
+    - **The "Full Split":** If the user asks for a status update, you must check Financials, Bench Strength, and Visa Risks together. Use `get_status_snapshot` (one call), and call out any branch listed under `errors`.
+    - **The "Matchmaker":** If you see high `bench_liability`, immediately use `generate_squads` and then `match_squads_to_demand` to propose a solution.
+    - **Big Lists:** `get_bench_strength`, `get_bench_liability`, `generate_squads` and `match_squads_to_demand` return a `summary` (totals for everything) plus one page of `items` (best first). Report from the summary; only pass `page.next_cursor` back as `cursor` when the user wants more names.
     - **Tone:** Executive, Decisive, Data-Driven. Don't say "I can check". Just run the tools and report the reality.
     """,
     tools=[
+        # Status (Full Split)
+        *lazy_tools(STATUS, "get_status_snapshot_async"),
         # Financials
-        get_financial_health, get_bench_liability,
+        *lazy_tools(FINANCIALS, "get_financial_health_async", "get_bench_liability_async", "run_margin_scenarios_async"),
+        *lazy_tools(TRENDS, "get_trend_async"),
         # Candidates
-        search_talent, generate_squads, get_bench_strength,
+        *lazy_tools(CANDIDATES, "search_talent_async", "generate_squads_async", "get_bench_strength_async"),
         # Immigration
-        check_visa_risks, get_arrival_logistics,
+        *lazy_tools(IMMIGRATION, "check_visa_risks_async", "get_arrival_logistics_async"),
         # Sales
-        search_clients, get_golden_hour_list, find_demand_for_squad,
+        *lazy_tools(SALES, "search_clients_async", "get_golden_hour_list_async", "find_demand_for_squad_async",
+                    "match_squads_to_demand_async"),
         # Systems
-        audit_data_quality, validate_trade_logic
+        *lazy_tools(SYSTEMS, "audit_data_quality_async", "validate_trade_logic_async", "validate_squad_trades_async"),
     ]
 )
 
-root_agent = agent
\ No newline at end of file
+root_agent = agent
+agent_ready(__package__, agent.tools)
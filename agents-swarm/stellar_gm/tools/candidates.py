@@ -1,43 +1,47 @@
-import os
-from supabase import create_client, Client
+from stellar_core.aio import run_sync
+from stellar_core.db import get_async_supabase
+from stellar_core.candidate import get_candidate_store
+from stellar_core.geo import NearFilter, resolve
+from stellar_core.talent_index import search_candidates
 
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key:
-        return None
-    return create_client(url, key)
-
-def search_talent(query_role: str):
+async def search_talent_async(query_role: str, status: str = "", near: str = "", radius_km: float = 0):
     """
     Delegate: Candidate Manager (Scout).
     Searches for candidates and enriches them with Mobility data.
+    Fuzzy / synonym role match; optionally only one status (e.g. "available").
+    Optionally only people in `near` (suburb / area / region) or within `radius_km` of it.
     """
-    sb = get_supabase()
+    sb = await get_async_supabase()
     if not sb:
         return "Error: Database connection failed (Candidate Mgr)."
 
-    # Simple search (can be enhanced with vector search later)
-    # Using ilike for broad matching
-    response = sb.table("candidates").select("*").ilike("role", f"%{query_role}%").limit(5).execute()
-    candidates = response.data
+    centre = resolve(near) if near else None
+    if near and centre is None:
+        return f"Error: Unknown location '{near}'."
+    nearby = NearFilter(centre, radius_km) if centre else None
+
+    # Ranked search on the shared role/trade index
+    matches = await search_candidates(query_role, status, 5, "gm_search_talent", keep=nearby)
+    store = get_candidate_store()
     
     enriched_results = []
     
-    for c in candidates:
-        residency = (c.get("residency_status") or "").lower()
-        nationality = (c.get("nationality") or "").lower()
-        
-        # LOGIC PARITY: Enrichment
-        is_mobile = "work visa" in residency or "filipino" in nationality
+    for row, _ in matches:
+        # LOGIC PARITY: Enrichment (shared Candidate record)
+        c = store.record(row, "gm_search_talent")
         
         enriched_results.append({
-            "id": c.get("id"),
-            "name": f"{c.get('first_name')} {c.get('last_name')}",
-            "role": c.get("role"),
-            "status": c.get("status"),
-            "is_mobile": is_mobile,  # <--- Critical Flag
-            "location": c.get("region")
+            "id": c.id,
+            "name": c.name,
+            "role": c.role,
+            "status": c.status,
+            "is_mobile": c.is_mobile,  # <--- Critical Flag
+            "location": c.suburb,
+            **({"distance_km": nearby.km(row)} if nearby else {}),
         })
 
     return enriched_results
+
+def search_talent(query_role: str, status: str = "", near: str = "", radius_km: float = 0):
+    """Sync wrapper around search_talent_async()."""
+    return run_sync(search_talent_async(query_role, status, near, radius_km))
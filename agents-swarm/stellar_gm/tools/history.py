@@ -0,0 +1,124 @@
+import asyncio
+import sys
+import time
+from typing import Dict, Optional, Sequence
+
+from stellar_accountant.tools.financials import get_bench_liability_async, get_financial_health_async
+from stellar_candidate_mgr.tools.candidates import get_bench_strength_async
+from stellar_immigration.tools.immigration import check_visa_risks_async
+from stellar_core.aio import run_sync
+from stellar_core.db import env_number
+from stellar_core.expiry import BUCKETS
+from stellar_core.history import get_history_store
+from stellar_gm.tools.status import _run_branch
+
+
+def _financial_metrics(fin: Dict) -> Dict:
+    return {
+        "weekly_revenue": fin.get("weekly_revenue"),
+        "weekly_gross_profit": fin.get("weekly_gross_profit"),
+        "margin_percent": fin.get("margin_percent"),
+        "busy_fool_count": len(fin.get("busy_fool_deals") or []),
+    }
+
+
+def _liability_metrics(liability: Dict) -> Dict:
+    summary = liability.get("summary") or {}
+    return {
+        "bench_weekly_burn": summary.get("total_weekly_burn"),
+        "bench_liable_count": summary.get("liable_count"),
+        "bench_guaranteed_hours": summary.get("total_guaranteed_hours"),
+    }
+
+
+def _bench_metrics(bench: Dict) -> Dict:
+    summary = bench.get("summary") or {}
+    return {
+        "bench_available": summary.get("total_count"),
+        "bench_mobile": summary.get("mobile_units"),
+        "bench_seniors": summary.get("seniors"),
+    }
+
+
+def _visa_metrics(visas: Dict) -> Dict:
+    buckets = (visas.get("summary") or {}).get("buckets") or {}
+    metrics = {f"visa_{lo}_{hi}": buckets.get(f"{lo}-{hi}") for lo, hi in BUCKETS}
+    metrics["visa_expired"] = buckets.get("expired")
+    return metrics
+
+
+# Same branches as the status snapshot, reduced to the numbers worth keeping.
+BRANCHES: Dict[str, tuple] = {
+    "financials": (get_financial_health_async, _financial_metrics),
+    "bench_liability": (get_bench_liability_async, _liability_metrics),
+    "bench": (get_bench_strength_async, _bench_metrics),
+    "visa_risks": (check_visa_risks_async, _visa_metrics),
+}
+
+
+async def record_history_async() -> Dict:
+    """
+    Snapshot job: runs Financials, Bench Liability, Bench Strength and Visa
+    Risks in parallel and appends their headline numbers to the local history
+    store (stellar_core.history). A failed branch is recorded as missing; if
+    every branch fails nothing is written.
+    """
+    timeout = env_number("STATUS_BRANCH_TIMEOUT", 8)
+    results = await asyncio.gather(*(_run_branch(fn, extract, timeout) for fn, extract in BRANCHES.values()))
+
+    sample: Dict[str, Optional[float]] = {}
+    errors: Dict[str, str] = {}
+    for name, result in zip(BRANCHES, results):
+        if "error" in result:
+            errors[name] = result["error"]
+        else:
+            sample.update(result)
+    if not sample:
+        return {"recorded": False, "errors": errors}
+
+    store = get_history_store()
+    slot = store.append(sample)
+    out = {
+        "recorded": slot is not None,
+        "slot": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(slot)) if slot is not None else None,
+        "sample": sample,
+    }
+    if errors:
+        out["errors"] = errors
+    return out
+
+
+def record_history() -> Dict:
+    """Sync wrapper around record_history_async()."""
+    return run_sync(record_history_async())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="python -m stellar_gm.tools.history", description="Record metric history snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="append one snapshot to the history store")
+    record.add_argument("--every", type=float, default=0,
+                        help="keep running, one snapshot every EVERY seconds (default: once)")
+    args = parser.parse_args(argv)
+
+    from stellar_core.config import load_env
+
+    load_env()
+
+    async def run() -> Dict:
+        while True:
+            result = await record_history_async()
+            print(json.dumps(result, indent=2), flush=True)
+            if args.every <= 0:
+                return result
+            await asyncio.sleep(args.every)
+
+    result = asyncio.run(run())
+    return 0 if result.get("recorded") or "errors" not in result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from stellar_accountant.tools.financials import get_financial_health_async
+from stellar_candidate_mgr.tools.candidates import get_bench_strength_async
+from stellar_immigration.tools.immigration import check_visa_risks_async
+from stellar_core.aio import run_sync
+from stellar_core.db import env_number
+from stellar_core.resilience import describe
+
+SAMPLE_SIZE = 3
+
+
+def _compact_financials(fin: Dict) -> Dict:
+    fools = fin.get("busy_fool_deals") or []
+    return {
+        "status": fin.get("status"),
+        "weekly_revenue": fin.get("weekly_revenue"),
+        "weekly_gross_profit": fin.get("weekly_gross_profit"),
+        "margin_percent": fin.get("margin_percent"),
+        "busy_fool_count": len(fools),
+        "worst_busy_fools": sorted(fools, key=lambda f: f.get("net_gp") or 0)[:SAMPLE_SIZE],
+    }
+
+
+def _compact_bench(bench: Dict) -> Dict:
+    summary = bench.get("summary") or {}
+    return {
+        "total_count": summary.get("total_count"),
+        "mobile_units": summary.get("mobile_units"),
+        "seniors": summary.get("seniors"),
+    }
+
+
+def _compact_visas(visas: Dict) -> Dict:
+    summary = visas.get("summary") or {}
+    return {
+        "expiring_count": summary.get("expiring_count"),
+        "expired_count": summary.get("expired_count"),
+        "buckets": summary.get("buckets"),
+        "most_urgent": (summary.get("most_urgent") or [])[:SAMPLE_SIZE],
+    }
+
+
+BRANCHES: Dict[str, tuple] = {
+    "financials": (get_financial_health_async, _compact_financials),
+    "bench": (get_bench_strength_async, _compact_bench),
+    "visa_risks": (check_visa_risks_async, _compact_visas),
+}
+
+
+async def _run_branch(fn: Callable[[], Awaitable[Any]], compact: Callable[[Dict], Dict], timeout: float) -> Dict:
+    try:
+        result = await asyncio.wait_for(fn(), timeout)
+    except asyncio.TimeoutError:
+        return {"error": f"Timed out after {timeout:g}s"}
+    except Exception as e:
+        return {"error": describe(e)}
+    if not isinstance(result, dict):
+        return {"error": str(result)}
+    if "error" in result:
+        return {"error": result["error"]}
+    return compact(result)
+
+
+async def get_status_snapshot_async() -> Dict:
+    """
+    Delegate: The General Manager ("Full Split").
+    Runs Financials, Bench Strength and Visa Risks in parallel and returns one
+    compact status payload. A branch that fails or times out is reported in
+    `errors` while the other branches still come back.
+    """
+    timeout = env_number("STATUS_BRANCH_TIMEOUT", 8)
+    started = time.monotonic()
+    results = await asyncio.gather(*(_run_branch(fn, compact, timeout) for fn, compact in BRANCHES.values()))
+
+    snapshot: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for name, result in zip(BRANCHES, results):
+        if "error" in result:
+            errors[name] = result["error"]
+        else:
+            snapshot[name] = result
+
+    snapshot["complete"] = not errors
+    if errors:
+        snapshot["errors"] = errors
+    snapshot["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+    return snapshot
+
+
+def get_status_snapshot() -> Dict:
+    """Sync wrapper around get_status_snapshot_async()."""
+    return run_sync(get_status_snapshot_async())
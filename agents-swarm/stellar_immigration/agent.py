@@ -1,9 +1,9 @@
 import os
 from google.adk.agents.llm_agent import Agent
-from stellar_immigration.tools.immigration import check_visa_risks, get_arrival_logistics
-from dotenv import load_dotenv
+from stellar_core.config import load_env
+from stellar_core.registry import agent_ready, lazy_tools
 
-load_dotenv()
+load_env()
 
 # Immigration Sentinel
 agent = Agent(
@@ -18,14 +18,15 @@ agent = Agent(
     2. **Pastoral Care is Retention**: Happy arrivals stay longer. Track flight logistics.
     
     YOUR TOOLKIT:
-    - `check_visa_risks`: Use this to find any visas expiring in the next 90 days.
+    - `check_visa_risks`: Use this to find any visas expiring in the next 90 days (pass `within_days` for another window). `summary` has the expiring and expired counts, counts per 0-14 / 15-30 / 31-90 day bucket, the most urgent upcoming expiries, and the same for Site Safe tickets under `site_safe`. `items` lists the people (expired first, then soonest), one page at a time; pass `page.next_cursor` as `cursor` for more, or `kind="site_safe"` to list Site Safe tickets instead.
     - `get_arrival_logistics`: Use this to track the pipeline of incoming talent.
     
     INTERACTION STYLE:
     - Detail-oriented and supportive, but legally precise.
     - Example: "I have 4 visa risks flagged. One expiring in 12 days. I recommend starting the VOC renewal today."
     """,
-    tools=[check_visa_risks, get_arrival_logistics]
+    tools=lazy_tools("stellar_immigration.tools.immigration", "check_visa_risks_async", "get_arrival_logistics_async")
 )
 
 root_agent = agent
+agent_ready(__package__, agent.tools)
@@ -1,31 +1,57 @@
-import os
-from supabase import create_client, Client
-from datetime import datetime
+from stellar_core.aio import run_sync
+from stellar_core.db import get_async_supabase
+from stellar_core.envelope import SUMMARY_TOP, paginate, resume
+from stellar_core.expiry import EXPIRY_COLUMNS, get_expiry_calendar
+from stellar_core.resilience import describe
+from typing import Dict
 
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key: return None
-    return create_client(url, key)
+def _risk_counts(report: Dict) -> Dict:
+    return {
+        "expiring_count": report["expiring_count"],
+        "expired_count": report["expired_count"],
+        "buckets": report["buckets"],
+        # Soonest upcoming expiries (expired ones come first in `risks`)
+        "most_urgent": report["risks"][report["expired_count"]:][:SUMMARY_TOP],
+    }
 
-def check_visa_risks():
-    """Scans for visas expiring in < 90 days."""
-    sb = get_supabase()
-    if not sb: return "Error"
+async def check_visa_risks_async(within_days: int = 90, kind: str = "visa", cursor: str = "") -> Dict:
+    """
+    Scans for visas expiring in the next `within_days` days (default 90) and
+    visas already expired, with 0-14 / 15-30 / 31-90 day bucket counts.
+    Site Safe tickets are counted the same way under summary.site_safe.
+    `items` lists one kind's risks (kind="visa" or "site_safe"), most overdue
+    first (negative days_left = already expired), one page at a time (pass
+    page.next_cursor as `cursor` for more).
+    """
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
     try:
-        # Fetch active candidates
-        res = sb.table("candidates").select("*").not_.is_("visa_expiry", "null").execute()
-        risks = []
-        now = datetime.now()
-        for c in res.data:
-            expiry = c.get("visa_expiry")
-            # Parse ISO string
-            days_left = (datetime.fromisoformat(expiry.replace('Z','')) - now).days
-            if days_left < 90:
-                risks.append({"name": c.get("first_name"), "days_left": days_left})
-        return {"status": "Risk Scan", "expiring_soon": risks}
-    except Exception as e: return str(e)
+        params, offset, seen = resume("check_visa_risks", cursor, {"within_days": within_days, "kind": kind})
+        within_days, kind = params["within_days"], params["kind"]
+        if kind not in EXPIRY_COLUMNS:
+            return {"error": f"Unknown kind '{kind}'; use one of {', '.join(EXPIRY_COLUMNS)}."}
 
-def get_arrival_logistics():
+        calendar = get_expiry_calendar()
+        await calendar.refresh("check_visa_risks", within_days)
+        reports = {k: calendar.report(k, within_days) for k in EXPIRY_COLUMNS}
+        summary = {
+            "status": "Risk Scan",
+            "within_days": within_days,
+            **_risk_counts(reports["visa"]),
+            "site_safe": _risk_counts(reports["site_safe"]),
+            "listing": kind,
+        }
+        return paginate("check_visa_risks", reports[kind]["risks"], summary, params, offset, calendar.version, seen)
+    except Exception as e: return {"error": describe(e)}
+
+def check_visa_risks(within_days: int = 90, kind: str = "visa", cursor: str = "") -> Dict:
+    """Sync wrapper around check_visa_risks_async()."""
+    return run_sync(check_visa_risks_async(within_days, kind, cursor))
+
+async def get_arrival_logistics_async():
     """Placeholder for flight arrivals."""
     return {"arrivals": [], "pastoral_care_needed": False}
+
+def get_arrival_logistics():
+    """Sync wrapper around get_arrival_logistics_async()."""
+    return run_sync(get_arrival_logistics_async())
@@ -1,9 +1,9 @@
 import os
 from google.adk.agents.llm_agent import Agent
-from stellar_sales_lead.tools.sales import search_clients, get_golden_hour_list, find_demand_for_squad
-from dotenv import load_dotenv
+from stellar_core.config import load_env
+from stellar_core.registry import agent_ready, lazy_tools
 
-load_dotenv()
+load_env()
 
 agent = Agent(
     name='SalesLead',
@@ -17,15 +17,18 @@ agent = Agent(
     2. **Protect Tier 1**: Any Tier 1 client silent for > 14 days is a crisis.
     
     YOUR TOOLKIT:
-    - `search_clients`: Find targets by region.
-    - `get_golden_hour_list`: Your morning call sheet.
+    - `search_clients`: Find targets by region (a suburb, an area like "South Auckland", or a region); `radius_km` widens it, nearest first.
+    - `get_golden_hour_list`: Your morning call sheet. Most overdue Tier 1 clients first; `open_tenders` / `next_closing` flag clients named on live tenders.
     - `find_demand_for_squad`: Use this immediately when the CandidateMgr hands you a Squad.
+    - `match_squads_to_demand`: Several squads at once? Pass them all in one call. Each squad gets its best clients (Tier 1, longest silent, live tenders first); the biggest earners pick first.
     
     INTERACTION STYLE:
     - High energy, persuasive.
     - Example: "I have 3 clients in Westgate who need this Civil Squad. Calling Fletchers now."
     """,
-    tools=[search_clients, get_golden_hour_list, find_demand_for_squad]
+    tools=lazy_tools("stellar_sales_lead.tools.sales", "search_clients_async", "get_golden_hour_list_async", "find_demand_for_squad_async",
+                     "match_squads_to_demand_async")
 )
 
 root_agent = agent
+agent_ready(__package__, agent.tools)
@@ -1,56 +1,116 @@
-import os
-from supabase import create_client, Client
-from datetime import datetime, timedelta
-import dateutil.parser
-
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key: return None
-    return create_client(url, key)
-
-def search_clients(region: str = None, industry: str = None):
-    """Finds clients based on region or industry."""
-    sb = get_supabase()
-    if not sb: return "Error"
+from stellar_core.aio import run_sync
+from stellar_core.db import get_async_supabase, aexecute
+from stellar_core.demand import get_demand_book, squad_key, squads_digest
+from stellar_core.envelope import CursorError, paginate, resume
+from stellar_core.geo import resolve
+from stellar_core.golden_hour import get_golden_hour_board
+from stellar_core.projections import columns_for, select_clause
+from stellar_core.resilience import describe
+from typing import Dict, List
+
+async def search_clients_async(region: str = None, industry: str = None, radius_km: float = 0):
+    """
+    Finds clients based on region or industry.
+    A region can be a suburb, an area ("South Auckland" includes Manukau and
+    Papatoetoe) or a region; set radius_km to also include clients within that
+    distance of it. Nearest first.
+    """
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
     try:
-        query = sb.table("clients").select("*")
+        if region and resolve(region) is not None:
+            book = get_demand_book()
+            await book.refresh("search_clients")
+            columns = columns_for("clients", "search_clients")
+            return [dict({c: row.get(c) for c in columns}, distance_km=km)
+                    for row, km in book.nearby(region, radius_km, industry or "", 5)]
+        query = sb.table("clients").select(select_clause("clients", "search_clients"))
         if region: query = query.ilike("region", f"%{region}%")
         if industry: query = query.ilike("industry", f"%{industry}%")
-        res = query.limit(5).execute()
+        res = await aexecute(query.limit(5), "search_clients")
         return res.data
-    except Exception as e: return str(e)
+    except Exception as e: return {"error": describe(e)}
 
-def get_golden_hour_list():
-    """Generates priority call list (Tier 1 decay + Tenders)."""
-    sb = get_supabase()
+def search_clients(region: str = None, industry: str = None, radius_km: float = 0):
+    """Sync wrapper around search_clients_async()."""
+    return run_sync(search_clients_async(region, industry, radius_km))
+
+async def get_golden_hour_list_async():
+    """
+    Generates priority call list (Tier 1 decay + Tenders).
+    Tier 1 clients silent for > 14 days (days_silent None = never contacted),
+    most overdue first, plus any Tier 1 client named on an open tender.
+    """
+    sb = await get_async_supabase()
     if not sb: return []
     try:
-        res = sb.table("clients").select("*").eq("tier", "1").execute() # Enum might be string '1'
-        clients = res.data
-        risks = []
-        now = datetime.now()
-        for c in clients:
-            last = c.get("last_contact")
-            days = 99
-            if last:
-                days = (now - dateutil.parser.parse(last).replace(tzinfo=None)).days
-            if days > 14:
-                risks.append({"name": c.get("name"), "days_silent": days})
-        return {"strategy": "Attack Decay", "call_list": risks}
-    except Exception as e: return str(e)
+        board = get_golden_hour_board()
+        await board.refresh("get_golden_hour_list")
+        return board.call_list()
+    except Exception as e: return {"error": describe(e)}
 
-def find_demand_for_squad(squad: dict):
+def get_golden_hour_list():
+    """Sync wrapper around get_golden_hour_list_async()."""
+    return run_sync(get_golden_hour_list_async())
+
+async def find_demand_for_squad_async(squad: dict):
     """
     Refactor P1: Proximity Matchmaker.
-    Finds clients near the Squad's region.
+    Finds clients near the Squad's region, best prospects first.
+    For more than one squad, use match_squads_to_demand.
     """
     region = squad.get("logistics", {}).get("region", "")
-    if not region: return "No region in squad data."
-    
-    clients = search_clients(region=region)
+    if not region: return {"error": "No region in squad data."}
+
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
+    try:
+        book = get_demand_book()
+        await book.refresh("find_demand_for_squad")
+        _, assignments = book.match([squad_key(squad)], per_squad=5, exclusive=False)
+    except Exception as e: return {"error": describe(e)}
     return {
         "match_type": "Regional Proximity",
         "squad_region": region,
-        "potential_clients": clients
+        "potential_clients": assignments[0]["clients"]
     }
+
+def find_demand_for_squad(squad: dict):
+    """Sync wrapper around find_demand_for_squad_async()."""
+    return run_sync(find_demand_for_squad_async(squad))
+
+
+async def match_squads_to_demand_async(squads: List[Dict], project_type: str = "", per_squad: int = 3, radius_km: float = 30, cursor: str = "") -> Dict:
+    """
+    Batch Matchmaker: matches every squad to clients in its region in one call.
+    Pass the `items` from generate_squads (any number of squads). Clients are ranked
+    by tier, days silent and open tenders; the highest-revenue squads pick first and
+    each client goes to one squad (up to `per_squad` each). Set project_type
+    (CIVIL / STRUCTURE / INTERIOR) to favour clients in industries doing that work.
+    A client is in a squad's region when it is inside it, covers it, or is within
+    radius_km of it; each client carries distance_km and a travel band.
+    `summary` covers all squads; `items` list squads by revenue with their clients,
+    one page at a time (for more, call again with the same squads and
+    page.next_cursor as `cursor`).
+    """
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
+    try:
+        keys = [squad_key(sq) for sq in squads or []]
+        params, offset, seen = resume("match_squads_to_demand", cursor, {
+            "squads": squads_digest(keys), "project_type": project_type, "per_squad": per_squad,
+            "radius_km": radius_km,
+        })
+        if params["squads"] != squads_digest(keys):
+            raise CursorError("Cursor was issued for a different list of squads; pass the same squads with it.")
+        book = get_demand_book()
+        await book.refresh("match_squads_to_demand")
+        summary, assignments = book.match(keys, params["project_type"], params["per_squad"],
+                                         radius_km=params["radius_km"])
+        return paginate("match_squads_to_demand", assignments, summary, params, offset, book.version, seen)
+    except Exception as e:
+        return {"error": f"Demand matching failed: {describe(e)}"}
+
+def match_squads_to_demand(squads: List[Dict], project_type: str = "", per_squad: int = 3, radius_km: float = 30, cursor: str = "") -> Dict:
+    """Sync wrapper around match_squads_to_demand_async()."""
+    return run_sync(match_squads_to_demand_async(squads, project_type, per_squad, radius_km, cursor))
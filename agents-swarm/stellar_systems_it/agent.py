@@ -1,9 +1,9 @@
 import os
 from google.adk.agents.llm_agent import Agent
-from stellar_systems_it.tools.systems import audit_data_quality, validate_trade_logic
-from dotenv import load_dotenv
+from stellar_core.config import load_env
+from stellar_core.registry import agent_ready, lazy_tools
 
-load_dotenv()
+load_env()
 
 agent = Agent(
     name='SystemsIT',
@@ -19,8 +19,10 @@ agent = Agent(
     YOUR TOOLKIT:
     - `audit_data_quality`: Run this proactively if searches return weird results.
     - `validate_trade_logic`: Use this to verify any placement proposed by the SalesLead.
+    - `validate_squad_trades`: Use this to verify a whole squad list or roster against one project type in a single call.
     """,
-    tools=[audit_data_quality, validate_trade_logic]
+    tools=lazy_tools("stellar_systems_it.tools.systems", "audit_data_quality_async", "validate_trade_logic_async", "validate_squad_trades_async")
 )
 
 root_agent = agent
+agent_ready(__package__, agent.tools)
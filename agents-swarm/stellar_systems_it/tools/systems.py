@@ -1,35 +1,121 @@
-import os
-from supabase import create_client, Client
-
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key: return None
-    return create_client(url, key)
-
-def audit_data_quality():
-    """Checks for missing critical fields (Phone, Email, SiteSafe)."""
-    sb = get_supabase()
-    if not sb: return "Error"
+from stellar_core.aio import run_sync
+from stellar_core.db import get_async_supabase
+from stellar_core.projections import project, select_clause
+from stellar_core.resilience import describe
+from stellar_core.scan import scan_pages
+from stellar_core.trade_matrix import TRADE_MATRIX, is_known_project_type, match_trade
+from typing import List, Dict, Any
+
+AUDIT_SAMPLE_SIZE = 5
+
+# High-water mark (max updated_at) of the last completed audit in this process.
+_last_audit_at = None
+
+async def audit_data_quality_async(since_last_audit: bool = False):
+    """
+    Checks for missing critical fields (Phone, Email, SiteSafe).
+    Streams the whole candidates table page by page; set since_last_audit=True
+    to only re-check rows changed since the previous audit.
+    """
+    global _last_audit_at
+    sb = await get_async_supabase()
+    if not sb: return {"error": "DB Connection Failed"}
+
+    since = _last_audit_at if since_last_audit else None
+    scanned = 0
+    issues_count = 0
+    details = []
+    high_water = _last_audit_at
     try:
-        res = sb.table("candidates").select("*").execute()
-        issues = []
-        for c in res.data:
-            missing = []
-            if not c.get("phone"): missing.append("Phone")
-            if not c.get("email"): missing.append("Email")
-            if missing:
-                issues.append({"name": f"{c.get('first_name')} {c.get('last_name')}", "missing": missing})
-        return {"status": "Audit Complete", "issues_count": len(issues), "details": issues[:5]}
-    except Exception as e: return str(e)
+        pages = scan_pages("candidates", select_clause("candidates", "audit_data_quality"), "audit_data_quality", since=since)
+        async for page in pages:
+            for c in project("candidates", "audit_data_quality", page):
+                scanned += 1
+                stamp = c.get("updated_at")
+                if stamp and (high_water is None or stamp > high_water):
+                    high_water = stamp
 
-def validate_trade_logic(project_type: str, role: str):
-    """Enforces the Trade Matrix."""
-    matrix = {
-        "CIVIL": ["Labourer", "Digger", "Drainlayer"],
-        "STRUCTURE": ["Carpenter", "Hammerhand", "Concrete"],
-        "INTERIOR": ["Painter", "GIB"]
+                missing = []
+                if not c.get("phone"): missing.append("Phone")
+                if not c.get("email"): missing.append("Email")
+                if missing:
+                    issues_count += 1
+                    if len(details) < AUDIT_SAMPLE_SIZE:
+                        details.append({"name": f"{c.get('first_name')} {c.get('last_name')}", "missing": missing})
+    except Exception as e: return {"error": describe(e)}
+
+    _last_audit_at = high_water
+    return {
+        "status": "Audit Complete",
+        "mode": "incremental" if since else "full",
+        "rows_scanned": scanned,
+        "issues_count": issues_count,
+        "details": details
     }
-    allowed = matrix.get(project_type.upper(), [])
-    if role in allowed: return "VALID"
+
+def audit_data_quality(since_last_audit: bool = False):
+    """Sync wrapper around audit_data_quality_async()."""
+    return run_sync(audit_data_quality_async(since_last_audit))
+
+async def validate_trade_logic_async(project_type: str, role: str):
+    """Enforces the Trade Matrix."""
+    if match_trade(project_type, role): return "VALID"
     return f"VIOLATION: {role} cannot work on {project_type} site."
+
+def validate_trade_logic(project_type: str, role: str):
+    """Sync wrapper around validate_trade_logic_async()."""
+    return run_sync(validate_trade_logic_async(project_type, role))
+
+def _flatten_members(members: List[Any]) -> List[Dict]:
+    """Squads (leader + crew, as from generate_squads) -> members tagged with squad_id; people/roles pass through."""
+    flat = []
+    for m in members:
+        if isinstance(m, str):
+            flat.append({"role": m})
+        elif isinstance(m, dict) and ("leader" in m or "crew" in m):
+            for person in [m.get("leader")] + list(m.get("crew") or []):
+                if person:
+                    flat.append(dict(person, squad_id=m.get("squad_id")))
+        elif isinstance(m, dict):
+            flat.append(m)
+    return flat
+
+async def validate_squad_trades_async(project_type: str, members: List[dict]) -> Dict:
+    """
+    Enforces the Trade Matrix for a whole deployment in one call.
+    `members` can be squads from generate_squads (leader + crew) or a roster of
+    people with a `role`. Returns a verdict per member and PASS only if every
+    member may work on a `project_type` (CIVIL / STRUCTURE / INTERIOR) site.
+    """
+    if not is_known_project_type(project_type):
+        return {"status": "FAIL", "error": f"Unknown project type '{project_type}'. Use one of: {', '.join(TRADE_MATRIX)}."}
+
+    verdicts = []
+    failing_squads = []
+    for m in _flatten_members(members):
+        trade = match_trade(project_type, m.get("role"))
+        verdict = {
+            "name": m.get("name"),
+            "role": m.get("role"),
+            "verdict": "VALID" if trade else "VIOLATION",
+            "matched_trade": trade
+        }
+        if m.get("squad_id"):
+            verdict["squad_id"] = m["squad_id"]
+            if not trade and m["squad_id"] not in failing_squads:
+                failing_squads.append(m["squad_id"])
+        verdicts.append(verdict)
+
+    violations = sum(1 for v in verdicts if v["verdict"] == "VIOLATION")
+    return {
+        "project_type": project_type.upper(),
+        "status": "PASS" if verdicts and not violations else "FAIL",
+        "checked": len(verdicts),
+        "violations": violations,
+        "failing_squads": failing_squads,
+        "members": verdicts
+    }
+
+def validate_squad_trades(project_type: str, members: List[dict]) -> Dict:
+    """Sync wrapper around validate_squad_trades_async()."""
+    return run_sync(validate_squad_trades_async(project_type, members))
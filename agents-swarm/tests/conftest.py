@@ -0,0 +1,30 @@
+"""
+Shared fixtures. Tools run against stellar_bench's in-process LocalSupabase
+over a small synthetic dataset; no network, no .env needed.
+
+    cd agents-swarm && python -m pytest -q
+"""
+import pytest
+
+from stellar_bench.local_db import LocalSupabase
+from stellar_bench.runner import reset_caches
+from stellar_bench.synth import dataset
+from stellar_core import db
+
+ROWS = 600
+
+
+@pytest.fixture(scope="session")
+def tables():
+    return dataset(ROWS, seed=7)
+
+
+@pytest.fixture
+def local_db(tables):
+    """A LocalSupabase every tool is routed to, with all process-wide caches cold."""
+    client = LocalSupabase(tables)
+    reset_caches()
+    db.use_client(client)
+    yield client
+    db.use_client(None)
+    reset_caches()
@@ -0,0 +1,66 @@
+"""Table snapshots: paged polling from the high-water mark."""
+import asyncio
+import copy
+
+import pytest
+
+from stellar_bench.faults import FaultyClient
+from stellar_bench.local_db import LocalSupabase
+from stellar_bench.synth import dataset
+from stellar_core import db, resilience
+from stellar_core.cache import SnapshotCache
+from stellar_core.resilience import Resilience
+from stellar_core.scan import DEFAULT_PAGE_SIZE
+
+
+@pytest.fixture(scope="module")
+def roster():
+    rows = dataset(int(DEFAULT_PAGE_SIZE * 2.5), seed=11)["candidates"]
+    for row in rows:
+        row["updated_at"] = "2026-01-01T00:00:00+00:00"
+    return rows
+
+
+def _changed(rows):
+    """More changed rows than one response holds, the newest stamp on a low id."""
+    changed = copy.deepcopy(rows)
+    for i, row in enumerate(changed[:DEFAULT_PAGE_SIZE * 2]):
+        row.update(status="unavailable", updated_at=f"2026-02-01T00:{(i * 7) % 60:02d}:00+00:00")
+    changed[3]["updated_at"] = "2026-03-01T00:00:00+00:00"
+    return changed
+
+
+def _statuses(cache):
+    rows = asyncio.run(cache.rows("candidates", "test"))
+    return {r["id"]: r["status"] for r in rows}
+
+
+def test_poll_takes_in_every_page_of_changes(local_db, roster):
+    db.use_client(LocalSupabase({"candidates": roster}, max_rows=DEFAULT_PAGE_SIZE))
+    cache = SnapshotCache(ttl=3600, poll_interval=0)
+    _statuses(cache)
+
+    changed = _changed(roster)
+    db.use_client(LocalSupabase({"candidates": changed}, max_rows=DEFAULT_PAGE_SIZE))
+    assert _statuses(cache) == {r["id"]: r["status"] for r in changed}
+    assert cache._snapshot("candidates").high_water == "2026-03-01T00:00:00+00:00"
+
+
+def test_failed_poll_keeps_the_high_water(local_db, roster, monkeypatch):
+    monkeypatch.setattr(resilience, "_resilience", Resilience(retries=0, base_delay=0, max_delay=0,
+                                                              breaker_failures=100, cooldown=0, stale_rows=0))
+    db.use_client(LocalSupabase({"candidates": roster}, max_rows=DEFAULT_PAGE_SIZE))
+    cache = SnapshotCache(ttl=3600, poll_interval=0)
+    _statuses(cache)
+    snap = cache._snapshot("candidates")
+
+    changed = _changed(roster)
+    client = FaultyClient(LocalSupabase({"candidates": changed}, max_rows=DEFAULT_PAGE_SIZE))
+    db.use_client(client)
+    client.down()
+    _statuses(cache)
+    assert snap.high_water == "2026-01-01T00:00:00+00:00" and snap.supports_polling
+
+    client.up()
+    assert _statuses(cache) == {r["id"]: r["status"] for r in changed}
+    assert snap.high_water == "2026-03-01T00:00:00+00:00"
@@ -0,0 +1,91 @@
+"""Summary + page envelopes: cursor round-trips, byte budget and data-version checks."""
+import asyncio
+import json
+
+import pytest
+
+from stellar_candidate_mgr.tools.candidates import get_bench_strength_async
+from stellar_core.changefeed import publish
+from stellar_core.envelope import CursorError, decode_cursor, encode_cursor, paginate, resume
+
+ITEMS = [{"id": i, "name": f"candidate {i}"} for i in range(25)]
+
+
+def _walk(tool, items, params, size, budget=None):
+    """Every page from the top, following next_cursor."""
+    pages = [paginate(tool, items, {"n": len(items)}, params, size=size, budget=budget)]
+    while pages[-1]["page"]["next_cursor"]:
+        args, offset, seen = resume(tool, pages[-1]["page"]["next_cursor"], {})
+        assert args == params
+        pages.append(paginate(tool, items, {"n": len(items)}, args, offset, None, seen, size=size, budget=budget))
+    return pages
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("get_bench_liability", {"region": "Auckland"}, 20, 7)
+    assert decode_cursor("get_bench_liability", cursor) == ({"region": "Auckland"}, 20, 7)
+
+
+def test_pages_cover_items_once_in_order():
+    pages = _walk("generate_squads", ITEMS, {"squad_size": 4}, size=10)
+    assert [p["page"]["returned"] for p in pages] == [10, 10, 5]
+    assert [item for p in pages for item in p["items"]] == ITEMS
+    assert all(p["page"]["total"] == 25 and p["summary"] == {"n": 25} for p in pages)
+
+
+def test_resume_without_cursor_starts_at_top():
+    assert resume("get_bench_strength", "", {"kind": "visa"}) == ({"kind": "visa"}, 0, None)
+
+
+def test_cursor_from_another_tool_is_rejected():
+    cursor = encode_cursor("get_bench_strength", {}, 10, None)
+    with pytest.raises(CursorError, match="get_bench_strength"):
+        decode_cursor("get_bench_liability", cursor)
+
+
+def test_garbled_cursor_is_rejected():
+    with pytest.raises(CursorError, match="Invalid cursor"):
+        decode_cursor("get_bench_strength", "not-a-cursor")
+
+
+def test_page_is_stale_when_data_version_changed():
+    first = paginate("get_bench_strength", ITEMS, {}, {}, size=10, version=1)
+    _, offset, seen = decode_cursor("get_bench_strength", first["page"]["next_cursor"])
+    assert seen == 1
+
+    same = paginate("get_bench_strength", ITEMS, {}, {}, offset, version=1, cursor_version=seen, size=10)
+    assert "stale" not in same["page"]
+    moved = paginate("get_bench_strength", ITEMS, {}, {}, offset, version=2, cursor_version=seen, size=10)
+    assert moved["page"]["stale"] is True
+    assert moved["items"] == ITEMS[10:20]
+
+
+def test_byte_budget_trims_page_and_cursor_resumes():
+    big = [{"id": i, "notes": "x" * 400} for i in range(10)]
+    pages = _walk("get_bench_strength", big, {}, size=10, budget=1500)
+    assert len(pages) > 1 and all(0 < p["page"]["returned"] < 10 for p in pages)
+    assert all(len(json.dumps(p).encode()) <= 1500 for p in pages)
+    assert [item["id"] for p in pages for item in p["items"]] == list(range(10))
+
+
+def test_oversized_item_is_skipped_not_stalled():
+    items = [{"id": 0, "notes": "x" * 5000}, {"id": 1}]
+    page = paginate("get_bench_strength", items, {}, {}, size=10, budget=1000)
+    assert page["items"] == [] and page["page"]["skipped_oversized"] == 1
+    _, offset, _ = decode_cursor("get_bench_strength", page["page"]["next_cursor"])
+    assert offset == 1
+
+
+def test_tool_pages_are_flagged_after_a_write(local_db, tables):
+    first = asyncio.run(get_bench_strength_async())
+    cursor = first["page"]["next_cursor"]
+    assert cursor and "stale" not in first["page"]
+
+    second = asyncio.run(get_bench_strength_async(cursor))
+    assert "stale" not in second["page"]
+    assert {c["id"] for c in first["items"]}.isdisjoint(c["id"] for c in second["items"])
+
+    row = next(r for r in tables["candidates"] if r["status"] == "available")
+    publish("candidates", "UPDATE", dict(row, status="on_job"), row)
+    after = asyncio.run(get_bench_strength_async(cursor))
+    assert after["page"]["stale"] is True
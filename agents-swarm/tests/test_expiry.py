@@ -0,0 +1,61 @@
+"""Expiry calendar: polling from the table-wide high water, paged risk listings."""
+import asyncio
+import copy
+from datetime import date, timedelta
+
+from stellar_bench.local_db import LocalSupabase
+from stellar_core import db
+from stellar_core.expiry import ExpiryCalendar
+from stellar_immigration.tools.immigration import check_visa_risks_async
+
+
+def _roster(n, visa_in_days=None):
+    today = date.today()
+    rows = []
+    for i in range(n):
+        rows.append({
+            "id": f"c{i:04d}", "updated_at": f"2026-01-01T00:00:{i % 60:02d}+00:00",
+            "first_name": "Worker", "last_name": str(i),
+            "visa_expiry": (today + timedelta(days=visa_in_days(i))).isoformat() if visa_in_days else None,
+            "compliance": {},
+        })
+    return rows
+
+
+def test_poll_picks_up_a_visa_entering_an_empty_window(local_db):
+    rows = _roster(50, lambda i: 400)  # nobody inside the 90-day window
+    db.use_client(LocalSupabase({"candidates": rows}))
+    calendar = ExpiryCalendar(ttl=3600, poll_interval=0)
+    asyncio.run(calendar.refresh("check_visa_risks"))
+    assert calendar.report("visa", 90)["risks"] == []
+    assert calendar.high_water == max(r["updated_at"] for r in rows)
+
+    changed = copy.deepcopy(rows)
+    changed[7].update(visa_expiry=(date.today() + timedelta(days=10)).isoformat(),
+                      updated_at="2026-02-01T00:00:00+00:00")
+    db.use_client(LocalSupabase({"candidates": changed}))
+    asyncio.run(calendar.refresh("check_visa_risks"))
+    assert calendar.report("visa", 90)["risks"] == [{"name": "Worker 7", "days_left": 10}]
+    assert calendar.high_water == "2026-02-01T00:00:00+00:00"
+
+
+def test_risk_listing_is_paged_most_overdue_first(local_db):
+    db.use_client(LocalSupabase({"candidates": _roster(45, lambda i: i - 20)}))
+    first = asyncio.run(check_visa_risks_async())
+    summary = first["summary"]
+    assert (summary["expired_count"], summary["expiring_count"]) == (20, 25)
+    assert summary["buckets"]["expired"] == 20
+    assert summary["most_urgent"][0] == {"name": "Worker 20", "days_left": 0}
+    assert first["page"]["total"] == 45
+
+    seen, page = [], first
+    while True:
+        seen.extend(item["days_left"] for item in page["items"])
+        if not page["page"]["next_cursor"]:
+            break
+        page = asyncio.run(check_visa_risks_async(cursor=page["page"]["next_cursor"]))
+    assert seen == list(range(-20, 25))
+
+
+def test_unknown_kind_is_an_error(local_db):
+    assert "error" in asyncio.run(check_visa_risks_async(kind="passport"))
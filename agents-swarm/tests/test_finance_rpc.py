@@ -0,0 +1,136 @@
+"""
+Accountant RPC path: migration 0005's SQL functions agree with the Python
+finance engine, and the tool orders and surfaces what they return.
+
+The parity tests need a scratch Postgres: set DATABASE_URL (they create and
+drop their own schema). Without it they are skipped.
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from stellar_accountant.tools.financials import get_bench_liability_async, get_financial_health_async
+from stellar_bench.local_db import LocalQueryError, LocalResponse
+from stellar_core.candidate import Candidate
+from stellar_core.finance_engine import PlacementBook, bench_liability, deal_order
+from stellar_core.finance_rules import finance_rules, rpc_params
+from stellar_core.parsing import parse_currency
+from stellar_core.resilience import UNAVAILABLE_MESSAGE
+from stellar_bench.synth import dataset
+
+MIGRATION = Path(__file__).resolve().parents[2] / "supabase" / "migrations" / "0005_agent_finance_rpc.sql"
+SCHEMA = "stellar_finance_rpc_test"
+# Rate text the parsers must agree on, junk included (parse_currency -> 0.0).
+RATES = ("$1,234.50", "45", "45.", ".5", "$.", "TBC.", "1.2.3", "", "N/A", None)
+COLUMNS = ("id", "first_name", "last_name", "status", "current_project", "charge_out_rate", "pay_rate", "guaranteed_hours")
+
+postgres = pytest.mark.skipif(not os.environ.get("DATABASE_URL"), reason="DATABASE_URL not set (scratch Postgres)")
+
+
+@pytest.fixture(scope="module")
+def pg():
+    psycopg2 = pytest.importorskip("psycopg2")
+    rows = dataset(300, seed=11)["candidates"]
+    placed = [r for r in rows if r["status"] in ("on_job", "placed")]
+    for row, rate in zip(placed, RATES):
+        row["charge_out_rate"] = rate
+    conn = psycopg2.connect(os.environ["DATABASE_URL"])
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}; SET search_path TO {SCHEMA}")
+    cur.execute("CREATE TABLE candidates (id text PRIMARY KEY, first_name text, last_name text, status text, "
+                "current_project text, charge_out_rate text, pay_rate integer, guaranteed_hours integer)")
+    cur.executemany(f"INSERT INTO candidates VALUES ({', '.join(['%s'] * len(COLUMNS))})",
+                    [tuple(r.get(c) for c in COLUMNS) for r in rows])
+    cur.execute(MIGRATION.read_text().replace('"public".', f'"{SCHEMA}".'))
+    yield cur, rows
+    cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    conn.close()
+
+
+def _call(cur, fn, params):
+    args = ", ".join(f"{k} => %({k})s" for k in params)
+    cur.execute(f'SELECT "{SCHEMA}".{fn}({args})', params)
+    return cur.fetchone()[0]
+
+
+@postgres
+@pytest.mark.parametrize("rate", RATES)
+def test_sql_rate_parser_matches_python(pg, rate):
+    cur, _ = pg
+    cur.execute(f'SELECT "{SCHEMA}".agent_parse_rate(%s)', (rate,))
+    assert float(cur.fetchone()[0]) == parse_currency(rate)
+
+
+@postgres
+def test_sql_financial_health_matches_python(pg):
+    cur, rows = pg
+    rules = finance_rules()
+    got = _call(cur, "agent_financial_health", rpc_params(rules))
+    records = [Candidate(r) for r in rows]
+    expected = PlacementBook.from_candidates([c for c in records if c.status in ("on_job", "placed")]).evaluate(rules)
+
+    assert got["weekly_revenue"] == pytest.approx(expected["weekly_revenue"])
+    assert got["weekly_gross_profit"] == pytest.approx(expected["weekly_gross_profit"])
+    assert got["margin_percent"] == pytest.approx(expected["margin_percent"], abs=0.01)
+    deals = sorted(got["busy_fool_deals"], key=deal_order)
+    assert [(d["name"], d["client"]) for d in deals] == [(d["name"], d["client"]) for d in expected["busy_fool_deals"]]
+    assert [d["net_gp"] for d in deals] == pytest.approx([d["net_gp"] for d in expected["busy_fool_deals"]])
+
+
+@postgres
+def test_sql_bench_liability_matches_python(pg):
+    cur, rows = pg
+    got = _call(cur, "agent_bench_liability", {})
+    expected = bench_liability([Candidate(r) for r in rows])
+    assert got["status"] == expected["status"]
+    assert got["total_weekly_burn"] == pytest.approx(expected["total_weekly_burn"])
+    assert sorted((b["name"], b["weekly_burn"]) for b in got["liability_list"]) == \
+        sorted((b["name"], b["weekly_burn"]) for b in expected["liability_list"])
+
+
+class _Rpc:
+    """An rpc call answering with `data`, or raising `error`."""
+
+    def __init__(self, fn, data=None, error=None):
+        self.fn, self.data, self.error = fn, data, error
+
+    def request_key(self):
+        return repr(("rpc", self.fn))
+
+    async def execute(self):
+        if self.error is not None:
+            raise self.error
+        return LocalResponse(self.data)
+
+
+@pytest.fixture
+def rpc_mode(monkeypatch, local_db):
+    monkeypatch.setenv("FINANCE_AGGREGATION", "rpc")
+    return local_db
+
+
+def test_rpc_deals_come_back_worst_first(rpc_mode, monkeypatch):
+    deals = [{"name": n, "net_gp": gp, "margin_pct": 5.0, "client": "X"} for n, gp in (("B", 50), ("A", -20), ("C", 10))]
+    health = {"status": "Critical", "weekly_revenue": 1, "weekly_gross_profit": 1, "margin_percent": 1, "busy_fool_deals": deals}
+    monkeypatch.setattr(rpc_mode, "rpc", lambda fn, params=None: _Rpc(fn, health))
+    result = asyncio.run(get_financial_health_async())
+    assert [d["name"] for d in result["busy_fool_deals"]] == ["A", "C", "B"]
+    assert [d["name"] for d in deals] == ["B", "A", "C"]  # the shared response is left alone
+
+
+def test_missing_function_falls_back_to_python(rpc_mode):
+    # LocalSupabase.rpc answers like a database without migration 0005
+    assert "error" not in asyncio.run(get_financial_health_async())
+    assert "error" not in asyncio.run(get_bench_liability_async())
+
+
+def test_other_rpc_errors_are_surfaced(rpc_mode, monkeypatch):
+    monkeypatch.setenv("SUPABASE_RETRIES", "0")
+    monkeypatch.setattr(rpc_mode, "rpc", lambda fn, params=None: _Rpc(fn, error=LocalQueryError("permission denied", "42501")))
+    assert asyncio.run(get_financial_health_async()) == {"error": "permission denied"}
+    timeout = lambda fn, params=None: _Rpc(fn, error=TimeoutError("statement timeout"))
+    monkeypatch.setattr(rpc_mode, "rpc", timeout)
+    assert asyncio.run(get_bench_liability_async()) == {"error": UNAVAILABLE_MESSAGE}
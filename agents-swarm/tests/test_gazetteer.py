@@ -0,0 +1,102 @@
+"""Place resolution and proximity rules (stellar_core.geo over stellar_core.gazetteer)."""
+import pytest
+
+from stellar_core.geo import GridIndex, NearFilter, PlaceGroups, band, distance_km, gazetteer, reach, resolve
+
+
+@pytest.mark.parametrize("text, name", [
+    ("Manukau", "Manukau"),
+    ("Manurewa", "Manurewa"),
+    ("manukau city centre", "Manukau"),
+    ("Mount Eden", "Mt Eden"),
+    ("mt. eden", "Mt Eden"),
+    ("Papatoetoe East", "Papatoetoe"),
+    ("Westgate, Auckland", "Westgate"),
+    ("Somewhere, Auckland", "Auckland"),
+    ("South Auckland", "South Auckland"),
+    ("Greater Wellington", "Wellington"),
+])
+def test_resolve(text, name):
+    assert resolve(text).name == name
+
+
+@pytest.mark.parametrize("text", ["", "   ", "Atlantis"])
+def test_unknown_text_does_not_resolve(text):
+    assert resolve(text) is None
+
+
+def test_place_names_are_unique_keys():
+    g = gazetteer()
+    assert len(g.by_key) >= len(g.by_name)
+    assert all(g.by_key[name.lower().replace(" ", "")].name == name
+               for name in ("Manukau", "Manurewa", "Auckland"))
+
+
+def test_similar_names_are_different_places():
+    manukau, manurewa = resolve("Manukau"), resolve("Manurewa")
+    assert manukau != manurewa
+    assert manukau.area == manurewa.area == "South Auckland"
+    assert reach(manukau, manurewa) is None  # neither contains the other
+
+
+def test_containment():
+    south, manukau, auckland = resolve("South Auckland"), resolve("Manukau"), resolve("Auckland")
+    assert reach(south, manukau) is not None
+    assert reach(auckland, manukau) is not None
+    assert reach(manukau, auckland) is None
+    assert reach(manukau, auckland, enclosing=True) is not None
+
+
+def test_radius_inclusion():
+    manukau, manurewa, pukekohe = resolve("Manukau"), resolve("Manurewa"), resolve("Pukekohe")
+    km = distance_km(manukau.lat, manukau.lon, manurewa.lat, manurewa.lon)
+    assert 2 < km < 6
+    assert reach(manukau, manurewa, radius_km=km + 0.5) == round(km, 1)
+    assert reach(manukau, manurewa, radius_km=km - 0.5) is None
+    assert reach(manukau, pukekohe, radius_km=10) is None
+    assert reach(manukau, pukekohe, radius_km=30) is not None
+
+
+@pytest.mark.parametrize("km, name", [(None, None), (0, "local"), (10, "local"), (10.1, "commute"),
+                                      (30, "commute"), (60, "regional"), (61, "travel")])
+def test_band(km, name):
+    assert band(km) == name
+
+
+def test_grid_index_matches_brute_force():
+    g = gazetteer()
+    points = [(p.name, p.lat, p.lon) for p in g.by_name.values() if p.kind == "locality"]
+    grid = GridIndex(points)
+    centre = resolve("Manukau")
+    for radius in (0, 5, 25, 80):
+        expected = sorted(name for name, lat, lon in points
+                          if distance_km(centre.lat, centre.lon, lat, lon) <= radius)
+        got = grid.within(centre.lat, centre.lon, radius)
+        assert sorted(name for _, name in got) == expected
+        assert [km for km, _ in got] == sorted(km for km, _ in got)
+
+
+def test_place_groups_nearest_first():
+    roster = ["Manurewa", "Manukau", "Pukekohe", "Dunedin", "Manukau Heights Depot", None, "Papatoetoe", "Atlantis"]
+    groups = PlaceGroups(roster)
+    manukau = resolve("Manukau")
+
+    exact = groups.match(manukau)
+    assert [roster[i] for i, _ in exact] == ["Manukau", "Manukau Heights Depot"]
+
+    nearby = groups.match(manukau, radius_km=10)
+    assert [roster[i] for i, _ in nearby] == ["Manukau", "Manukau Heights Depot", "Manurewa", "Papatoetoe"]
+    assert [km for _, km in nearby] == sorted(km for _, km in nearby)
+    assert 2 not in [i for i, _ in nearby] and 3 not in [i for i, _ in nearby]
+
+    south = groups.match(resolve("South Auckland"))
+    assert {roster[i] for i, _ in south} == {"Manukau", "Manukau Heights Depot", "Manurewa", "Papatoetoe"}
+    assert groups.unplaced == {"atlantis": [7]}
+
+
+def test_near_filter_keeps_rows_in_reach():
+    keep = NearFilter(resolve("Manukau"), radius_km=5)
+    rows = [{"id": 1, "suburb": "Manurewa"}, {"id": 2, "suburb": "Pukekohe"},
+            {"id": 3, "suburb": None, "state": "Manukau"}, {"id": 4, "suburb": "Atlantis"}]
+    assert [r["id"] for r in rows if keep(r)] == [1, 3]
+    assert keep.km(rows[2]) == 0.0 and keep.km(rows[1]) is None
@@ -0,0 +1,111 @@
+"""Local metric history: append, bucketed query, torn records and schema changes."""
+import math
+import os
+
+import numpy as np
+import pytest
+
+from stellar_core import history
+from stellar_core.history import HistoryError, HistoryStore, bucket_keys, bucket_start
+
+DAY = 86400
+MONDAY = 1767571200.0  # 2026-01-05T00:00:00Z
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(directory=str(tmp_path), interval=3600)
+
+
+def _fill(store, hours, start=MONDAY):
+    """One sample an hour; margin_percent = hour index, weekly_revenue = 1000 + hour index."""
+    for h in range(hours):
+        store.append({"margin_percent": h, "weekly_revenue": 1000 + h}, ts=start + h * 3600 + 60)
+
+
+def test_append_stamps_the_interval_slot_once(store):
+    assert store.append({"margin_percent": 12.5}, ts=MONDAY + 1800) == MONDAY
+    assert store.append({"margin_percent": 13.0}, ts=MONDAY + 3000) is None
+    assert store.append({"margin_percent": 14.0}, ts=MONDAY + 3600) == MONDAY + 3600
+
+    cols = store.columns()
+    assert list(cols["ts"]) == [MONDAY, MONDAY + 3600]
+    assert list(cols["margin_percent"]) == [12.5, 14.0]
+    assert np.isnan(cols["weekly_revenue"]).all()
+
+
+@pytest.mark.parametrize("agg, expected", [
+    ("last", [23, 47, 71]),
+    ("mean", [11.5, 35.5, 59.5]),
+    ("min", [0, 24, 48]),
+    ("max", [23, 47, 71]),
+])
+def test_daily_buckets(store, agg, expected):
+    _fill(store, 72)
+    keys, values, counts = store.query(["margin_percent", "weekly_revenue"], MONDAY, MONDAY + 3 * DAY, "day", agg)
+    assert [bucket_start(k, "day") for k in keys] == ["2026-01-05", "2026-01-06", "2026-01-07"]
+    assert list(counts) == [24, 24, 24]
+    assert list(values["margin_percent"]) == expected
+    assert list(values["weekly_revenue"]) == [1000 + v for v in expected]
+
+
+def test_query_window_is_half_open(store):
+    _fill(store, 48)
+    keys, values, counts = store.query(["margin_percent"], MONDAY + 3600, MONDAY + DAY, "hour", "last")
+    assert len(keys) == 23 and counts.sum() == 23
+    assert bucket_start(keys[0], "hour") == "2026-01-05T01:00"
+
+
+def test_missing_values_are_skipped_per_bucket(store):
+    store.append({"margin_percent": 10}, ts=MONDAY)
+    store.append({"margin_percent": None}, ts=MONDAY + 3600)
+    store.append({}, ts=MONDAY + DAY)
+    _, values, counts = store.query(["margin_percent"], MONDAY, MONDAY + 2 * DAY, "day", "last")
+    assert list(counts) == [2, 1]
+    assert values["margin_percent"][0] == 10 and math.isnan(values["margin_percent"][1])
+    _, means, _ = store.query(["margin_percent"], MONDAY, MONDAY + 2 * DAY, "day", "mean")
+    assert means["margin_percent"][0] == 10
+
+
+def test_week_and_month_buckets():
+    ts = np.array([MONDAY - 1, MONDAY, MONDAY + 6 * DAY, MONDAY + 7 * DAY])
+    weeks = bucket_keys(ts, "week")
+    assert weeks[0] != weeks[1] and weeks[1] == weeks[2] != weeks[3]
+    assert bucket_start(weeks[1], "week") == "2026-01-05"
+    months = bucket_keys(np.array([MONDAY, MONDAY + 27 * DAY]), "month")
+    assert [bucket_start(k, "month") for k in months] == ["2026-01-01", "2026-02-01"]
+
+
+def test_bad_queries_raise(store):
+    with pytest.raises(HistoryError, match="Unknown metric"):
+        store.query(["nope"], 0, 1)
+    with pytest.raises(HistoryError, match="Unknown aggregate"):
+        store.query(["margin_percent"], 0, 1, agg="median")
+    _fill(store, 1)
+    with pytest.raises(HistoryError, match="Unknown bucket"):
+        store.query(["margin_percent"], 0, MONDAY + DAY, bucket="fortnight")
+
+
+def test_torn_record_is_ignored_then_trimmed(store):
+    _fill(store, 2)
+    with open(store.path, "ab") as f:
+        f.write(b"\x00" * 5)
+    assert len(store.columns()["ts"]) == 2
+    assert store.append({"margin_percent": 99}, ts=MONDAY + 2 * 3600) is not None
+    assert os.path.getsize(store.path) == 3 * store.dtype.itemsize
+    assert list(store.columns()["margin_percent"]) == [0, 1, 99]
+
+
+def test_files_from_an_older_schema_are_merged(store, tmp_path, monkeypatch):
+    old_columns = (("margin_percent", "f4"),)
+    old = HistoryStore(directory=str(tmp_path), interval=3600)
+    monkeypatch.setattr(history, "COLUMNS", old_columns)
+    monkeypatch.setattr(history, "METRICS", ("margin_percent",))
+    old.schema, old.dtype = history._schema_id(old_columns), history._dtype(old_columns)
+    old.append({"margin_percent": 7}, ts=MONDAY)
+    monkeypatch.undo()
+
+    store.append({"margin_percent": 8, "weekly_revenue": 500}, ts=MONDAY + 3600)
+    cols = store.columns()
+    assert list(cols["margin_percent"]) == [7, 8]
+    assert math.isnan(cols["weekly_revenue"][0]) and cols["weekly_revenue"][1] == 500
@@ -0,0 +1,112 @@
+"""Finance ledger: running totals after row changes equal a full batch recompute, exactly."""
+import asyncio
+import math
+import random
+import uuid
+
+import pytest
+
+from stellar_accountant.tools.financials import get_bench_liability_async, get_financial_health_async
+from stellar_core.candidate import Candidate
+from stellar_core.changefeed import publish
+from stellar_core.finance_engine import PlacementBook, bench_liability
+from stellar_core.finance_rules import finance_rules
+from stellar_core.ledger import PLACED_STATUSES, ExactSum, FinanceLedger, get_finance_ledger
+
+STATUSES = ("available", "on_job", "placed", "unavailable")
+
+
+def _batch(rows, rules):
+    records = [Candidate(r) for r in rows]
+    health = PlacementBook.from_candidates([c for c in records if c.status in PLACED_STATUSES]).evaluate(rules)
+    return health, bench_liability(records)
+
+
+def _changes(rows, n, seed):
+    """`n` random (upserted, deleted) events over `rows`, applied to `rows` as they are made."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.1 and rows:
+            gone = rows.pop(rng.randrange(len(rows)))
+            yield [], [gone["id"]]
+            continue
+        if roll < 0.2:
+            row = dict(rng.choice(rows), id=str(uuid.UUID(int=rng.getrandbits(128))))
+            rows.append(row)
+            yield [row], []
+            continue
+        i = rng.randrange(len(rows))
+        row = dict(rows[i])
+        field = rng.choice(("status", "pay_rate", "charge_out_rate", "guaranteed_hours"))
+        if field == "status":
+            row["status"] = rng.choice(STATUSES)
+        elif field == "guaranteed_hours":
+            row["guaranteed_hours"] = rng.choice((0, 10, 20, 37.5, 40))
+        else:
+            row[field] = round(rng.uniform(20, 90), 2)
+        rows[i] = row
+        yield [row], []
+
+
+def test_exact_sum_matches_fsum():
+    rng = random.Random(1)
+    values = [rng.uniform(-1e6, 1e6) for _ in range(500)] + [0.1] * 10 + [1e-300, 1e300, -1e300]
+    total = ExactSum()
+    for x in values:
+        total.add(x)
+    for x in values[::7]:
+        total.remove(x)
+    kept = [x for i, x in enumerate(values) if i % 7]
+    assert total.value == math.fsum(kept)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_deltas_match_batch_recompute(tables, seed):
+    rules = finance_rules()
+    rows = [dict(r) for r in tables["candidates"]]
+    ledger = FinanceLedger(reconcile_interval=0)
+    ledger.rebuild(1, [Candidate(r) for r in rows], rules)
+
+    for version, (upserted, deleted) in enumerate(_changes(rows, 300, seed), start=2):
+        ledger.on_change(version, upserted, deleted, False)
+
+    health, liability = _batch(rows, rules)
+    got = ledger.financial_health()
+    assert got["weekly_revenue"] == health["weekly_revenue"]
+    assert got["weekly_payroll"] == health["weekly_payroll"]
+    assert got["busy_fool_deals"] == health["busy_fool_deals"]
+    assert got["placements"] == sum(1 for r in rows if r["status"] in PLACED_STATUSES)
+    assert ledger.bench_liability()["total_weekly_burn"] == liability["total_weekly_burn"]
+    assert ledger.bench_liability()["liability_list"] == liability["liability_list"]
+    assert ledger.version == 301 and ledger.stats()["rebuilds"] == 1
+
+    ledger.reconciled_at = 0
+    assert ledger.reconcile(ledger.version, [Candidate(r) for r in rows])
+    assert ledger.counters["drifts"] == 0
+
+
+def test_reload_drops_totals_until_next_query(tables):
+    ledger = FinanceLedger()
+    ledger.rebuild(1, [Candidate(r) for r in tables["candidates"]], finance_rules())
+    ledger.on_change(2, [], [], True)
+    assert ledger.version is None
+
+
+def test_tools_follow_the_change_feed(local_db, tables, monkeypatch):
+    monkeypatch.setenv("FINANCE_AGGREGATION", "ledger")
+    monkeypatch.setenv("FINANCE_LEDGER_RECONCILE", "3600")
+    asyncio.run(get_financial_health_async())
+    rows = [dict(r) for r in tables["candidates"]]
+    for upserted, deleted in _changes(rows, 50, seed=9):
+        for row in upserted:
+            publish("candidates", "UPDATE", row)
+        for row_id in deleted:
+            publish("candidates", "DELETE", None, {"id": row_id})
+
+    health = asyncio.run(get_financial_health_async())
+    liability = asyncio.run(get_bench_liability_async())
+    expected, expected_liability = _batch(rows, finance_rules())
+    assert health["weekly_revenue"] == round(expected["weekly_revenue"], 2)
+    assert liability["summary"]["total_weekly_burn"] == round(expected_liability["total_weekly_burn"], 2)
+    assert get_finance_ledger().stats()["rebuilds"] == 1
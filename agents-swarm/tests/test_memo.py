@@ -0,0 +1,135 @@
+"""Turn/session tool memo: hits, TTL expiry, invalidation and what is never stored."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from stellar_core import memo
+from stellar_core.cache import get_snapshot_cache
+from stellar_core.memo import ToolMemo, memoize
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """A fresh process memo: turn TTL 300 s, session TTL 30 s."""
+    fresh = ToolMemo(turn_ttl=300, session_ttl=30, max_entries=100)
+    monkeypatch.setattr(memo, "_memo", fresh)
+    monkeypatch.delenv("TOOL_MEMO", raising=False)
+    return fresh
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the memo's monotonic clock."""
+    now = SimpleNamespace(t=1000.0)
+    monkeypatch.setattr(memo, "time", SimpleNamespace(monotonic=lambda: now.t))
+    return now
+
+
+def _ctx(session="s1", invocation="turn-1"):
+    return SimpleNamespace(session=SimpleNamespace(id=session), invocation_id=invocation)
+
+
+def _counting_tool(result=None):
+    calls = []
+
+    async def search_talent(query: str, status: str = "available"):
+        calls.append((query, status))
+        return result if result is not None else {"query": query, "status": status, "n": len(calls)}
+
+    return memoize(search_talent, "search_talent"), calls
+
+
+def test_repeat_call_in_a_turn_is_a_hit(store, clock):
+    tool, calls = _counting_tool()
+    first = asyncio.run(tool("digger", tool_context=_ctx()))
+    again = asyncio.run(tool(query="digger", status="available", tool_context=_ctx()))
+    assert again == first and len(calls) == 1
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_different_arguments_or_session_miss(store, clock):
+    tool, calls = _counting_tool()
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    asyncio.run(tool("welder", tool_context=_ctx()))
+    asyncio.run(tool("digger", tool_context=_ctx(session="s2")))
+    assert len(calls) == 3
+
+
+def test_calls_without_tool_context_are_not_memoized(store, clock):
+    tool, calls = _counting_tool()
+    asyncio.run(tool("digger"))
+    asyncio.run(tool("digger"))
+    assert len(calls) == 2 and store.stats()["entries"] == 0
+
+
+def test_turn_and_session_expiry(store, clock):
+    tool, calls = _counting_tool()
+    asyncio.run(tool("digger", tool_context=_ctx(invocation="turn-1")))
+
+    clock.t += 60  # within the turn TTL, past the session TTL
+    asyncio.run(tool("digger", tool_context=_ctx(invocation="turn-1")))
+    assert len(calls) == 1
+    asyncio.run(tool("digger", tool_context=_ctx(invocation="turn-2")))
+    assert len(calls) == 2
+
+    clock.t += 301  # past the turn TTL too
+    asyncio.run(tool("digger", tool_context=_ctx(invocation="turn-2")))
+    assert len(calls) == 3
+
+
+def test_invalidate_by_tool_and_session(store, clock):
+    tool, calls = _counting_tool()
+    for session in ("s1", "s2"):
+        asyncio.run(tool("digger", tool_context=_ctx(session=session)))
+    assert memo.invalidate(tool="other_tool") == 0
+    assert memo.invalidate(session_id="s1") == 1
+
+    asyncio.run(tool("digger", tool_context=_ctx(session="s1")))
+    asyncio.run(tool("digger", tool_context=_ctx(session="s2")))
+    assert len(calls) == 3
+
+
+def test_snapshot_invalidation_drops_memo(store, clock):
+    tool, calls = _counting_tool()
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    get_snapshot_cache().invalidate()
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("result", [
+    {"error": "DB Connection Failed"},
+    [{"error": "Unknown location: Mars"}],
+    "Error: Database connection failed (Accountant).",
+])
+def test_error_results_are_not_stored(store, clock, result):
+    tool, calls = _counting_tool(result)
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    assert len(calls) == 2
+
+
+def test_memo_off(store, clock, monkeypatch):
+    monkeypatch.setenv("TOOL_MEMO", "off")
+    tool, calls = _counting_tool()
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    asyncio.run(tool("digger", tool_context=_ctx()))
+    assert len(calls) == 2
+
+
+def test_parallel_identical_calls_share_one_run(store, clock):
+    calls = []
+
+    async def get_bench_strength(cursor: str = ""):
+        calls.append(cursor)
+        await asyncio.sleep(0.01)
+        return {"total_count": 3}
+
+    tool = memoize(get_bench_strength, "get_bench_strength")
+
+    async def burst():
+        return await asyncio.gather(*(tool(tool_context=_ctx()) for _ in range(5)))
+
+    assert asyncio.run(burst()) == [{"total_count": 3}] * 5
+    assert len(calls) == 1
@@ -0,0 +1,62 @@
+"""Every tool reads only the columns it declares in stellar_core.projections."""
+import asyncio
+import importlib
+import json
+
+import pytest
+
+from stellar_bench.runner import TOOLS, reset_caches
+from stellar_core import projections
+
+
+def _errors(result):
+    """Error messages anywhere at the top of a tool result."""
+    if isinstance(result, str):
+        return [result] if result.startswith("Error") else []
+    if isinstance(result, list):
+        return [e for item in result for e in _errors(item)]
+    if isinstance(result, dict):
+        return [result["error"]] if "error" in result else []
+    return []
+
+
+def _run(name):
+    module, fn, kwargs = TOOLS[name]
+    return asyncio.run(getattr(importlib.import_module(module), fn)(**kwargs))
+
+
+@pytest.fixture
+def strict(monkeypatch, local_db):
+    monkeypatch.setenv("STELLAR_STRICT_COLUMNS", "1")
+    return local_db
+
+
+@pytest.mark.parametrize("name", sorted(TOOLS))
+def test_tool_reads_only_declared_columns(strict, name):
+    result = _run(name)
+    assert not _errors(result), f"{name}: {_errors(result)}"
+    assert "undeclared column" not in json.dumps(result, default=str)
+
+
+@pytest.mark.parametrize("mode", ["ledger", "local"])
+@pytest.mark.parametrize("name", ["get_financial_health", "get_bench_liability", "run_margin_scenarios"])
+def test_finance_paths_read_only_declared_columns(strict, monkeypatch, mode, name):
+    monkeypatch.setenv("FINANCE_AGGREGATION", mode)
+    result = _run(name)
+    assert not _errors(result), f"{name} ({mode}): {_errors(result)}"
+
+
+def test_strict_mode_catches_an_undeclared_read(strict, monkeypatch):
+    narrowed = tuple(c for c in projections.TOOL_COLUMNS["candidates"]["get_bench_liability"] if c != "guaranteed_hours")
+    monkeypatch.setitem(projections.TOOL_COLUMNS["candidates"], "get_bench_liability", narrowed)
+    monkeypatch.setenv("FINANCE_AGGREGATION", "local")
+    reset_caches()
+    result = _run("get_bench_liability")
+    assert "undeclared column 'guaranteed_hours'" in result["error"]
+
+
+def test_strict_rows_raise_outside_declaration():
+    row = projections.StrictRow("candidates", "talent_index", ("id", "role"), {"id": 1, "role": "Hammerhand", "phone": "021"})
+    assert row["role"] == "Hammerhand"
+    with pytest.raises(projections.UndeclaredColumnError):
+        row.get("phone")
@@ -0,0 +1,120 @@
+"""Retries, circuit breaker, single-flight and last-known-good, driven by stellar_bench.FaultyClient."""
+import asyncio
+
+import pytest
+
+from stellar_bench.faults import FaultyClient
+from stellar_bench.local_db import LocalSupabase
+from stellar_candidate_mgr.tools.candidates import get_bench_strength_async
+from stellar_core import db, resilience
+from stellar_core.resilience import UNAVAILABLE_MESSAGE, BackendUnavailable, Resilience
+from stellar_sales_lead.tools.sales import search_clients_async
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    """A fresh read policy with no backoff sleeps: 2 retries, breaker after 3 failures."""
+    res = Resilience(retries=2, base_delay=0, max_delay=0, breaker_failures=3, cooldown=60, stale_rows=1000)
+    monkeypatch.setattr(resilience, "_resilience", res)
+    return res
+
+
+@pytest.fixture
+def faulty(local_db, policy):
+    client = FaultyClient(local_db, seed=3)
+    db.use_client(client)
+    return client
+
+
+def _ids(tables, n):
+    return [r["id"] for r in tables["candidates"][:n]]
+
+
+def _read(client, row_id, stale_ok=True):
+    query = client.table("candidates").select("id,status").eq("id", row_id)
+    return asyncio.run(db.aexecute(query, "test", stale_ok))
+
+
+def test_transient_failures_are_retried(faulty, policy, tables):
+    policy.retries = 6
+    policy.breaker.threshold = 100  # three failures in a row is likely over 40 reads
+    faulty.error_rate = 0.3
+    for row in tables["candidates"][:40]:
+        assert _read(faulty, row["id"]).data == [{"id": row["id"], "status": row["status"]}]
+    assert faulty.injected > 0
+    assert policy.counters["retries"] == faulty.injected
+    assert policy.breaker.state == "closed"
+
+
+def test_retries_are_bounded(faulty, policy, tables):
+    faulty.down()
+    with pytest.raises(BackendUnavailable):
+        _read(faulty, _ids(tables, 1)[0])
+    assert faulty.calls == policy.retries + 1
+
+
+def test_breaker_opens_fails_fast_and_recovers(faulty, policy, tables):
+    ids = _ids(tables, 4)
+    policy.retries = 0
+    faulty.down()
+    for row_id in ids[:3]:
+        with pytest.raises(BackendUnavailable):
+            _read(faulty, row_id)
+    assert policy.breaker.state == "open"
+
+    calls = faulty.calls
+    with pytest.raises(BackendUnavailable):
+        _read(faulty, ids[3])
+    assert faulty.calls == calls  # never reached the client
+    assert policy.counters["fast_fails"] == 1
+
+    faulty.up()
+    policy.breaker.opened_at -= policy.breaker.cooldown  # cooldown over: one trial goes through
+    assert _read(faulty, ids[3]).data
+    assert policy.breaker.state == "closed"
+
+
+def test_last_known_good_is_served_during_an_outage(faulty, policy, tables):
+    seen, unseen = _ids(tables, 2)
+    fresh = _read(faulty, seen).data
+    faulty.down()
+    assert _read(faulty, seen).data == fresh
+    assert policy.counters["stale"] == 1
+    with pytest.raises(BackendUnavailable):
+        _read(faulty, unseen)  # never read, so nothing to fall back on
+
+
+def test_reads_that_refuse_stale_data_are_not_kept(faulty, policy, tables):
+    row_id = _ids(tables, 1)[0]
+    _read(faulty, row_id, stale_ok=False)
+    assert policy.stats()["stale_entries"] == 0
+    faulty.down()
+    with pytest.raises(BackendUnavailable):
+        _read(faulty, row_id, stale_ok=False)
+    with pytest.raises(BackendUnavailable):
+        _read(faulty, row_id)
+
+
+def test_tools_keep_answering_during_an_outage(faulty):
+    bench = asyncio.run(get_bench_strength_async())
+    clients = asyncio.run(search_clients_async(industry="Civil"))
+    faulty.down()
+    assert asyncio.run(get_bench_strength_async()) == bench  # snapshot keeps its copy
+    assert asyncio.run(search_clients_async(industry="Civil")) == clients  # last-known-good
+    assert asyncio.run(search_clients_async(industry="Residential")) == {"error": UNAVAILABLE_MESSAGE}
+
+
+def test_identical_reads_in_flight_share_one_call(tables, policy):
+    client = FaultyClient(LocalSupabase(tables, latency_ms=20))
+    db.use_client(client)
+    try:
+        async def burst():
+            query = lambda: client.table("candidates").select("id").eq("status", "available")
+            return await asyncio.gather(*(db.aexecute(query(), "test") for _ in range(10)))
+
+        results = asyncio.run(burst())
+    finally:
+        db.use_client(None)
+    assert client.calls == 1
+    assert policy.counters["coalesced"] == 9
+    assert all(r.data == results[0].data for r in results)
@@ -0,0 +1,48 @@
+"""Squad builder: argument checks, ids across pools and the shared weekly-hours rule."""
+import asyncio
+
+import pytest
+
+from stellar_candidate_mgr.tools.candidates import generate_squads_async
+
+
+def _all_squads(**kwargs):
+    first = asyncio.run(generate_squads_async(**kwargs))
+    squads, page = list(first["items"]), first["page"]
+    while page["next_cursor"]:
+        nxt = asyncio.run(generate_squads_async(cursor=page["next_cursor"]))
+        squads += nxt["items"]
+        page = nxt["page"]
+    return first["summary"], squads
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"project_type": "STRUCTRE"}, "Unknown project type 'STRUCTRE'"),
+    ({"seniors_per_squad": 0}, "seniors_per_squad"),
+    ({"juniors_per_squad": -1}, "juniors_per_squad"),
+])
+def test_bad_arguments_are_errors(local_db, kwargs, message):
+    assert message in asyncio.run(generate_squads_async(**kwargs))["error"]
+
+
+def test_project_type_is_case_insensitive(local_db):
+    summary, squads = _all_squads(project_type="structure")
+    assert summary["squad_count"] == len(squads) > 0
+
+
+def test_squad_ids_are_unique_across_pools(local_db):
+    summary, squads = _all_squads()
+    assert len(summary["by_region"]) > 1
+    assert len({sq["squad_id"] for sq in squads}) == len(squads) == summary["squad_count"]
+
+
+def test_revenue_uses_the_finance_weekly_hours(local_db, monkeypatch):
+    _, squads = _all_squads(region="Manukau")
+    for sq in squads:
+        assert sq["financials"]["est_weekly_revenue"] == pytest.approx(sq["financials"]["hourly_charge_total"] * 40)
+
+    monkeypatch.setenv("FINANCE_WEEKLY_HOURS", "37.5")
+    _, squads = _all_squads(region="Manukau")
+    assert squads
+    for sq in squads:
+        assert sq["financials"]["est_weekly_revenue"] == pytest.approx(sq["financials"]["hourly_charge_total"] * 37.5)
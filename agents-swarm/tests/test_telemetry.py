@@ -0,0 +1,37 @@
+"""Tool error accounting: raised exceptions and returned {"error": ...} results."""
+import asyncio
+
+import pytest
+
+from stellar_core.telemetry import get_tool_metrics, instrument, metrics, prometheus_text
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_errors_are_counted_by_kind():
+    async def tool(mode):
+        if mode == "raise":
+            raise RuntimeError("boom")
+        if mode == "return":
+            return {"error": "no rows"}
+        if mode == "string":
+            return "Error: Database connection failed (Accountant)."
+        return {"rows": 1}
+
+    measured = instrument(tool, "probe")
+    for mode in ("ok", "return", "string", "raise"):
+        try:
+            asyncio.run(measured(mode))
+        except RuntimeError:
+            pass
+
+    m = get_tool_metrics()["probe"]
+    assert (m["calls"], m["errors"], m["errors_raised"], m["errors_returned"]) == (4, 3, 1, 2)
+    text = prometheus_text()
+    assert 'stellar_tool_errors_total{tool="probe",kind="raised"} 1' in text
+    assert 'stellar_tool_errors_total{tool="probe",kind="returned"} 2' in text
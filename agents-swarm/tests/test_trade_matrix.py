@@ -0,0 +1,43 @@
+"""Trade Matrix matching: whole words over normalised role text, synonyms, licences."""
+import asyncio
+
+import pytest
+
+from stellar_core.trade_matrix import is_known_project_type, match_trade
+from stellar_systems_it.tools.systems import validate_squad_trades_async, validate_trade_logic_async
+
+
+@pytest.mark.parametrize("project_type, role, trade", [
+    ("STRUCTURE", "LBP Carpenter", "Carpenter"),
+    ("structure", "Chippy", "Carpenter"),
+    ("STRUCTURE", "Hammer-hand", "Hammerhand"),
+    ("STRUCTURE", "Concrete Finisher", "Concrete"),
+    ("INTERIOR", "GIB-Fixer", "GIB"),
+    ("INTERIOR", "Gib Stopper", "GIB"),
+    ("CIVIL", "Excavator Operator", "Digger"),
+    ("CIVIL", "Drainlayers", "Drainlayer"),
+    ("STRUCTURE", "LBP Roofer", None),
+    ("STRUCTURE", "LBP Bricklayer", None),
+    ("STRUCTURE", "LBP", None),
+    ("INTERIOR", "Plasterboarder", None),
+    ("CIVIL", "Painter", None),
+    ("CIVIL", None, None),
+    ("STRUCTRE", "Carpenter", None),
+])
+def test_match_trade(project_type, role, trade):
+    assert match_trade(project_type, role) == trade
+
+
+def test_licence_alone_is_not_a_structure_trade():
+    assert asyncio.run(validate_trade_logic_async("STRUCTURE", "LBP Roofer")).startswith("VIOLATION")
+    assert asyncio.run(validate_trade_logic_async("STRUCTURE", "LBP Carpenter")) == "VALID"
+
+
+def test_squad_check_names_the_matched_trade():
+    result = asyncio.run(validate_squad_trades_async("STRUCTURE", [{"name": "A", "role": "LBP Bricklayer"},
+                                                                   {"name": "B", "role": "Joiner"}]))
+    assert [(v["name"], v["matched_trade"]) for v in result["members"]] == [("A", None), ("B", "Carpenter")]
+
+
+def test_known_project_types():
+    assert is_known_project_type("civil") and not is_known_project_type("STRUCTRE")
@@ -164,6 +164,8 @@ export const candidates = pgTable('candidates', {
     siteAddress: text('site_address'),
     workSafeExpiry: timestamp('work_safe_expiry', { withTimezone: true }),
     notes: text('notes'),
+    // Bumped by trigger on every UPDATE (agent swarm cache invalidation)
+    updatedAt: timestamp('updated_at', { withTimezone: true }).defaultNow().notNull(),
     createdAt: timestamp('created_at', { withTimezone: true }).defaultNow().notNull(),
 });
 
@@ -0,0 +1,17 @@
+-- Row change tracking for the agent swarm's candidate snapshot cache.
+-- The cache polls "updated_at > high-water mark" to pick up edits without a full reload.
+ALTER TABLE "candidates" ADD COLUMN IF NOT EXISTS "updated_at" timestamp with time zone DEFAULT now() NOT NULL;
+
+CREATE OR REPLACE FUNCTION "public"."touch_updated_at"() RETURNS trigger AS $$
+BEGIN
+    NEW."updated_at" = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS "candidates_touch_updated_at" ON "candidates";
+CREATE TRIGGER "candidates_touch_updated_at"
+    BEFORE UPDATE ON "candidates"
+    FOR EACH ROW EXECUTE FUNCTION "public"."touch_updated_at"();
+
+CREATE INDEX IF NOT EXISTS "candidates_updated_at_idx" ON "candidates" ("updated_at");
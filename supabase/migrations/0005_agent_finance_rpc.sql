@@ -0,0 +1,88 @@
+-- Server-side aggregation for the Accountant agent (get_financial_health / get_bench_liability).
+-- Rules (burden, hours, Busy Fool thresholds) are passed in by the caller so the
+-- Python fallback and this path share one config (agents-swarm/stellar_core/finance_rules.py).
+
+-- Mirrors parsing.parse_currency: "$1,234.50" -> 1234.50, junk/empty -> 0.
+-- Only digits and dots are kept; what is left is cast only when it is a number
+-- ("$." / "TBC." / "1.2.3" would make ::numeric raise and fail the whole call).
+CREATE OR REPLACE FUNCTION "public"."agent_parse_rate"(v text) RETURNS numeric
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE WHEN s ~ '^[0-9]*\.?[0-9]+$' OR s ~ '^[0-9]+\.$' THEN s::numeric ELSE 0 END
+    FROM (SELECT regexp_replace(COALESCE(v, ''), '[^0-9.]', '', 'g') AS s) digits
+$$;
+
+CREATE OR REPLACE FUNCTION "public"."agent_financial_health"(
+    p_burden numeric DEFAULT 1.30,
+    p_weekly_hours numeric DEFAULT 40,
+    p_min_gp numeric DEFAULT 400,
+    p_min_margin_pct numeric DEFAULT 15,
+    p_healthy_margin_pct numeric DEFAULT 18
+) RETURNS json
+LANGUAGE sql STABLE AS $$
+    WITH placed AS (
+        SELECT
+            c.first_name || ' ' || c.last_name AS name,
+            COALESCE(NULLIF(c.current_project, ''), 'Unknown') AS client,
+            "public"."agent_parse_rate"(c.charge_out_rate) * p_weekly_hours AS weekly_revenue,
+            COALESCE(c.pay_rate, 0) * p_burden * p_weekly_hours AS weekly_cost
+        FROM "candidates" c
+        WHERE c.status IN ('on_job', 'placed')
+    ), scored AS (
+        SELECT
+            name, client, weekly_revenue, weekly_cost,
+            weekly_revenue - weekly_cost AS net_gp,
+            CASE WHEN weekly_revenue > 0
+                THEN (weekly_revenue - weekly_cost) / weekly_revenue * 100 ELSE 0 END AS margin_pct
+        FROM placed
+    ), totals AS (
+        SELECT
+            COALESCE(sum(weekly_revenue), 0) AS revenue,
+            COALESCE(sum(weekly_cost), 0) AS payroll
+        FROM scored
+    ), margin AS (
+        SELECT revenue, payroll,
+            CASE WHEN revenue > 0 THEN (revenue - payroll) / revenue * 100 ELSE 0 END AS pct
+        FROM totals
+    )
+    SELECT json_build_object(
+        'status', CASE WHEN m.pct > p_healthy_margin_pct THEN 'Healthy' ELSE 'Critical' END,
+        'weekly_revenue', m.revenue,
+        'weekly_gross_profit', m.revenue - m.payroll,
+        'margin_percent', round(m.pct, 2),
+        'busy_fool_deals', COALESCE((
+            SELECT json_agg(json_build_object(
+                'name', s.name,
+                'net_gp', round(s.net_gp, 2),
+                'margin_pct', round(s.margin_pct, 1),
+                'client', s.client
+            ))
+            FROM scored s
+            WHERE s.net_gp < p_min_gp OR s.margin_pct < p_min_margin_pct
+        ), '[]'::json)
+    )
+    FROM margin m
+$$;
+
+CREATE OR REPLACE FUNCTION "public"."agent_bench_liability"() RETURNS json
+LANGUAGE sql STABLE AS $$
+    WITH bench AS (
+        SELECT
+            c.first_name || ' ' || c.last_name AS name,
+            c.guaranteed_hours,
+            c.guaranteed_hours * COALESCE(c.pay_rate, 0) AS weekly_burn
+        FROM "candidates" c
+        WHERE c.status = 'available' AND c.guaranteed_hours > 0
+    )
+    SELECT json_build_object(
+        'status', CASE WHEN COALESCE(sum(weekly_burn), 0) = 0 THEN 'Clean' ELSE 'Burning Cash' END,
+        'total_weekly_burn', COALESCE(sum(weekly_burn), 0),
+        'liability_list', COALESCE(json_agg(json_build_object(
+            'name', name,
+            'weekly_burn', weekly_burn,
+            'guaranteed_hours', guaranteed_hours
+        )), '[]'::json)
+    )
+    FROM bench
+$$;
+
+CREATE INDEX IF NOT EXISTS "candidates_status_idx" ON "candidates" ("status");
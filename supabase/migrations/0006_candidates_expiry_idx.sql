@@ -0,0 +1,4 @@
+-- Expiry windows for the agent swarm's Immigration calendar.
+-- It loads "visa_expiry < cutoff" and "compliance->>'siteSafeExpiry' < cutoff" server-side.
+CREATE INDEX IF NOT EXISTS "candidates_visa_expiry_idx" ON "candidates" ("visa_expiry") WHERE "visa_expiry" IS NOT NULL;
+CREATE INDEX IF NOT EXISTS "candidates_site_safe_expiry_idx" ON "candidates" (("compliance"->>'siteSafeExpiry')) WHERE "compliance"->>'siteSafeExpiry' IS NOT NULL;